@@ -0,0 +1,259 @@
+"""
+Contrôle d'admission des requêtes par classe d'endpoints.
+
+Chaque classe d'endpoints (recherches, analyses, consultations unitaires)
+dispose d'un nombre maximal de requêtes simultanées et d'une file
+d'attente bornée. Une requête qui ne peut pas démarrer avant son délai,
+ou qui trouve la file pleine, est rejetée immédiatement avec un 503 et un
+en-tête Retry-After : une rafale de recherches coûteuses n'affame plus les
+consultations peu coûteuses.
+"""
+
+import asyncio
+import math
+from collections import deque
+from typing import AsyncIterator, Callable, Deque, Dict, List
+
+from fastapi import HTTPException
+
+from banking_api.config import settings
+from banking_api.models import AdmissionMetrics
+
+
+class OverloadedError(RuntimeError):
+    """Requête rejetée faute de capacité disponible."""
+
+    def __init__(self, name: str, retry_after: int) -> None:
+        """
+        Initialise l'erreur.
+
+        Parameters
+        ----------
+        name : str
+            Classe d'endpoints saturée
+        retry_after : int
+            Délai conseillé avant une nouvelle tentative (secondes)
+        """
+        super().__init__(f"Too many concurrent {name} requests, retry later")
+        self.retry_after = retry_after
+
+
+class AdmissionGate:
+    """
+    Limite de concurrence d'une classe d'endpoints, avec file bornée.
+
+    Les requêtes en attente sont admises dans l'ordre d'arrivée. La porte
+    est utilisée depuis la boucle d'événements uniquement.
+
+    Attributes
+    ----------
+    name : str
+        Nom de la classe d'endpoints
+    limit : int
+        Nombre maximal de requêtes simultanées
+    queue_size : int
+        Nombre maximal de requêtes en attente
+    timeout : float
+        Délai maximal d'attente d'une place (secondes)
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float) -> None:
+        """
+        Initialise la porte.
+
+        Parameters
+        ----------
+        name : str
+            Nom de la classe d'endpoints
+        limit : int
+            Nombre maximal de requêtes simultanées
+        queue_size : int
+            Nombre maximal de requêtes en attente
+        timeout : float
+            Délai maximal d'attente d'une place (secondes)
+        """
+        self.name = name
+        self.limit = max(limit, 1)
+        self.queue_size = max(queue_size, 0)
+        self.timeout = timeout
+        self._active = 0
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+        self._admitted = 0
+        self._rejected = 0
+
+    @property
+    def retry_after(self) -> int:
+        """
+        Délai conseillé aux clients rejetés.
+
+        Returns
+        -------
+        int
+            Délai en secondes (au moins 1)
+        """
+        return max(1, math.ceil(self.timeout))
+
+    async def acquire(self) -> None:
+        """
+        Attend une place libre.
+
+        Raises
+        ------
+        OverloadedError
+            Si la file est pleine ou si aucune place ne se libère à temps
+        """
+        if self._active < self.limit and not self._waiters:
+            self._active += 1
+            self._admitted += 1
+            return
+        if len(self._waiters) >= self.queue_size:
+            self._rejected += 1
+            raise OverloadedError(self.name, self.retry_after)
+
+        waiter: "asyncio.Future[None]" = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            self._remove(waiter)
+            self._rejected += 1
+            raise OverloadedError(self.name, self.retry_after)
+        except asyncio.CancelledError:
+            # La place a pu être transmise juste avant l'annulation
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._remove(waiter)
+            raise
+        self._admitted += 1
+
+    def release(self) -> None:
+        """Libère une place, transmise à la première requête en attente."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self._active -= 1
+
+    def metrics(self) -> AdmissionMetrics:
+        """
+        Retourne les compteurs de la porte.
+
+        Returns
+        -------
+        AdmissionMetrics
+            Limites, occupation et nombre de requêtes admises ou rejetées
+        """
+        return AdmissionMetrics(
+            name=self.name,
+            limit=self.limit,
+            queue_size=self.queue_size,
+            active=self._active,
+            queued=len(self._waiters),
+            admitted=self._admitted,
+            rejected=self._rejected,
+        )
+
+    def _remove(self, waiter: "asyncio.Future[None]") -> None:
+        """
+        Retire une requête de la file d'attente.
+
+        Parameters
+        ----------
+        waiter : asyncio.Future[None]
+            Attente à retirer
+        """
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+
+def _gate(name: str, limit: int) -> AdmissionGate:
+    """
+    Construit la porte d'une classe d'endpoints à partir de la configuration.
+
+    Parameters
+    ----------
+    name : str
+        Nom de la classe d'endpoints
+    limit : int
+        Nombre maximal de requêtes simultanées
+
+    Returns
+    -------
+    AdmissionGate
+        Porte configurée
+    """
+    return AdmissionGate(
+        name,
+        limit,
+        limit * settings.ADMISSION_QUEUE_FACTOR,
+        settings.ADMISSION_TIMEOUT,
+    )
+
+
+# Portes par classe d'endpoints
+gates: Dict[str, AdmissionGate] = {
+    "search": _gate("search", settings.ADMISSION_SEARCH_CONCURRENCY),
+    "analytics": _gate("analytics", settings.ADMISSION_ANALYTICS_CONCURRENCY),
+    "lookup": _gate("lookup", settings.ADMISSION_LOOKUP_CONCURRENCY),
+}
+
+
+def admit(name: str) -> Callable[[], AsyncIterator[None]]:
+    """
+    Construit la dépendance FastAPI d'admission d'une classe d'endpoints.
+
+    Parameters
+    ----------
+    name : str
+        Classe d'endpoints ("search", "analytics" ou "lookup")
+
+    Returns
+    -------
+    Callable[[], AsyncIterator[None]]
+        Dépendance à déclarer dans ``dependencies=[Depends(...)]``
+    """
+    gate = gates[name]
+
+    async def dependency() -> AsyncIterator[None]:
+        """
+        Occupe une place de la classe pendant le traitement de la requête.
+
+        Yields
+        ------
+        None
+
+        Raises
+        ------
+        HTTPException
+            503 avec Retry-After si la requête est rejetée
+        """
+        try:
+            await gate.acquire()
+        except OverloadedError as e:
+            raise HTTPException(
+                status_code=503,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)},
+            )
+        try:
+            yield
+        finally:
+            gate.release()
+
+    return dependency
+
+
+def admission_metrics() -> List[AdmissionMetrics]:
+    """
+    Retourne les compteurs de toutes les classes d'endpoints.
+
+    Returns
+    -------
+    List[AdmissionMetrics]
+        Compteurs par classe
+    """
+    return [gate.metrics() for gate in gates.values()]
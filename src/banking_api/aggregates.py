@@ -0,0 +1,345 @@
+"""
+Agrégats matérialisés du dataset des transactions.
+
+Ce module calcule, une seule fois par version du dataset, les agrégats
+servis par les endpoints de statistiques et de fraude. Les tableaux de
+bord interrogent ces endpoints en continu : ils répondent ainsi depuis la
+mémoire, sans parcourir les transactions.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+from banking_api.models import (
+    DailyStats,
+    FraudByType,
+    FraudSummary,
+    StatsByType,
+    StatsOverview,
+)
+from banking_api.schema import AMOUNT_COLUMN, AMOUNT_SCALE, to_cents
+
+logger = logging.getLogger(__name__)
+
+
+def _group_codes(series: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode une colonne en codes de groupe, par ordre d'apparition.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Colonne à grouper
+
+    Returns
+    -------
+    Tuple[np.ndarray, List[str]]
+        Codes des lignes (-1 pour les valeurs manquantes) et libellés des
+        groupes
+    """
+    codes, uniques = pd.factorize(series)
+    return codes, [str(value) for value in uniques]
+
+
+def _daily_codes(dates: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """
+    Encode la colonne des dates en codes de jour.
+
+    Seules les valeurs distinctes sont analysées, puis projetées sur les
+    lignes : le coût de pd.to_datetime ne dépend pas du nombre de lignes.
+
+    Parameters
+    ----------
+    dates : pd.Series
+        Colonne des dates (avec ou sans heure)
+
+    Returns
+    -------
+    Tuple[np.ndarray, List[str]]
+        Codes de jour des lignes (-1 pour les dates manquantes) et jours
+        au format ISO
+    """
+    codes, uniques = pd.factorize(dates)
+    days = pd.to_datetime(pd.Series(uniques)).dt.date
+    day_codes, day_uniques = pd.factorize(days)
+    row_codes = np.where(codes >= 0, day_codes[np.maximum(codes, 0)], -1)
+    return row_codes, [str(day) for day in day_uniques]
+
+
+def _merge_counters(
+    first: Dict[str, List[int]], second: Dict[str, List[int]], sign: int = 1
+) -> Dict[str, List[int]]:
+    """
+    Additionne des compteurs par groupe, en conservant l'ordre d'apparition.
+
+    Parameters
+    ----------
+    first : Dict[str, List[int]]
+        Compteurs des premières lignes
+    second : Dict[str, List[int]]
+        Compteurs des lignes suivantes
+    sign : int, optional
+        1 pour ajouter second, -1 pour le retirer (défaut: 1) ; un groupe
+        dont le nombre de lignes devient nul est supprimé
+
+    Returns
+    -------
+    Dict[str, List[int]]
+        Compteurs cumulés
+    """
+    merged = {key: list(values) for key, values in first.items()}
+    for key, values in second.items():
+        if key in merged:
+            merged[key] = [a + sign * b for a, b in zip(merged[key], values)]
+        else:
+            merged[key] = [sign * b for b in values]
+        if merged[key][0] == 0:
+            del merged[key]
+    return merged
+
+
+class DatasetAggregates:
+    """
+    Agrégats matérialisés d'un instantané du dataset.
+
+    Les sommes et comptes sont calculés à la construction, en un parcours
+    vectorisé par clé de regroupement (np.bincount sur les codes). Ils
+    sont additifs : extend() les prolonge avec de nouvelles lignes, et en
+    retire des lignes supprimées, sans reparcourir les lignes existantes.
+
+    Attributes
+    ----------
+    overview : StatsOverview
+        Statistiques globales
+    stats_by_type : List[StatsByType]
+        Statistiques par mode de transaction, par ordre d'apparition
+    daily_stats : List[DailyStats]
+        Statistiques quotidiennes, triées par date
+    fraud_summary : FraudSummary
+        Résumé des transactions suspectes
+    fraud_by_type : List[FraudByType]
+        Taux de transactions suspectes par mode de transaction
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        """
+        Calcule les agrégats.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame en lecture seule de l'instantané
+        """
+        self._accumulate(data)
+        self._materialize()
+
+    def _accumulate(self, data: pd.DataFrame) -> None:
+        """
+        Calcule les sommes et comptes des lignes.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Lignes agrégées
+        """
+        cents = data[AMOUNT_COLUMN].to_numpy()
+        negative = cents < 0
+        absolute = np.abs(cents)
+        self._total = len(cents)
+        self._sum = int(cents.sum())
+        self._absolute_sum = int(absolute.sum())
+        self._negative_count = int(negative.sum())
+        # Suspect : montant négatif ou très élevé ; haut risque : très négatif
+        self._suspicious_count = int((negative | (absolute > to_cents(5000))).sum())
+        self._high_risk_count = int((cents < to_cents(-1000)).sum())
+
+        # Par mode de transaction : [nombre, somme, montants négatifs]
+        self._types: Dict[str, List[int]] = {}
+        if "use_chip" in data.columns:
+            codes, labels = _group_codes(data["use_chip"])
+            valid = codes >= 0
+            groups = len(labels)
+            counts = np.bincount(codes[valid], minlength=groups)
+            sums = np.bincount(codes[valid], weights=cents[valid], minlength=groups)
+            negatives = np.bincount(codes[valid & negative], minlength=groups)
+            for label, count, amount, suspicious in zip(
+                labels, counts, sums, negatives
+            ):
+                self._types[label] = [int(count), int(amount), int(suspicious)]
+
+        # Par jour : [nombre, somme]
+        self._days: Optional[Dict[str, List[int]]] = None
+        if "date" in data.columns:
+            codes, days = _daily_codes(data["date"])
+            valid = codes >= 0
+            counts = np.bincount(codes[valid], minlength=len(days))
+            sums = np.bincount(codes[valid], weights=cents[valid], minlength=len(days))
+            self._days = {
+                day: [int(count), int(amount)]
+                for day, count, amount in zip(days, counts, sums)
+            }
+
+    def extend(
+        self, data: pd.DataFrame, removed: Optional[pd.DataFrame] = None
+    ) -> "DatasetAggregates":
+        """
+        Combine les agrégats existants avec ceux de nouvelles lignes.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Lignes ajoutées (mêmes colonnes que l'instantané)
+        removed : Optional[pd.DataFrame], optional
+            Lignes déjà agrégées à retirer
+
+        Returns
+        -------
+        DatasetAggregates
+            Agrégats de l'ensemble des lignes (les agrégats courants ne sont
+            pas modifiés)
+        """
+        return self.combine(DatasetAggregates._partial(data), removed)
+
+    def combine(
+        self,
+        other: Optional["DatasetAggregates"],
+        removed: Optional[pd.DataFrame] = None,
+    ) -> "DatasetAggregates":
+        """
+        Combine les agrégats existants avec ceux d'autres lignes.
+
+        Parameters
+        ----------
+        other : Optional[DatasetAggregates]
+            Agrégats des lignes ajoutées (None : aucune)
+        removed : Optional[pd.DataFrame], optional
+            Lignes déjà agrégées à retirer
+
+        Returns
+        -------
+        DatasetAggregates
+            Agrégats de l'ensemble des lignes (les agrégats courants ne sont
+            pas modifiés, et sont retournés si rien ne change)
+        """
+        combined = self._add(other) if other is not None else self
+        if removed is not None and len(removed):
+            combined = combined._add(DatasetAggregates._partial(removed), -1)
+        if combined is not self:
+            combined._materialize()
+        return combined
+
+    @staticmethod
+    def _partial(data: pd.DataFrame) -> "DatasetAggregates":
+        """
+        Calcule les sommes et comptes de lignes, sans construire les modèles.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            Lignes agrégées
+
+        Returns
+        -------
+        DatasetAggregates
+            Agrégats non matérialisés
+        """
+        partial = object.__new__(DatasetAggregates)
+        partial._accumulate(data)
+        return partial
+
+    def _add(self, other: "DatasetAggregates", sign: int = 1) -> "DatasetAggregates":
+        """
+        Additionne ou soustrait les sommes et comptes d'autres agrégats.
+
+        Parameters
+        ----------
+        other : DatasetAggregates
+            Agrégats d'autres lignes
+        sign : int, optional
+            1 pour ajouter, -1 pour retirer (défaut: 1)
+
+        Returns
+        -------
+        DatasetAggregates
+            Agrégats non matérialisés
+        """
+        result = object.__new__(DatasetAggregates)
+        result._total = self._total + sign * other._total
+        result._sum = self._sum + sign * other._sum
+        result._absolute_sum = self._absolute_sum + sign * other._absolute_sum
+        result._negative_count = self._negative_count + sign * other._negative_count
+        result._suspicious_count = (
+            self._suspicious_count + sign * other._suspicious_count
+        )
+        result._high_risk_count = self._high_risk_count + sign * other._high_risk_count
+        result._types = _merge_counters(self._types, other._types, sign)
+        result._days = (
+            _merge_counters(self._days, other._days, sign)
+            if self._days is not None and other._days is not None
+            else None
+        )
+        return result
+
+    def _materialize(self) -> None:
+        """Construit les modèles servis à partir des sommes et comptes."""
+        total = self._total
+        self.stats_by_type: List[StatsByType] = []
+        self.fraud_by_type: List[FraudByType] = []
+        for label, (count, amount, suspicious) in self._types.items():
+            total_amount = amount / AMOUNT_SCALE
+            self.stats_by_type.append(
+                StatsByType(
+                    use_chip=label,
+                    count=count,
+                    avg_amount=total_amount / count,
+                    total_amount=total_amount,
+                )
+            )
+            self.fraud_by_type.append(
+                FraudByType(
+                    use_chip=label,
+                    total_count=count,
+                    suspicious_count=suspicious,
+                    suspicious_rate=suspicious / count,
+                )
+            )
+
+        # Mode le plus fréquent ; en cas d'égalité, le plus petit libellé
+        most_common_type = "N/A"
+        if self._types:
+            top = max(count for count, _, _ in self._types.values())
+            most_common_type = min(
+                label for label, (count, _, _) in self._types.items() if count == top
+            )
+
+        self.overview = StatsOverview(
+            total_transactions=total,
+            fraud_rate=self._negative_count / total if total > 0 else 0.0,
+            avg_amount=self._sum / total / AMOUNT_SCALE if total > 0 else 0.0,
+            most_common_type=most_common_type,
+        )
+
+        self.daily_stats: List[DailyStats] = sorted(
+            (
+                DailyStats(
+                    date=day,
+                    count=count,
+                    avg_amount=amount / AMOUNT_SCALE / count,
+                    total_amount=amount / AMOUNT_SCALE,
+                )
+                for day, (count, amount) in (self._days or {}).items()
+            ),
+            key=lambda x: x.date,
+        )
+
+        mean_absolute = self._absolute_sum / total if total > 0 else 0.0
+        self.fraud_summary = FraudSummary(
+            total_transactions=total,
+            suspicious_count=self._suspicious_count,
+            high_risk_count=self._high_risk_count,
+            avg_risk_score=min(100, mean_absolute / AMOUNT_SCALE / 10),
+            suspicious_rate=self._suspicious_count / total if total > 0 else 0.0,
+        )
@@ -0,0 +1,437 @@
+"""
+Cache colonnaire sur disque du dataset.
+
+Ce module persiste le DataFrame nettoyé sous forme de fichiers .npy
+(une colonne par fichier) accompagnés d'un manifeste JSON. Les colonnes
+numériques et les codes des colonnes catégorielles sont ensuite projetés
+en mémoire (memory-mapped) au démarrage, ce qui évite de ré-analyser le
+fichier CSV.
+
+Les colonnes de texte libre (id, date) ne sont pas projetées : elles
+sont stockées en largeur fixe puis décodées en chaînes Python au
+chargement, une par ligne, car les index, les filtres et la
+sérialisation lisent des chaînes. Leur décodage reste proportionnel au
+nombre de lignes ; il évite seulement l'analyse du CSV.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Version du format ; à incrémenter dès que le nettoyage du CSV change
+FORMAT_VERSION: int = 2
+
+# Taille des blocs (début et fin du fichier) utilisés pour l'empreinte
+_HASH_BLOCK_SIZE: int = 1024 * 1024
+
+_MANIFEST_NAME: str = "manifest.json"
+
+
+def compute_fingerprint(file_path: str) -> Dict[str, Any]:
+    """
+    Calcule l'empreinte d'un fichier CSV.
+
+    L'empreinte combine la taille, la date de modification et un SHA-1
+    du premier et du dernier mégaoctet du fichier.
+
+    Parameters
+    ----------
+    file_path : str
+        Chemin vers le fichier CSV
+
+    Returns
+    -------
+    Dict[str, Any]
+        Empreinte du fichier
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        digest.update(f.read(_HASH_BLOCK_SIZE))
+        if stat.st_size > 2 * _HASH_BLOCK_SIZE:
+            f.seek(-_HASH_BLOCK_SIZE, os.SEEK_END)
+            digest.update(f.read(_HASH_BLOCK_SIZE))
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "sha1": digest.hexdigest(),
+    }
+
+
+def _encode_text(values: np.ndarray) -> np.ndarray:
+    """
+    Encode une colonne de chaînes en tableau NumPy de largeur fixe.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Valeurs de type object (chaînes)
+
+    Returns
+    -------
+    np.ndarray
+        Tableau d'octets ASCII, ou unicode si nécessaire
+    """
+    try:
+        return np.asarray(values, dtype="S")
+    except UnicodeEncodeError:
+        return np.asarray(values, dtype="U")
+
+
+def _read_header(path: Path) -> Tuple[np.dtype, int]:
+    """
+    Lit le type et le nombre d'éléments d'un fichier .npy à une dimension.
+
+    Parameters
+    ----------
+    path : Path
+        Fichier .npy
+
+    Returns
+    -------
+    Tuple[np.dtype, int]
+        Type des éléments et nombre d'éléments
+    """
+    with open(path, "rb") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, _, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, _, dtype = np.lib.format.read_array_header_2_0(f)
+    return dtype, int(shape[0])
+
+
+def _append_npy(path: Path, values: np.ndarray) -> None:
+    """
+    Ajoute des éléments à la fin d'un fichier .npy à une dimension.
+
+    L'en-tête de np.save réserve de la place pour l'allongement de la
+    forme : il est réécrit sur place, puis les éléments sont ajoutés en
+    fin de fichier. Les projections en mémoire existantes restent valides.
+
+    Parameters
+    ----------
+    path : Path
+        Fichier .npy
+    values : np.ndarray
+        Éléments à ajouter, du type des éléments du fichier
+    """
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+        header_size = f.tell()
+        header = {
+            "descr": np.lib.format.dtype_to_descr(dtype),
+            "fortran_order": fortran,
+            "shape": (shape[0] + len(values),),
+        }
+        f.seek(0)
+        if version == (1, 0):
+            np.lib.format.write_array_header_1_0(f, header)
+        else:
+            np.lib.format.write_array_header_2_0(f, header)
+        if f.tell() != header_size:
+            raise OSError(f"Cannot grow the header of {path} in place")
+        f.seek(0, os.SEEK_END)
+        f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+
+
+class ColumnarCache:
+    """
+    Cache colonnaire d'un fichier CSV nettoyé.
+
+    Attributes
+    ----------
+    directory : Path
+        Répertoire contenant le manifeste et les colonnes
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initialise le cache.
+
+        Parameters
+        ----------
+        directory : str
+            Répertoire du cache
+        """
+        self.directory = Path(directory)
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        """
+        Lit le manifeste du cache.
+
+        Returns
+        -------
+        Optional[Dict[str, Any]]
+            Contenu du manifeste ou None s'il est absent ou illisible
+        """
+        path = self.directory / _MANIFEST_NAME
+        if not path.exists():
+            return None
+        try:
+            manifest: Dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+            return manifest
+        except (OSError, ValueError) as e:
+            logger.warning(f"Invalid snapshot manifest {path}: {str(e)}")
+            return None
+
+    def load(self, file_path: str) -> Optional[pd.DataFrame]:
+        """
+        Charge le dataset depuis le cache s'il est valide.
+
+        Parameters
+        ----------
+        file_path : str
+            Chemin vers le fichier CSV d'origine
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            DataFrame reconstruit, ou None si le cache est absent ou périmé
+        """
+        manifest = self._read_manifest()
+        if manifest is None or manifest.get("format_version") != FORMAT_VERSION:
+            return None
+        if manifest.get("source") != compute_fingerprint(file_path):
+            logger.info(f"Snapshot in {self.directory} is stale, ignoring it")
+            return None
+        return self._read_columns(manifest)
+
+    def read(self) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """
+        Charge le contenu du cache, quelle que soit sa source.
+
+        Returns
+        -------
+        Optional[Tuple[pd.DataFrame, Dict[str, Any]]]
+            DataFrame et description de sa source (voir write), ou None si
+            le cache est absent ou illisible
+        """
+        manifest = self._read_manifest()
+        if manifest is None or manifest.get("format_version") != FORMAT_VERSION:
+            return None
+        df = self._read_columns(manifest)
+        if df is None:
+            return None
+        return df, manifest["source"]
+
+    def _read_columns(self, manifest: Dict[str, Any]) -> Optional[pd.DataFrame]:
+        """
+        Reconstruit le DataFrame décrit par un manifeste.
+
+        Les colonnes numériques et catégorielles partagent la mémoire des
+        fichiers projetés ; les colonnes de texte sont décodées (une chaîne
+        Python par ligne, voir le module).
+
+        Parameters
+        ----------
+        manifest : Dict[str, Any]
+            Manifeste du cache
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            DataFrame reconstruit, ou None si les colonnes sont illisibles
+        """
+        data_dir = self.directory / manifest["data_dir"]
+        try:
+            columns: Dict[str, Any] = {}
+            for column in manifest["columns"]:
+                # Vue ndarray simple sur le fichier projeté en mémoire
+                values = np.asarray(np.load(data_dir / column["file"], mmap_mode="r"))
+                if column["kind"] == "categorical":
+                    categories = np.load(data_dir / column["categories"])
+                    values = pd.Categorical.from_codes(
+                        values, categories=categories.astype("U").astype(object)
+                    )
+                elif column["kind"] == "text":
+                    values = values.astype("U").astype(object)
+                    if column.get("mask"):
+                        mask = np.load(data_dir / column["mask"])
+                        values[mask] = None
+                columns[column["name"]] = values
+            df = pd.DataFrame(columns, copy=False)
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Unreadable snapshot in {self.directory}: {str(e)}")
+            return None
+
+        logger.info(f"Loaded {len(df)} transactions from snapshot {data_dir}")
+        return df
+
+    def save(self, file_path: str, df: pd.DataFrame) -> None:
+        """
+        Écrit le dataset nettoyé dans le cache.
+
+        Les colonnes sont écrites dans un nouveau sous-répertoire, puis le
+        manifeste est remplacé atomiquement : un démarrage concurrent lit
+        soit l'ancien cache, soit le nouveau.
+
+        Parameters
+        ----------
+        file_path : str
+            Chemin vers le fichier CSV d'origine
+        df : pd.DataFrame
+            DataFrame nettoyé
+        """
+        self.write(df, compute_fingerprint(file_path))
+
+    def write(self, df: pd.DataFrame, source: Dict[str, Any]) -> None:
+        """
+        Écrit un DataFrame nettoyé dans le cache.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            DataFrame nettoyé
+        source : Dict[str, Any]
+            Description de ce que contient le cache (empreinte du fichier
+            CSV d'origine, ou point de reprise du journal des modifications)
+        """
+        digest = hashlib.sha1(json.dumps(source, sort_keys=True).encode("utf-8"))
+        data_dir_name = f"v{FORMAT_VERSION}-{digest.hexdigest()[:12]}"
+        data_dir = self.directory / data_dir_name
+        data_dir.mkdir(parents=True, exist_ok=True)
+
+        columns: List[Dict[str, Any]] = []
+        for position, name in enumerate(df.columns):
+            series = df[name]
+            entry: Dict[str, Any] = {"name": name, "file": f"{position}.npy"}
+            if isinstance(series.dtype, pd.CategoricalDtype):
+                entry["kind"] = "categorical"
+                entry["categories"] = f"{position}.categories.npy"
+                categories = series.cat.categories.to_numpy()
+                np.save(data_dir / entry["categories"], _encode_text(categories))
+                values = series.cat.codes.to_numpy()
+            elif series.dtype == object:
+                values = series.to_numpy()
+                mask = pd.isna(values)
+                if mask.any():
+                    entry["mask"] = f"{position}.mask.npy"
+                    np.save(data_dir / entry["mask"], mask)
+                    values = np.where(mask, "", values)
+                entry["kind"] = "text"
+                values = _encode_text(values)
+            else:
+                entry["kind"] = "numeric"
+                values = series.to_numpy()
+            np.save(data_dir / entry["file"], values)
+            columns.append(entry)
+
+        manifest = {
+            "format_version": FORMAT_VERSION,
+            "source": source,
+            "rows": len(df),
+            "data_dir": data_dir_name,
+            "columns": columns,
+        }
+        tmp_path = self.directory / f"{_MANIFEST_NAME}.tmp"
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.directory / _MANIFEST_NAME)
+
+        # Supprimer les anciennes versions du cache
+        for child in self.directory.iterdir():
+            if child.is_dir() and child.name != data_dir_name:
+                shutil.rmtree(child, ignore_errors=True)
+
+        logger.info(f"Snapshot written to {data_dir}")
+
+    def append(self, file_path: str, df: pd.DataFrame, rows: int) -> bool:
+        """
+        Ajoute des lignes nettoyées à la fin du cache.
+
+        Les colonnes sont prolongées sur place (voir _append_npy) et les
+        nouvelles catégories ajoutées après les existantes, sans réécrire
+        les lignes déjà présentes. Le manifeste est remplacé en dernier :
+        une interruption laisse un cache périmé, ignoré au démarrage.
+
+        Parameters
+        ----------
+        file_path : str
+            Chemin vers le fichier CSV d'origine, prolongé de ces lignes
+        df : pd.DataFrame
+            Lignes ajoutées, nettoyées
+        rows : int
+            Nombre de lignes que le cache doit déjà contenir
+
+        Returns
+        -------
+        bool
+            False si le cache ne peut pas être prolongé (absent, d'un autre
+            contenu ou de types incompatibles) : il doit alors être réécrit
+        """
+        manifest = self._read_manifest()
+        if (
+            manifest is None
+            or manifest.get("format_version") != FORMAT_VERSION
+            or manifest.get("rows") != rows
+            or [column["name"] for column in manifest["columns"]] != list(df.columns)
+        ):
+            return False
+
+        # Préparation de toutes les colonnes avant toute écriture
+        data_dir = self.directory / manifest["data_dir"]
+        writes: List[Tuple[Path, np.ndarray]] = []
+        replaced: List[Tuple[Path, np.ndarray]] = []
+        for column in manifest["columns"]:
+            series = df[column["name"]]
+            dtype, length = _read_header(data_dir / column["file"])
+            if length != rows:
+                return False
+            if column["kind"] == "categorical":
+                if not isinstance(series.dtype, pd.CategoricalDtype):
+                    return False
+                path = data_dir / column["categories"]
+                known = np.load(path).astype("U").astype(object).tolist()
+                existing = set(known)
+                added = [
+                    value for value in series.cat.categories if value not in existing
+                ]
+                categories = known + added
+                values = pd.Categorical(series, categories=categories).codes
+                if added:
+                    encoded = _encode_text(np.array(categories, dtype=object))
+                    replaced.append((path, encoded))
+            elif column["kind"] == "text":
+                values = series.to_numpy()
+                mask = pd.isna(values)
+                if mask.any():
+                    if not column.get("mask"):
+                        return False
+                    values = np.where(mask, "", values)
+                if column.get("mask"):
+                    writes.append((data_dir / column["mask"], mask))
+                values = _encode_text(values)
+            else:
+                values = series.to_numpy()
+            if not np.can_cast(values.dtype, dtype, casting="safe"):
+                return False
+            writes.append((data_dir / column["file"], values))
+
+        for path, values in writes:
+            _append_npy(path, values)
+        for path, values in replaced:
+            tmp_file = path.with_name(f"{path.name}.tmp")
+            with open(tmp_file, "wb") as f:
+                np.save(f, values)
+            os.replace(tmp_file, path)
+
+        manifest["rows"] = rows + len(df)
+        manifest["source"] = compute_fingerprint(file_path)
+        tmp_path = self.directory / f"{_MANIFEST_NAME}.tmp"
+        tmp_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.directory / _MANIFEST_NAME)
+        logger.info(f"Appended {len(df)} transactions to snapshot {data_dir}")
+        return True
@@ -22,10 +22,56 @@ class Settings:
         Description de l'API
     DATA_PATH : Optional[str]
         Chemin vers le fichier de données
+    SNAPSHOT_DIR : Optional[str]
+        Répertoire du cache colonnaire du dataset (vide pour le désactiver)
+    SNAPSHOT_RETENTION : int
+        Nombre de versions du dataset conservées pour les curseurs
     MAX_PAGE_SIZE : int
         Taille maximale de page pour la pagination
     DEFAULT_PAGE_SIZE : int
         Taille par défaut de page
+    EXPORT_CHUNK_SIZE : int
+        Nombre de lignes encodées par bloc lors d'un export en flux
+    RESPONSE_CACHE_BYTES : int
+        Taille maximale du cache des réponses en octets (0 pour le désactiver)
+    RESPONSE_CACHE_TTL : float
+        Durée de vie des réponses mémorisées en secondes (0 : illimitée)
+    CACHE_CONTROL : str
+        En-tête Cache-Control des réponses conditionnelles (voir http_cache)
+    COMPUTE_THREADS : int
+        Nombre de threads exécutant les traitements pandas hors de la boucle
+    ADMISSION_SEARCH_CONCURRENCY : int
+        Recherches et listes de transactions simultanées
+    ADMISSION_ANALYTICS_CONCURRENCY : int
+        Requêtes simultanées de statistiques, fraude et clients
+    ADMISSION_LOOKUP_CONCURRENCY : int
+        Consultations unitaires simultanées
+    ADMISSION_QUEUE_FACTOR : int
+        Taille de la file d'attente, en multiple de la concurrence
+    ADMISSION_TIMEOUT : float
+        Délai maximal d'attente d'une place avant un 503 (secondes)
+    QUERY_TIMEOUT_MS : int
+        Budget de temps par défaut d'une requête coûteuse (millisecondes)
+    QUERY_TIMEOUT_MAX_MS : int
+        Budget de temps maximal accordé à une requête (millisecondes)
+    RELOAD_INTERVAL : float
+        Intervalle de surveillance du fichier de données en secondes
+        (0 pour désactiver le rechargement automatique)
+    ADMIN_TOKEN : str
+        Jeton des endpoints d'administration (vide pour les désactiver)
+    INGEST_MAX_BATCH : int
+        Nombre maximal de transactions par requête d'ingestion
+    DELTA_COMPACTION_ROWS : int
+        Nombre de transactions en attente déclenchant une compaction
+    DELTA_COMPACTION_INTERVAL : float
+        Délai maximal avant la compaction des transactions en attente
+        (secondes) ; les lectures les voient déjà, la compaction borne
+        seulement la taille du tampon et du journal
+    WAL_DIR : Optional[str]
+        Répertoire du journal des modifications de l'API (vide pour le
+        désactiver : les modifications sont perdues au redémarrage)
+    WAL_CHECKPOINT_BYTES : int
+        Taille du journal déclenchant un point de reprise colonnaire
     """
 
     API_TITLE: str = "Banking Transactions API"
@@ -36,8 +82,43 @@ class Settings:
     DATA_PATH: Optional[str] = os.getenv(
         "DATA_PATH", "data/transactions_data.csv"
     )
+    SNAPSHOT_DIR: Optional[str] = os.getenv("SNAPSHOT_DIR", "data/.snapshot")
+    SNAPSHOT_RETENTION: int = int(os.getenv("SNAPSHOT_RETENTION", "2"))
     MAX_PAGE_SIZE: int = 1000
     DEFAULT_PAGE_SIZE: int = 100
+    EXPORT_CHUNK_SIZE: int = int(os.getenv("EXPORT_CHUNK_SIZE", "10000"))
+    RESPONSE_CACHE_BYTES: int = int(
+        os.getenv("RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024))
+    )
+    RESPONSE_CACHE_TTL: float = float(os.getenv("RESPONSE_CACHE_TTL", "0"))
+    CACHE_CONTROL: str = os.getenv("CACHE_CONTROL", "public, max-age=60")
+    COMPUTE_THREADS: int = int(
+        os.getenv("COMPUTE_THREADS", str(min(8, os.cpu_count() or 1)))
+    )
+    ADMISSION_SEARCH_CONCURRENCY: int = int(
+        os.getenv("ADMISSION_SEARCH_CONCURRENCY", str(COMPUTE_THREADS))
+    )
+    ADMISSION_ANALYTICS_CONCURRENCY: int = int(
+        os.getenv("ADMISSION_ANALYTICS_CONCURRENCY", str(COMPUTE_THREADS))
+    )
+    ADMISSION_LOOKUP_CONCURRENCY: int = int(
+        os.getenv("ADMISSION_LOOKUP_CONCURRENCY", "64")
+    )
+    ADMISSION_QUEUE_FACTOR: int = int(os.getenv("ADMISSION_QUEUE_FACTOR", "4"))
+    ADMISSION_TIMEOUT: float = float(os.getenv("ADMISSION_TIMEOUT", "2"))
+    QUERY_TIMEOUT_MS: int = int(os.getenv("QUERY_TIMEOUT_MS", "10000"))
+    QUERY_TIMEOUT_MAX_MS: int = int(os.getenv("QUERY_TIMEOUT_MAX_MS", "60000"))
+    RELOAD_INTERVAL: float = float(os.getenv("RELOAD_INTERVAL", "5"))
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN", "")
+    INGEST_MAX_BATCH: int = int(os.getenv("INGEST_MAX_BATCH", "1000"))
+    DELTA_COMPACTION_ROWS: int = int(os.getenv("DELTA_COMPACTION_ROWS", "10000"))
+    DELTA_COMPACTION_INTERVAL: float = float(
+        os.getenv("DELTA_COMPACTION_INTERVAL", "300")
+    )
+    WAL_DIR: Optional[str] = os.getenv("WAL_DIR", "data/.wal")
+    WAL_CHECKPOINT_BYTES: int = int(
+        os.getenv("WAL_CHECKPOINT_BYTES", str(64 * 1024 * 1024))
+    )
     HOST: str = os.getenv("API_HOST", "0.0.0.0")
     PORT: int = int(os.getenv("API_PORT", "8000"))
 
@@ -4,34 +4,1066 @@ Gestionnaire de données pour les transactions bancaires.
 Ce module gère le chargement et l'accès aux données de transactions.
 """
 
+import numpy as np
 import pandas as pd
-from typing import Optional
+from collections import OrderedDict
+from contextlib import contextmanager
+from pandas.api.types import union_categoricals
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from pathlib import Path
+import contextvars
+import hashlib
+import io
 import logging
+import os
+import threading
+
+from banking_api.aggregates import DatasetAggregates
+from banking_api.columnar_cache import ColumnarCache
+from banking_api.config import settings
+from banking_api.indexes import (
+    BitmapIndex,
+    ColumnStatistics,
+    GroupIndex,
+    MergedSelection,
+    PrimaryKeyIndex,
+    Selection,
+    SortedIndex,
+)
+from banking_api.schema import (
+    AMOUNT_COLUMN,
+    CATEGORICAL_COLUMNS,
+    apply_schema,
+    clean_text,
+)
 
 logger = logging.getLogger(__name__)
 
+# Colonnes à faible cardinalité indexées par bitmap
+BITMAP_COLUMNS: List[str] = ["use_chip", "merchant_state", "mcc"]
+
+# Colonnes filtrables dont les statistiques alimentent le planificateur
+STATISTICS_COLUMNS: List[str] = [
+    "use_chip",
+    "merchant_state",
+    "mcc",
+    "client_id",
+    "merchant_id",
+    AMOUNT_COLUMN,
+]
+
+# Mémoire maximale des sélections mémorisées par instantané (octets)
+SELECTION_CACHE_BYTES: int = 64 * 1024 * 1024
+
+# Part maximale des lignes supprimées conservées en place : au-delà, le
+# dataset est réécrit sans elles (voir DataManager._append)
+DEAD_ROWS_RATIO: float = 0.1
+
+# Réserve allouée au-delà des lignes d'une version prolongée, en fraction
+# de sa taille (voir DataManager._grow)
+APPEND_HEADROOM: float = 0.25
+
+
+# Taille des blocs dont l'empreinte vérifie qu'un fichier a seulement été
+# prolongé (début du fichier et fin de la partie déjà lue)
+CHECK_BLOCK_SIZE: int = 64 * 1024
+
+# Position de lecture d'un fichier : (octets lus, empreinte de ces octets)
+ReadPosition = Tuple[int, str]
+
+# Modifications de l'API à réappliquer au fichier relu, à partir de
+# l'instantané courant : identifiants à retirer et lignes à ajouter
+RestoreHook = Callable[["DatasetSnapshot"], Tuple[Set[str], pd.DataFrame]]
+
+# Vue courante du dataset et des modifications de l'API en attente
+OverlayHook = Callable[[], "DatasetView"]
+
+
+class SnapshotExpiredError(LookupError):
+    """Version du dataset qui n'est plus conservée en mémoire."""
+
+
+def _freeze(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Construit une vue en lecture seule d'un DataFrame, sans copie.
+
+    Chaque colonne est ré-exposée à partir de son tableau NumPy sous-jacent
+    (les codes pour les colonnes catégorielles) marqué non modifiable :
+    toute écriture en place lève une ValueError.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame source
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame partageant la mémoire de la source, en lecture seule
+    """
+    columns: Dict[str, Any] = {}
+    for name in df.columns:
+        series = df[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy(copy=False)
+            codes.flags.writeable = False
+            columns[name] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        else:
+            values = series.to_numpy(copy=False)
+            values.flags.writeable = False
+            columns[name] = values
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def _concat(frame: pd.DataFrame, *tails: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ajoute des lignes typées à la fin d'un DataFrame typé.
+
+    Les nouvelles catégories sont ajoutées après les existantes : les codes
+    des lignes existantes restent valides.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Lignes existantes
+    *tails : pd.DataFrame
+        Lignes ajoutées (mêmes colonnes, schéma compact), dans l'ordre
+
+    Returns
+    -------
+    pd.DataFrame
+        Nouveau DataFrame
+
+    Raises
+    ------
+    ValueError
+        Si les colonnes diffèrent
+    """
+    if any(list(frame.columns) != list(tail.columns) for tail in tails):
+        raise ValueError("Appended rows do not match the dataset columns")
+    columns: Dict[str, Any] = {}
+    for name in frame.columns:
+        parts = [frame[name]] + [tail[name] for tail in tails]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[name] = union_categoricals(parts)
+        else:
+            columns[name] = np.concatenate([part.to_numpy() for part in parts])
+    return pd.DataFrame(columns, copy=False)
+
+
+def _drop(frame: pd.DataFrame, positions: np.ndarray) -> pd.DataFrame:
+    """
+    Retire des lignes d'un DataFrame.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Lignes
+    positions : np.ndarray
+        Positions des lignes à retirer
+
+    Returns
+    -------
+    pd.DataFrame
+        Lignes restantes (frame lui-même si aucune n'est retirée)
+    """
+    if len(positions) == 0:
+        return frame
+    keep = np.ones(len(frame), dtype=bool)
+    keep[positions] = False
+    return frame[keep]
+
+
+def _contains(positions: np.ndarray, position: int) -> bool:
+    """
+    Teste l'appartenance d'une position à des positions croissantes.
+
+    Parameters
+    ----------
+    positions : np.ndarray
+        Positions croissantes
+    position : int
+        Position recherchée
+
+    Returns
+    -------
+    bool
+        True si la position est présente
+    """
+    slot = int(np.searchsorted(positions, position))
+    return slot < len(positions) and int(positions[slot]) == position
+
+
+def _read_position(f: IO[bytes], offset: int) -> Optional[ReadPosition]:
+    """
+    Calcule la position de lecture d'un fichier après ses offset premiers octets.
+
+    Parameters
+    ----------
+    f : IO[bytes]
+        Fichier ouvert en lecture binaire
+    offset : int
+        Nombre d'octets lus
+
+    Returns
+    -------
+    Optional[ReadPosition]
+        Position de lecture, ou None si les octets lus ne se terminent pas
+        par une fin de ligne (la suite ne peut pas être lue séparément)
+    """
+    digest = hashlib.sha1()
+    f.seek(0)
+    digest.update(f.read(min(offset, CHECK_BLOCK_SIZE)))
+    start = max(offset - CHECK_BLOCK_SIZE, 0)
+    f.seek(start)
+    block = f.read(offset - start)
+    if not block.endswith(b"\n"):
+        return None
+    digest.update(block)
+    return offset, digest.hexdigest()
+
+
+class DatasetSnapshot:
+    """
+    Instantané immuable et versionné du dataset.
+
+    Les services lisent les données à travers un instantané : aucune copie
+    n'est effectuée et toute tentative de modification en place échoue.
+
+    Les index d'accès sont construits avec l'instantané : ils restent donc
+    cohérents avec les données qu'ils décrivent, y compris après un
+    rechargement.
+
+    Les lignes supprimées par l'API restent en place et sont marquées
+    mortes (dead) : les positions des autres lignes ne changent pas. Les
+    index les contiennent encore ; les agrégats et locate() les excluent,
+    et les lectures passent par DatasetView, qui les écarte.
+
+    Attributes
+    ----------
+    version : int
+        Numéro de version du dataset
+    layout : int
+        Version à partir de laquelle les positions des lignes sont
+        inchangées (les versions suivantes n'ont fait qu'ajouter des lignes
+        ou en marquer mortes)
+    dead : np.ndarray
+        Positions croissantes des lignes supprimées
+    id_index : Optional[PrimaryKeyIndex]
+        Index de hachage sur l'identifiant des transactions
+    client_index : Optional[GroupIndex]
+        Index groupé des lignes par client
+    merchant_index : Optional[GroupIndex]
+        Index groupé des lignes par commerçant
+    groups : Dict[str, GroupIndex]
+        Index groupés disponibles, par colonne
+    bitmaps : Dict[str, BitmapIndex]
+        Index bitmap par colonne (BITMAP_COLUMNS et drapeaux errors)
+    amount_index : Optional[SortedIndex]
+        Permutation des lignes triée par montant
+    statistics : Dict[str, ColumnStatistics]
+        Statistiques des colonnes filtrables (STATISTICS_COLUMNS)
+    aggregates : DatasetAggregates
+        Agrégats matérialisés des endpoints de statistiques et de fraude
+    sequence : int
+        Numéro de la dernière transaction ingérée par l'API intégrée à
+        l'instantané (voir banking_api.ingestion)
+    """
+
+    def __init__(
+        self,
+        data: pd.DataFrame,
+        version: int,
+        previous: Optional["DatasetSnapshot"] = None,
+        dead: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Initialise l'instantané et construit ses index.
+
+        Lorsque les données prolongent un instantané précédent (mêmes
+        premières lignes, lignes ajoutées à la fin), ses index et agrégats
+        sont prolongés avec les seules nouvelles lignes au lieu d'être
+        reconstruits.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame en lecture seule (voir _freeze)
+        version : int
+            Numéro de version du dataset
+        previous : Optional[DatasetSnapshot], optional
+            Instantané dont data prolonge les lignes
+        dead : Optional[np.ndarray], optional
+            Positions croissantes des lignes supprimées (celles de previous
+            comprises)
+        """
+        self._frame = data
+        self.version = version
+        self.sequence: int = previous.sequence if previous is not None else 0
+        self.layout: int = previous.layout if previous is not None else version
+        self.dead: np.ndarray = (
+            dead if dead is not None else np.array([], dtype=np.int64)
+        )
+        if previous is None:
+            self._build(data)
+        else:
+            self._extend(previous, data.iloc[len(previous):])
+        self.groups: Dict[str, GroupIndex] = {
+            name: index
+            for name, index in (
+                ("client_id", self.client_index),
+                ("merchant_id", self.merchant_index),
+            )
+            if index is not None
+        }
+        self._selections: "OrderedDict[str, Selection]" = OrderedDict()
+        self._selections_lock = threading.Lock()
+
+    def _build(self, data: pd.DataFrame) -> None:
+        """
+        Construit les index et agrégats de toutes les lignes.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame en lecture seule
+        """
+        self.id_index: Optional[PrimaryKeyIndex] = (
+            PrimaryKeyIndex(data["id"]) if "id" in data.columns else None
+        )
+        self.client_index: Optional[GroupIndex] = (
+            GroupIndex(data["client_id"]) if "client_id" in data.columns else None
+        )
+        self.merchant_index: Optional[GroupIndex] = (
+            GroupIndex(data["merchant_id"]) if "merchant_id" in data.columns else None
+        )
+        self.bitmaps: Dict[str, BitmapIndex] = {
+            name: BitmapIndex.from_column(data[name])
+            for name in BITMAP_COLUMNS
+            if name in data.columns
+        }
+        if "errors" in data.columns:
+            self.bitmaps["errors"] = BitmapIndex.from_tokens(data["errors"])
+        self.amount_index: Optional[SortedIndex] = (
+            SortedIndex(data[AMOUNT_COLUMN]) if AMOUNT_COLUMN in data.columns else None
+        )
+        self.statistics: Dict[str, ColumnStatistics] = {
+            name: ColumnStatistics(data[name])
+            for name in STATISTICS_COLUMNS
+            if name in data.columns
+        }
+        self.aggregates = DatasetAggregates(_drop(data, self.dead))
+
+    def _extend(self, previous: "DatasetSnapshot", tail: pd.DataFrame) -> None:
+        """
+        Prolonge les index et agrégats d'un instantané avec de nouvelles lignes.
+
+        Parameters
+        ----------
+        previous : DatasetSnapshot
+            Instantané prolongé (non modifié)
+        tail : pd.DataFrame
+            Lignes ajoutées à la fin (mêmes colonnes)
+        """
+        size = len(previous)
+        # Lignes de previous supprimées depuis : retirées des agrégats
+        killed = np.setdiff1d(self.dead[self.dead < size], previous.dead)
+        self.aggregates = previous.aggregates.extend(
+            _drop(tail, self.dead[self.dead >= size] - size),
+            previous._frame.iloc[killed] if len(killed) else None,
+        )
+        if len(tail) == 0:
+            self.id_index = previous.id_index
+            self.client_index = previous.client_index
+            self.merchant_index = previous.merchant_index
+            self.bitmaps = previous.bitmaps
+            self.amount_index = previous.amount_index
+            self.statistics = previous.statistics
+            return
+        id_index = previous.id_index
+        self.id_index = id_index.extend(tail["id"]) if id_index is not None else None
+        client_index = previous.client_index
+        self.client_index = (
+            client_index.extend(tail["client_id"]) if client_index is not None else None
+        )
+        merchant_index = previous.merchant_index
+        self.merchant_index = (
+            merchant_index.extend(tail["merchant_id"])
+            if merchant_index is not None
+            else None
+        )
+        self.bitmaps = {
+            name: index.extend(
+                BitmapIndex.from_tokens(tail[name])
+                if name == "errors"
+                else BitmapIndex.from_column(tail[name])
+            )
+            for name, index in previous.bitmaps.items()
+        }
+        amount_index = previous.amount_index
+        self.amount_index = (
+            amount_index.extend(tail[AMOUNT_COLUMN])
+            if amount_index is not None
+            else None
+        )
+        self.statistics = {
+            name: statistics.extend(tail[name])
+            for name, statistics in previous.statistics.items()
+        }
+
+    def selection(self, key: str, build: Callable[[], Selection]) -> Selection:
+        """
+        Retourne une sélection mémorisée, ou la construit.
+
+        Les sélections sont mémorisées par clé de filtres (LRU bornée par
+        SELECTION_CACHE_BYTES) : les pages suivantes d'un même parcours ne
+        ré-évaluent pas les filtres.
+
+        Parameters
+        ----------
+        key : str
+            Empreinte des filtres
+        build : Callable[[], Selection]
+            Construction de la sélection en cas d'absence
+
+        Returns
+        -------
+        Selection
+            Sélection correspondant aux filtres
+        """
+        with self._selections_lock:
+            cached = self._selections.get(key)
+            if cached is not None:
+                self._selections.move_to_end(key)
+                return cached
+        selection = build()
+        if selection.nbytes <= SELECTION_CACHE_BYTES:
+            with self._selections_lock:
+                self._selections[key] = selection
+                used = sum(item.nbytes for item in self._selections.values())
+                while used > SELECTION_CACHE_BYTES:
+                    _, evicted = self._selections.popitem(last=False)
+                    used -= evicted.nbytes
+        return selection
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """
+        Vue en lecture seule des transactions.
+
+        Il s'agit d'une copie superficielle : les colonnes ajoutées par
+        l'appelant restent locales, les valeurs sont partagées.
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame des transactions
+        """
+        return self._frame.copy(deep=False)
+
+    def column(self, name: str) -> pd.Series:
+        """
+        Retourne une colonne de l'instantané, sans copie.
+
+        Parameters
+        ----------
+        name : str
+            Nom de la colonne
+
+        Returns
+        -------
+        pd.Series
+            Colonne en lecture seule
+        """
+        return self._frame[name]
+
+    def locate(self, transaction_id: str) -> Optional[int]:
+        """
+        Retourne la position de la transaction portant un identifiant.
+
+        Parameters
+        ----------
+        transaction_id : str
+            Identifiant de la transaction
+
+        Returns
+        -------
+        Optional[int]
+            Position de la ligne, ou None si elle est absente ou supprimée
+        """
+        if self.id_index is None:
+            return None
+        if len(self.dead) == 0:
+            return self.id_index.lookup(transaction_id)
+        for position in self.id_index.lookup_all(transaction_id).tolist():
+            if not _contains(self.dead, position):
+                return int(position)
+        return None
+
+    def rows_with_ids(self, ids: Collection[str]) -> pd.DataFrame:
+        """
+        Extrait les transactions portant l'un des identifiants donnés.
+
+        Parameters
+        ----------
+        ids : Collection[str]
+            Identifiants recherchés
+
+        Returns
+        -------
+        pd.DataFrame
+            Lignes trouvées (hors lignes supprimées), renumérotées
+        """
+        if not ids:
+            return self._frame.iloc[:0]
+        frame = _drop(self._frame, self.dead)
+        return frame[frame["id"].isin(list(ids))].reset_index(drop=True)
+
+    def take(self, positions: Union[np.ndarray, slice]) -> pd.DataFrame:
+        """
+        Extrait des lignes par position.
+
+        Parameters
+        ----------
+        positions : Union[np.ndarray, slice]
+            Positions des lignes à extraire
+
+        Returns
+        -------
+        pd.DataFrame
+            Lignes extraites
+        """
+        return self._frame.iloc[positions]
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de lignes de l'instantané.
+
+        Returns
+        -------
+        int
+            Nombre de lignes, lignes supprimées comprises
+        """
+        return len(self._frame)
+
+
+def _live_keys(
+    snapshot: DatasetSnapshot, column: str, hidden: np.ndarray
+) -> np.ndarray:
+    """
+    Retourne les clés d'un index groupé portées par au moins une ligne.
+
+    Parameters
+    ----------
+    snapshot : DatasetSnapshot
+        Instantané indexé
+    column : str
+        Colonne de l'index groupé
+    hidden : np.ndarray
+        Positions croissantes des lignes écartées
+
+    Returns
+    -------
+    np.ndarray
+        Clés distinctes, triées
+    """
+    index = snapshot.groups.get(column)
+    if index is None:
+        return np.array([], dtype=np.int64)
+    keys: np.ndarray = index.keys
+    if len(hidden) == 0:
+        return keys
+    values, counts = np.unique(
+        snapshot.column(column).to_numpy()[hidden], return_counts=True
+    )
+    remaining = np.diff(index.offsets)
+    remaining[np.searchsorted(keys, values)] -= counts
+    return keys[remaining > 0]
+
+
+class DatasetView:
+    """
+    Lecture du dataset publié et des modifications de l'API en attente.
+
+    Les modifications de l'API ne sont intégrées au dataset que par lots
+    (voir banking_api.ingestion). Entre deux compactions, une vue présente
+    l'instantané publié, privé de ses lignes mortes et des lignes
+    supprimées depuis, suivi des transactions ingérées depuis. Les
+    positions de ces dernières prolongent celles de l'instantané dans
+    l'ordre où la compaction les ajoutera : une position reste valide
+    après la compaction suivante.
+
+    Attributes
+    ----------
+    snapshot : DatasetSnapshot
+        Instantané publié
+    tail : Optional[DatasetSnapshot]
+        Transactions ingérées depuis (celles supprimées depuis y sont
+        mortes), ou None
+    removed : np.ndarray
+        Positions croissantes des lignes de l'instantané supprimées depuis
+    sequence : int
+        Numéro de la dernière modification de l'API lue par la vue
+    hidden : np.ndarray
+        Positions croissantes des lignes de l'instantané écartées (mortes
+        ou supprimées depuis)
+    """
+
+    def __init__(
+        self,
+        snapshot: DatasetSnapshot,
+        tail: Optional[DatasetSnapshot] = None,
+        removed: Optional[np.ndarray] = None,
+        sequence: Optional[int] = None,
+    ) -> None:
+        """
+        Initialise la vue (instantané seul par défaut).
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané publié
+        tail : Optional[DatasetSnapshot], optional
+            Transactions ingérées depuis
+        removed : Optional[np.ndarray], optional
+            Positions croissantes des lignes de l'instantané supprimées
+            depuis
+        sequence : Optional[int], optional
+            Numéro de la dernière modification lue (défaut: celle de
+            l'instantané)
+        """
+        self.snapshot = snapshot
+        self.tail = tail
+        self.removed: np.ndarray = (
+            removed if removed is not None else np.array([], dtype=np.int64)
+        )
+        self.sequence: int = snapshot.sequence if sequence is None else sequence
+        self.hidden: np.ndarray = (
+            np.union1d(snapshot.dead, self.removed)
+            if len(self.removed)
+            else snapshot.dead
+        )
+        self._aggregates: Optional[DatasetAggregates] = None
+
+    def extend(
+        self, changes: Iterable[Tuple[str, Optional[pd.DataFrame]]], sequence: int
+    ) -> "DatasetView":
+        """
+        Construit la vue intégrant de nouvelles modifications de l'API.
+
+        Seules les nouvelles modifications sont parcourues : les index des
+        transactions ingérées sont prolongés (voir DatasetSnapshot).
+
+        Parameters
+        ----------
+        changes : Iterable[Tuple[str, Optional[pd.DataFrame]]]
+            Identifiant et lot normalisé de chaque modification, dans
+            l'ordre (lot None : suppression) ; les transactions d'un lot se
+            suivent, dans l'ordre de ses lignes
+        sequence : int
+            Numéro de la dernière modification
+
+        Returns
+        -------
+        DatasetView
+            Nouvelle vue (la vue courante n'est pas modifiée)
+        """
+        tail = self.tail
+        size = len(tail) if tail is not None else 0
+        frames: List[pd.DataFrame] = []
+        added: Dict[str, int] = {}
+        dead: List[int] = []
+        removed: List[int] = []
+        for transaction_id, rows in changes:
+            if rows is not None:
+                if not frames or frames[-1] is not rows:
+                    frames.append(rows)
+                added[transaction_id] = size
+                size += 1
+                continue
+            position = added.pop(transaction_id, None)
+            if position is None and tail is not None:
+                position = tail.locate(transaction_id)
+            if position is not None:
+                dead.append(position)
+                continue
+            position = self.snapshot.locate(transaction_id)
+            if position is not None:
+                removed.append(position)
+
+        if frames or dead:
+            parts = ([tail._frame] if tail is not None else []) + frames
+            data = _freeze(parts[0] if len(parts) == 1 else _concat(*parts))
+            killed = np.array(dead, dtype=np.int64)
+            tail = DatasetSnapshot(
+                data,
+                self.snapshot.version,
+                tail,
+                np.union1d(tail.dead, killed) if tail is not None else np.sort(killed),
+            )
+        return DatasetView(
+            self.snapshot,
+            tail,
+            np.union1d(self.removed, np.array(removed, dtype=np.int64)),
+            sequence,
+        )
+
+    @property
+    def state(self) -> Tuple[int, int]:
+        """
+        État du dataset lu par la vue, pour les caches et les ETags.
+
+        Returns
+        -------
+        Tuple[int, int]
+            Version de l'instantané et numéro de la dernière modification
+        """
+        return self.snapshot.version, self.sequence
+
+    def selection(
+        self, key: Optional[str], build: Callable[[DatasetSnapshot], Selection]
+    ) -> MergedSelection:
+        """
+        Sélectionne les lignes de la vue satisfaisant des filtres.
+
+        Les filtres sont évalués séparément sur l'instantané et sur les
+        transactions ingérées, avec les index de chacun ; les sélections
+        sont mémorisées par chacun d'eux (voir DatasetSnapshot.selection).
+
+        Parameters
+        ----------
+        key : Optional[str]
+            Empreinte des filtres (None : sélection non mémorisée)
+        build : Callable[[DatasetSnapshot], Selection]
+            Évaluation des filtres sur un instantané
+
+        Returns
+        -------
+        MergedSelection
+            Lignes sélectionnées, en positions de la vue
+        """
+
+        def select(target: DatasetSnapshot) -> Selection:
+            if key is None:
+                return build(target).without(target.dead)
+            return target.selection(key, lambda: build(target).without(target.dead))
+
+        head = select(self.snapshot).without(self.removed)
+        tail = select(self.tail) if self.tail is not None else Selection(0)
+        return MergedSelection(head, tail, len(self.snapshot))
+
+    def take(self, positions: np.ndarray) -> pd.DataFrame:
+        """
+        Extrait des lignes par position.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            Positions croissantes des lignes à extraire
+
+        Returns
+        -------
+        pd.DataFrame
+            Lignes extraites
+        """
+        size = len(self.snapshot)
+        split = int(np.searchsorted(positions, size))
+        head = self.snapshot.take(positions[:split])
+        if split == len(positions) or self.tail is None:
+            return head
+        tail = self.tail.take(positions[split:] - size)
+        return tail if split == 0 else _concat(head, tail)
+
+    def source(
+        self, positions: np.ndarray
+    ) -> Tuple[pd.DataFrame, Optional[np.ndarray]]:
+        """
+        Retourne de quoi construire une page de lignes (voir TransactionPage).
+
+        Lorsque toutes les lignes proviennent de l'instantané, leur
+        extraction est différée jusqu'à l'encodage.
+
+        Parameters
+        ----------
+        positions : np.ndarray
+            Positions croissantes des lignes de la page
+
+        Returns
+        -------
+        Tuple[pd.DataFrame, Optional[np.ndarray]]
+            Dataset et positions des lignes, ou lignes extraites et None
+        """
+        if len(positions) == 0 or positions[-1] < len(self.snapshot):
+            return self.snapshot.data, positions
+        return self.take(positions), None
+
+    def locate(self, transaction_id: str) -> Optional[int]:
+        """
+        Retourne la position de la transaction portant un identifiant.
+
+        Parameters
+        ----------
+        transaction_id : str
+            Identifiant de la transaction
+
+        Returns
+        -------
+        Optional[int]
+            Position de la ligne, ou None si elle est absente ou supprimée
+        """
+        if self.tail is not None:
+            position = self.tail.locate(transaction_id)
+            if position is not None:
+                return len(self.snapshot) + position
+        position = self.snapshot.locate(transaction_id)
+        if position is None or _contains(self.removed, position):
+            return None
+        return position
+
+    def lookup(self, column: str, key: Any) -> np.ndarray:
+        """
+        Retourne les positions des lignes portant une clé d'index groupé.
+
+        Parameters
+        ----------
+        column : str
+            Colonne de l'index groupé (voir DatasetSnapshot.groups)
+        key : Any
+            Clé recherchée
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes des lignes (vide si la clé est absente)
+        """
+        parts: List[np.ndarray] = []
+        for snapshot, hidden, offset in self._parts():
+            index = snapshot.groups.get(column)
+            if index is not None:
+                positions = index.lookup(key)
+                if len(hidden):
+                    positions = positions[~np.isin(positions, hidden)]
+                parts.append(positions.astype(np.int64) + offset)
+        if not parts:
+            return np.array([], dtype=np.int64)
+        return np.concatenate(parts)
+
+    def keys(self, column: str) -> np.ndarray:
+        """
+        Retourne les clés d'index groupé portées par au moins une ligne.
+
+        Parameters
+        ----------
+        column : str
+            Colonne de l'index groupé (voir DatasetSnapshot.groups)
+
+        Returns
+        -------
+        np.ndarray
+            Clés distinctes, triées
+        """
+        keys = [
+            _live_keys(snapshot, column, hidden)
+            for snapshot, hidden, _ in self._parts()
+        ]
+        return keys[0] if len(keys) == 1 else np.union1d(keys[0], keys[1])
+
+    def frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Retourne les lignes de la vue.
+
+        Sans ligne écartée ni transaction ingérée, les valeurs de
+        l'instantané sont partagées ; sinon les lignes sont recopiées.
+
+        Parameters
+        ----------
+        columns : Optional[List[str]], optional
+            Colonnes retenues (défaut: toutes)
+
+        Returns
+        -------
+        pd.DataFrame
+            Lignes en lecture seule
+        """
+        parts = []
+        for snapshot, hidden, _ in self._parts():
+            frame = snapshot.data
+            if columns is not None:
+                frame = pd.DataFrame(
+                    {name: frame[name] for name in columns}, copy=False
+                )
+            parts.append(_drop(frame, hidden))
+        if len(parts) == 1 or len(parts[1]) == 0:
+            return parts[0]
+        return _concat(parts[0], parts[1])
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """
+        Lignes de la vue (voir frame).
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame des transactions
+        """
+        return self.frame()
+
+    def column(self, name: str) -> pd.Series:
+        """
+        Retourne une colonne des lignes de la vue.
+
+        Parameters
+        ----------
+        name : str
+            Nom de la colonne
+
+        Returns
+        -------
+        pd.Series
+            Colonne en lecture seule
+        """
+        return self.frame([name])[name]
+
+    @property
+    def aggregates(self) -> DatasetAggregates:
+        """
+        Agrégats des lignes de la vue.
+
+        Ceux de l'instantané sont combinés, au premier accès, à ceux des
+        transactions ingérées, moins ceux des lignes supprimées depuis.
+
+        Returns
+        -------
+        DatasetAggregates
+            Agrégats matérialisés
+        """
+        aggregates = self._aggregates
+        if aggregates is None:
+            removed = (
+                self.snapshot.take(self.removed) if len(self.removed) else None
+            )
+            aggregates = self.snapshot.aggregates.combine(
+                self.tail.aggregates if self.tail is not None else None, removed
+            )
+            self._aggregates = aggregates
+        return aggregates
+
+    def _parts(self) -> List[Tuple[DatasetSnapshot, np.ndarray, int]]:
+        """
+        Retourne les instantanés lus par la vue.
+
+        Returns
+        -------
+        List[Tuple[DatasetSnapshot, np.ndarray, int]]
+            Instantané, positions de ses lignes écartées et position de sa
+            première ligne dans la vue
+        """
+        parts = [(self.snapshot, self.hidden, 0)]
+        if self.tail is not None:
+            parts.append((self.tail, self.tail.dead, len(self.snapshot)))
+        return parts
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de transactions de la vue.
+
+        Returns
+        -------
+        int
+            Nombre de transactions
+        """
+        return sum(len(snapshot) - len(hidden) for snapshot, hidden, _ in self._parts())
+
+
+# Vue fixée pour la requête en cours (propagée aux threads du pool)
+_pinned: "contextvars.ContextVar[Optional[DatasetView]]" = contextvars.ContextVar(
+    "pinned_view", default=None
+)
+
 
 class DataManager:
     """
     Gestionnaire singleton pour les données de transactions.
 
     Cette classe charge et maintient en mémoire le dataset des transactions
-    bancaires. Elle fournit un accès thread-safe aux données.
+    bancaires. Elle fournit un accès thread-safe aux données à travers des
+    instantanés en lecture seule.
+
+    Les lecteurs ne prennent aucun verrou : ils lisent la référence de
+    l'instantané publié, qui reste valide jusqu'à la fin de leur requête.
+    Un rechargement construit le nouvel instantané à part (données, index,
+    agrégats), puis le publie en remplaçant cette référence en une seule
+    affectation. Les écrivains sont sérialisés entre eux par _lock.
 
     Attributes
     ----------
     _instance : Optional[DataManager]
         Instance unique du gestionnaire
-    _data : Optional[pd.DataFrame]
-        DataFrame contenant les transactions
     _loaded : bool
         Indicateur de chargement des données
+    _snapshot : Optional[DatasetSnapshot]
+        Instantané publié
+    _version : int
+        Dernier numéro de version publié (croissant)
+    _history : OrderedDict[int, DatasetSnapshot]
+        Instantanés récents conservés pour la pagination par curseur,
+        remplacés (et non modifiés) à chaque publication
+    _lock : threading.Lock
+        Verrou des écrivains
+    _source : Optional[str]
+        Fichier CSV chargé, relu par reload()
+    _snapshot_dir : Optional[str]
+        Répertoire du cache colonnaire associé à _source
+    _reload_lock : threading.Lock
+        Verrou sérialisant les rechargements (une seule analyse à la fois)
+    _position : Optional[ReadPosition]
+        Octets de _source déjà intégrés et leur empreinte, pour ne lire
+        que les lignes ajoutées au rechargement suivant
+    _file_rows : int
+        Nombre de lignes du dataset provenant de _source (les autres ont
+        été ingérées par l'API)
+    _restore : Optional[RestoreHook]
+        Modifications de l'API réappliquées à chaque lecture complète du
+        fichier (voir banking_api.ingestion)
+    _overlay : Optional[OverlayHook]
+        Vue de l'instantané publié et des modifications de l'API en
+        attente (voir banking_api.ingestion)
+    _storage : Dict[str, np.ndarray]
+        Tableaux, avec leur réserve, dont les colonnes de la version
+        _storage_version sont les premières lignes (voir _grow)
+    _storage_version : int
+        Version dont _storage porte les colonnes
     """
 
     _instance: Optional["DataManager"] = None
-    _data: Optional[pd.DataFrame] = None
     _loaded: bool = False
+    _snapshot: Optional[DatasetSnapshot] = None
+    _version: int = 0
+    _history: "OrderedDict[int, DatasetSnapshot]" = OrderedDict()
+    _lock: threading.Lock = threading.Lock()
+    _source: Optional[str] = None
+    _snapshot_dir: Optional[str] = None
+    _reload_lock: threading.Lock = threading.Lock()
+    _position: Optional[ReadPosition] = None
+    _file_rows: int = 0
+    _restore: Optional[RestoreHook] = None
+    _overlay: Optional[OverlayHook] = None
+    _storage: Dict[str, np.ndarray] = {}
+    _storage_version: int = 0
 
     def __new__(cls) -> "DataManager":
         """
@@ -46,14 +1078,20 @@ class DataManager:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def load_data(self, file_path: str) -> None:
+    def load_data(self, file_path: str, snapshot_dir: Optional[str] = None) -> None:
         """
         Charge les données depuis un fichier CSV.
 
+        Si un répertoire de cache colonnaire est fourni, le dataset est lu
+        depuis ce cache lorsqu'il correspond au fichier CSV ; sinon le CSV
+        est analysé puis le cache est (ré)écrit pour les démarrages suivants.
+
         Parameters
         ----------
         file_path : str
             Chemin vers le fichier CSV
+        snapshot_dir : Optional[str], optional
+            Répertoire du cache colonnaire (désactivé si None)
 
         Raises
         ------
@@ -67,56 +1105,585 @@ class DataManager:
             logger.error(f"Data file not found: {file_path}")
             raise FileNotFoundError(f"Data file not found: {file_path}")
 
-        try:
-            logger.info(f"Loading data from {file_path}")
-            self._data = pd.read_csv(file_path)
+        size = path.stat().st_size
+        cache = ColumnarCache(snapshot_dir) if snapshot_dir else None
+        data = cache.load(file_path) if cache is not None else None
 
-            # Convertir l'ID en string
-            self._data["id"] = self._data["id"].astype(str)
+        if data is None:
+            try:
+                logger.info(f"Loading data from {file_path}")
+                data = self._read_csv(file_path)
+            except Exception as e:
+                logger.error(f"Error loading data: {str(e)}")
+                raise ValueError(f"Error loading data: {str(e)}")
 
-            # Clean amount (remove "$" and convert to float)
-            if self._data["amount"].dtype == object:
-                self._data["amount"] = self._data["amount"].str.replace("$", "").astype(float)
+            if cache is not None:
+                try:
+                    cache.save(file_path, data)
+                except OSError as e:
+                    logger.warning(f"Could not write snapshot: {str(e)}")
 
-            # Convert zip to int (pandas may load it as float)
-            if "zip" in self._data.columns:
-                self._data["zip"] = self._data["zip"].fillna(0).astype(int)
+        self._publish(data, restore=True)
+        self._source = file_path
+        self._snapshot_dir = snapshot_dir
+        self._file_rows = len(data)
+        self._position = None
+        # Un fichier modifié pendant la lecture sera relu entièrement
+        if path.stat().st_size == size:
+            with open(path, "rb") as f:
+                self._position = _read_position(f, size)
+        self._loaded = True
+        logger.info(f"Data loaded successfully: {len(data)} transactions")
+
+    def reload(self) -> DatasetSnapshot:
+        """
+        Recharge le fichier de données sans interrompre le service.
 
-            # Clean text fields (replace NaN with empty string)
-            text_columns = ["use_chip", "merchant_city", "merchant_state"]
-            for col in text_columns:
-                if col in self._data.columns:
-                    self._data[col] = self._data[col].fillna("").astype(str)
+        Si le fichier a seulement été prolongé depuis le dernier chargement,
+        seules les lignes ajoutées sont lues, nettoyées et ajoutées au
+        dataset (voir _read_tail) ; sinon il est relu entièrement. Le
+        fichier est lu dans le thread appelant pendant que les requêtes
+        continuent d'être servies par la version courante ; la nouvelle
+        version est ensuite publiée atomiquement. Les requêtes en cours
+        conservent leur instantané, dont la mémoire est libérée dès
+        qu'aucune requête ni curseur (SNAPSHOT_RETENTION) ne l'utilise.
+        En cas d'échec, la version courante reste publiée.
 
-            # Handle missing values in errors
-            if "errors" in self._data.columns:
-                self._data["errors"] = self._data["errors"].fillna("").astype(str)
-                self._data.loc[self._data["errors"] == "nan", "errors"] = None
+        Returns
+        -------
+        DatasetSnapshot
+            Instantané publié
 
-            self._loaded = True
-            logger.info(f"Data loaded successfully: {len(self._data)} transactions")
+        Raises
+        ------
+        RuntimeError
+            Si aucun fichier n'a été chargé
+        FileNotFoundError
+            Si le fichier n'existe plus
+        ValueError
+            Si le fichier est invalide
+        """
+        with self._reload_lock:
+            if self._source is None:
+                raise RuntimeError("No data file to reload")
+            appended = self._read_tail(self._source)
+            if appended is None:
+                logger.info(f"Reloading data from {self._source}")
+                self.load_data(self._source, snapshot_dir=self._snapshot_dir)
+            else:
+                tail, position = appended
+                if len(tail) > 0:
+                    snapshot = self._append(tail)
+                    self._append_to_cache(tail, len(snapshot) - len(tail), position)
+                    self._file_rows += len(tail)
+                self._position = position
+        return self.get_snapshot()
+
+    def _read_tail(
+        self, file_path: str
+    ) -> Optional[Tuple[pd.DataFrame, ReadPosition]]:
+        """
+        Lit les lignes ajoutées au fichier depuis le dernier chargement.
 
+        Le fichier est considéré comme prolongé si le début du fichier
+        (en-tête) et la fin de la partie déjà lue sont inchangés. Une
+        dernière ligne incomplète (écriture en cours) est laissée pour le
+        rechargement suivant.
+
+        Parameters
+        ----------
+        file_path : str
+            Chemin vers le fichier CSV
+
+        Returns
+        -------
+        Optional[Tuple[pd.DataFrame, ReadPosition]]
+            Lignes ajoutées, nettoyées (éventuellement aucune), et nouvelle
+            position de lecture ; None si le fichier doit être relu
+            entièrement
+
+        Raises
+        ------
+        FileNotFoundError
+            Si le fichier n'existe plus
+        ValueError
+            Si les lignes ajoutées sont invalides
+        """
+        if self._position is None:
+            return None
+        offset, _ = self._position
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < offset or _read_position(f, offset) != self._position:
+                return None
+            f.seek(offset)
+            appended = f.read(size - offset)
+            end = appended.rfind(b"\n") + 1
+            position = _read_position(f, offset + end) if end else self._position
+            f.seek(0)
+            header = f.readline()
+        if position is None:
+            return None
+        if not end:
+            return pd.DataFrame(), position
+        try:
+            tail = self._read_csv(io.BytesIO(header + appended[:end]))
         except Exception as e:
-            logger.error(f"Error loading data: {str(e)}")
-            raise ValueError(f"Error loading data: {str(e)}")
+            raise ValueError(f"Error loading appended data: {str(e)}")
+        logger.info(f"Read {len(tail)} appended transactions from {file_path}")
+        return tail, position
 
-    def get_data(self) -> pd.DataFrame:
+    def _append(
+        self,
+        tail: pd.DataFrame,
+        sequence: Optional[int] = None,
+        removed: Collection[str] = (),
+        discarded: Collection[int] = (),
+    ) -> DatasetSnapshot:
         """
-        Retourne le DataFrame des transactions.
+        Publie une nouvelle version prolongeant la version courante.
+
+        Les colonnes, index et agrégats de la version courante sont
+        prolongés avec les seules lignes ajoutées (voir _grow et
+        DatasetSnapshot). Les lignes retirées restent en place, marquées
+        mortes : les positions des autres lignes ne changent pas. Le
+        dataset n'est réécrit sans elles que lorsqu'elles dépassent
+        DEAD_ROWS_RATIO des lignes.
+
+        Parameters
+        ----------
+        tail : pd.DataFrame
+            Lignes ajoutées, nettoyées (éventuellement aucune)
+        sequence : Optional[int], optional
+            Numéro de la dernière transaction ingérée par l'API parmi ces
+            lignes (défaut: lignes provenant du fichier)
+        removed : Collection[str], optional
+            Identifiants des lignes à retirer avant l'ajout (les
+            identifiants absents sont ignorés)
+        discarded : Collection[int], optional
+            Positions, dans tail, des lignes supprimées avant d'être
+            publiées
+
+        Returns
+        -------
+        DatasetSnapshot
+            Instantané publié, ou l'instantané courant si rien ne change
+
+        Raises
+        ------
+        ValueError
+            Si les colonnes des lignes ajoutées diffèrent du dataset
+        """
+        with self._lock:
+            previous = self._snapshot
+            if previous is None:
+                raise RuntimeError("Data not loaded. Call load_data() first.")
+            positions = [
+                position
+                for position in map(previous.locate, removed)
+                if position is not None
+            ]
+            if not positions and len(tail) == 0:
+                return previous
+            size = len(previous)
+            killed = np.array(positions + [size + row for row in discarded])
+            dead = np.union1d(previous.dead, killed).astype(np.int64)
+            if len(dead) > DEAD_ROWS_RATIO * (size + len(tail)):
+                # Réécriture sans les lignes mortes : nouvelles positions
+                frame = _concat(previous._frame, tail) if len(tail) else previous._frame
+                data = _freeze(_drop(frame, dead).reset_index(drop=True))
+                snapshot = DatasetSnapshot(data, self._version + 1)
+                snapshot.sequence = previous.sequence
+                self._storage = {}
+            else:
+                owned = self._storage_version == previous.version
+                data = (
+                    _freeze(self._grow(previous, tail))
+                    if len(tail)
+                    else previous._frame
+                )
+                snapshot = DatasetSnapshot(data, self._version + 1, previous, dead)
+                if owned or len(tail):
+                    self._storage_version = snapshot.version
+            if sequence is not None:
+                snapshot.sequence = sequence
+            self._install(snapshot)
+        logger.info(
+            f"Published dataset version {snapshot.version} "
+            f"(+{len(tail)} -{len(killed)} transactions)"
+        )
+        return snapshot
+
+    def _grow(self, previous: DatasetSnapshot, tail: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prolonge les colonnes d'un instantané (appelé sous _lock).
+
+        Les colonnes sont des vues sur les premières lignes de tableaux
+        alloués avec une réserve (APPEND_HEADROOM, voir _storage) : les
+        lignes ajoutées sont écrites dans la réserve, au-delà des lignes
+        visibles des versions publiées, sans recopier les lignes
+        existantes. Un tableau n'est réalloué que lorsque sa réserve est
+        épuisée ou que le type de la colonne s'élargit. Pour une colonne
+        catégorielle, les nouvelles catégories sont ajoutées après les
+        existantes : les codes déjà écrits restent valides.
+
+        Parameters
+        ----------
+        previous : DatasetSnapshot
+            Instantané prolongé (version courante)
+        tail : pd.DataFrame
+            Lignes ajoutées (mêmes colonnes, schéma compact)
 
         Returns
         -------
         pd.DataFrame
-            DataFrame contenant les transactions
+            Lignes de previous suivies des lignes ajoutées
+
+        Raises
+        ------
+        ValueError
+            Si les colonnes diffèrent
+        """
+        frame = previous._frame
+        if list(frame.columns) != list(tail.columns):
+            raise ValueError("Appended rows do not match the dataset columns")
+        size, total = len(frame), len(frame) + len(tail)
+        owned = self._storage_version == previous.version
+        storage: Dict[str, np.ndarray] = {}
+        columns: Dict[str, Any] = {}
+        for name in frame.columns:
+            head, added = frame[name], tail[name]
+            dtype: Optional[pd.CategoricalDtype] = None
+            if isinstance(head.dtype, pd.CategoricalDtype) and isinstance(
+                added.dtype, pd.CategoricalDtype
+            ):
+                categories = head.cat.categories
+                new = added.cat.categories.difference(categories, sort=False)
+                dtype = (
+                    pd.CategoricalDtype(categories.append(new))
+                    if len(new)
+                    else head.dtype
+                )
+                values = head.cat.codes.to_numpy()
+                extra = added.cat.set_categories(dtype.categories).cat.codes.to_numpy()
+                kind = pd.Categorical([], dtype=dtype).codes.dtype
+            else:
+                values, extra = head.to_numpy(), added.to_numpy()
+                kind = np.result_type(values, extra)
+            buffer = self._storage.get(name) if owned else None
+            if buffer is None or buffer.dtype != kind or len(buffer) < total:
+                buffer = np.empty(int(total * (1 + APPEND_HEADROOM)) + 1, dtype=kind)
+                buffer[:size] = values
+            buffer[size:total] = extra
+            storage[name] = buffer
+            columns[name] = (
+                buffer[:total]
+                if dtype is None
+                else pd.Categorical.from_codes(buffer[:total], dtype=dtype)
+            )
+        self._storage = storage
+        return pd.DataFrame(columns, copy=False)
+
+    def _append_to_cache(
+        self, tail: pd.DataFrame, rows: int, position: ReadPosition
+    ) -> None:
+        """
+        Prolonge le cache colonnaire avec les lignes ajoutées.
+
+        Le cache n'est mis à jour que si le fichier a été lu jusqu'au bout :
+        son empreinte décrit alors exactement les lignes intégrées.
+
+        Parameters
+        ----------
+        tail : pd.DataFrame
+            Lignes ajoutées, nettoyées
+        rows : int
+            Nombre de lignes avant l'ajout
+        position : ReadPosition
+            Position de lecture après l'ajout
+        """
+        if not self._snapshot_dir or self._source is None:
+            return
+        # Le cache ne décrit que le fichier : pas de lignes ingérées par l'API
+        if rows != self._file_rows:
+            return
+        if os.stat(self._source).st_size != position[0]:
+            return
+        cache = ColumnarCache(self._snapshot_dir)
+        try:
+            if not cache.append(self._source, tail, rows):
+                cache.save(self._source, self.get_snapshot()._frame)
+        except OSError as e:
+            logger.warning(f"Could not write snapshot: {str(e)}")
+
+    @staticmethod
+    def _read_csv(file_path: Union[str, IO[bytes]]) -> pd.DataFrame:
+        """
+        Lit et nettoie le fichier CSV des transactions.
+
+        Les colonnes textuelles sont lues directement en catégories puis le
+        schéma compact est appliqué (voir banking_api.schema).
+
+        Parameters
+        ----------
+        file_path : Union[str, IO[bytes]]
+            Chemin vers le fichier CSV, ou contenu CSV (lignes ajoutées)
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame nettoyé
+        """
+        dtypes: Dict[str, Any] = {"id": str}
+        dtypes.update({name: "category" for name in CATEGORICAL_COLUMNS})
+        data = pd.read_csv(file_path, dtype=dtypes)
+
+        missing = [name for name in ("id", "amount") if name not in data.columns]
+        if missing:
+            raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+        # Clean text fields (NaN -> empty string, "nan" errors -> None)
+        for name in CATEGORICAL_COLUMNS:
+            if name in data.columns:
+                data[name] = clean_text(data[name], name)
+
+        # Montants en centimes, identifiants sur l'entier le plus étroit
+        data = apply_schema(data)
+
+        return data
+
+    @property
+    def _data(self) -> Optional[pd.DataFrame]:
+        """
+        DataFrame en lecture seule de l'instantané publié.
+
+        Affecter un DataFrame publie un nouvel instantané (voir _publish) ;
+        le rechargement suivant relit alors entièrement le fichier.
+
+        Returns
+        -------
+        Optional[pd.DataFrame]
+            DataFrame publié, ou None
+        """
+        snapshot = self._snapshot
+        return snapshot._frame if snapshot is not None else None
+
+    @_data.setter
+    def _data(self, data: pd.DataFrame) -> None:
+        """
+        Publie un DataFrame.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame à publier
+        """
+        self._publish(data)
+        self._position = None
+
+    def _publish(self, data: pd.DataFrame, restore: bool = False) -> DatasetSnapshot:
+        """
+        Publie un nouvel instantané en lecture seule du dataset.
+
+        L'instantané et ses index sont construits avant d'être visibles :
+        les lecteurs voient soit l'ancienne version, soit la nouvelle,
+        jamais un état intermédiaire.
+
+        Parameters
+        ----------
+        data : pd.DataFrame
+            DataFrame à publier (le schéma compact lui est appliqué)
+        restore : bool, optional
+            Réappliquer les modifications de l'API (voir _restore) : data
+            est le contenu du fichier relu
+
+        Returns
+        -------
+        DatasetSnapshot
+            Instantané publié
+        """
+        with self._lock:
+            data = apply_schema(data)
+            # Sous _lock : aucune compaction ne publie entre-temps
+            if restore and self._restore is not None and self._snapshot is not None:
+                removed, rows = self._restore(self._snapshot)
+                if removed:
+                    data = data[~data["id"].isin(removed)].reset_index(drop=True)
+                if len(rows):
+                    data = _concat(data, rows)
+            snapshot = DatasetSnapshot(_freeze(data), self._version + 1)
+            if self._snapshot is not None:
+                snapshot.sequence = self._snapshot.sequence
+            self._storage = {}
+            self._install(snapshot)
+        logger.info(f"Published dataset version {snapshot.version}")
+        return snapshot
+
+    def _install(self, snapshot: DatasetSnapshot) -> None:
+        """
+        Rend un instantané visible (appelé sous _lock).
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané entièrement construit
+        """
+        history = OrderedDict(self._history)
+        history[snapshot.version] = snapshot
+        while len(history) > max(settings.SNAPSHOT_RETENTION, 1):
+            history.popitem(last=False)
+        # L'historique est publié avant l'instantané : une version
+        # visible est toujours retrouvable par les curseurs
+        self._history = history
+        self._version = snapshot.version
+        self._snapshot = snapshot
+
+    @contextmanager
+    def pinned(self) -> Iterator[DatasetView]:
+        """
+        Fixe la vue du dataset lue par la requête en cours.
+
+        Dans le bloc, et dans les traitements qu'il lance dans le pool (qui
+        héritent de son contexte), get_view(), get_snapshot() et
+        get_version() portent sur cette vue : une réponse et ce qui la
+        décrit (clé de cache, ETag) désignent le même état du dataset, même
+        si une autre version est publiée ou une modification acceptée
+        entre-temps.
+
+        Yields
+        ------
+        DatasetView
+            Vue courante, fixée jusqu'à la fin du bloc
 
         Raises
         ------
         RuntimeError
             Si les données ne sont pas chargées
         """
-        if not self._loaded or self._data is None:
+        view = self.get_view()
+        token = _pinned.set(view)
+        try:
+            yield view
+        finally:
+            _pinned.reset(token)
+
+    def get_view(self) -> DatasetView:
+        """
+        Retourne la vue courante du dataset et des modifications de l'API.
+
+        Returns
+        -------
+        DatasetView
+            Vue en lecture seule
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        """
+        pinned = _pinned.get()
+        if pinned is not None:
+            return pinned
+        overlay = self._overlay
+        if overlay is not None:
+            return overlay()
+        return DatasetView(self.get_snapshot())
+
+    def resume(self, version: int, layout: int) -> DatasetView:
+        """
+        Retourne la vue sur laquelle reprendre un parcours paginé.
+
+        Tant que les positions des lignes sont inchangées (voir
+        DatasetSnapshot.layout), le parcours continue sur la vue courante ;
+        sinon sur l'instantané de sa version.
+
+        Parameters
+        ----------
+        version : int
+            Version du dataset parcourue
+        layout : int
+            Disposition des positions de cette version
+
+        Returns
+        -------
+        DatasetView
+            Vue à parcourir
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        SnapshotExpiredError
+            Si la disposition a changé et que la version n'est plus
+            conservée
+        """
+        view = self.get_view()
+        if view.snapshot.layout == layout:
+            return view
+        return DatasetView(self.get_snapshot(version))
+
+    def get_snapshot(self, version: Optional[int] = None) -> DatasetSnapshot:
+        """
+        Retourne l'instantané courant du dataset, ou une version récente.
+
+        Parameters
+        ----------
+        version : Optional[int], optional
+            Version demandée (défaut: version courante)
+
+        Returns
+        -------
+        DatasetSnapshot
+            Instantané en lecture seule et versionné
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        SnapshotExpiredError
+            Si la version demandée n'est plus conservée
+        """
+        pinned = _pinned.get()
+        snapshot = self._snapshot if pinned is None else pinned.snapshot
+        if not self._loaded or snapshot is None:
             raise RuntimeError("Data not loaded. Call load_data() first.")
-        return self._data.copy()
+        if version is None or version == snapshot.version:
+            return snapshot
+        kept = self._history.get(version)
+        if kept is None:
+            raise SnapshotExpiredError(f"Dataset version {version} has expired")
+        return kept
+
+    def get_data(self) -> pd.DataFrame:
+        """
+        Retourne le DataFrame des transactions (voir DatasetView.frame).
+
+        Returns
+        -------
+        pd.DataFrame
+            DataFrame en lecture seule contenant les transactions
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        """
+        return self.get_view().data
+
+    def get_version(self) -> int:
+        """
+        Retourne la version du dataset actuellement publiée.
+
+        Returns
+        -------
+        int
+            Numéro de version (0 si aucune donnée n'a été publiée)
+        """
+        pinned = _pinned.get()
+        snapshot = self._snapshot if pinned is None else pinned.snapshot
+        if not self._loaded or snapshot is None:
+            return 0
+        return snapshot.version
 
     def is_loaded(self) -> bool:
         """
@@ -138,9 +1705,9 @@ class DataManager:
         int
             Nombre d'enregistrements
         """
-        if not self._loaded or self._data is None:
+        if not self._loaded or self._snapshot is None:
             return 0
-        return len(self._data)
+        return len(self.get_view())
 
 
 # Instance globale du gestionnaire
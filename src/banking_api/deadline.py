@@ -0,0 +1,228 @@
+"""
+Budget de temps des requêtes et annulation coopérative.
+
+Chaque requête coûteuse reçoit une échéance (en-tête X-Query-Timeout-Ms,
+bornée par la configuration). Les traitements longs (parcours de
+colonnes, agrégations) sont découpés en blocs et appellent
+check_deadline() entre deux blocs : une requête qui dépasse son budget,
+ou dont le client s'est déconnecté, s'interrompt et libère son thread.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional, TypeVar
+
+from fastapi import Header, Request
+
+from banking_api.config import settings
+from banking_api.executor import compute_pool
+
+T = TypeVar("T")
+
+# Intervalle de vérification de la déconnexion du client (secondes)
+DISCONNECT_POLL_INTERVAL: float = 0.05
+
+# Nombre de lignes traitées entre deux vérifications de l'échéance
+CHUNK_ROWS: int = 1 << 20
+
+
+class QueryAbortedError(RuntimeError):
+    """Traitement interrompu avant son terme."""
+
+
+class QueryTimeoutError(QueryAbortedError):
+    """Traitement interrompu après épuisement de son budget de temps."""
+
+
+class QueryCancelledError(QueryAbortedError):
+    """Traitement interrompu après la déconnexion du client."""
+
+
+class Deadline:
+    """
+    Échéance d'un traitement, annulable depuis un autre thread.
+
+    Attributes
+    ----------
+    budget : float
+        Budget de temps en secondes
+    expires_at : float
+        Instant d'expiration (horloge time.monotonic)
+    """
+
+    def __init__(self, budget: float) -> None:
+        """
+        Initialise l'échéance.
+
+        Parameters
+        ----------
+        budget : float
+            Budget de temps en secondes, à partir de maintenant
+        """
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+        self._cancelled = threading.Event()
+
+    def cancel(self) -> None:
+        """Annule le traitement (client déconnecté)."""
+        self._cancelled.set()
+
+    def check(self) -> None:
+        """
+        Vérifie que le traitement peut continuer.
+
+        Raises
+        ------
+        QueryCancelledError
+            Si le traitement a été annulé
+        QueryTimeoutError
+            Si le budget de temps est épuisé
+        """
+        if self._cancelled.is_set():
+            raise QueryCancelledError("Client disconnected, query abandoned")
+        if time.monotonic() > self.expires_at:
+            raise QueryTimeoutError(
+                f"Query exceeded its time budget of {self.budget * 1000:.0f} ms"
+            )
+
+
+# Échéance du traitement en cours (propagée aux threads du pool)
+_current: "contextvars.ContextVar[Optional[Deadline]]" = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+def check_deadline() -> None:
+    """
+    Vérifie l'échéance du traitement en cours, s'il en a une.
+
+    Raises
+    ------
+    QueryAbortedError
+        Si le traitement est annulé ou a épuisé son budget
+    """
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def budgeted_chunks(size: int, chunk_rows: int = CHUNK_ROWS) -> Iterator[slice]:
+    """
+    Découpe un parcours de lignes en blocs, en vérifiant l'échéance.
+
+    Parameters
+    ----------
+    size : int
+        Nombre de lignes à parcourir
+    chunk_rows : int, optional
+        Nombre de lignes par bloc (défaut: CHUNK_ROWS)
+
+    Yields
+    ------
+    slice
+        Tranche de lignes du bloc suivant
+
+    Raises
+    ------
+    QueryAbortedError
+        Si le traitement est annulé ou a épuisé son budget
+    """
+    for start in range(0, size, chunk_rows):
+        check_deadline()
+        yield slice(start, min(start + chunk_rows, size))
+
+
+class QueryBudget:
+    """
+    Budget de temps d'une requête HTTP.
+
+    Attributes
+    ----------
+    request : Request
+        Requête HTTP surveillée
+    deadline : Deadline
+        Échéance du traitement
+    """
+
+    def __init__(self, request: Request, deadline: Deadline) -> None:
+        """
+        Initialise le budget.
+
+        Parameters
+        ----------
+        request : Request
+            Requête HTTP surveillée
+        deadline : Deadline
+            Échéance du traitement
+        """
+        self.request = request
+        self.deadline = deadline
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Exécute un traitement bloquant sous cette échéance.
+
+        Le traitement s'exécute dans le pool (voir ComputePool). Pendant ce
+        temps, la déconnexion du client est surveillée : elle annule
+        l'échéance, et le traitement s'interrompt au bloc suivant.
+
+        Parameters
+        ----------
+        func : Callable[..., T]
+            Fonction synchrone
+        *args : Any
+            Arguments positionnels
+        **kwargs : Any
+            Arguments nommés
+
+        Returns
+        -------
+        T
+            Résultat de la fonction
+
+        Raises
+        ------
+        QueryAbortedError
+            Si le traitement est annulé ou a épuisé son budget
+        """
+        token = _current.set(self.deadline)
+        try:
+            task = asyncio.ensure_future(compute_pool.run(func, *args, **kwargs))
+        finally:
+            _current.reset(token)
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_INTERVAL)
+            if done:
+                return task.result()
+            if await self.request.is_disconnected():
+                self.deadline.cancel()
+
+
+def query_budget(
+    request: Request,
+    x_query_timeout_ms: Optional[int] = Header(
+        None, ge=1, description="Budget de temps de la requête (ms)"
+    ),
+) -> QueryBudget:
+    """
+    Dépendance FastAPI fournissant le budget de temps d'une requête.
+
+    Parameters
+    ----------
+    request : Request
+        Requête HTTP
+    x_query_timeout_ms : Optional[int]
+        Budget demandé en millisecondes (défaut: QUERY_TIMEOUT_MS), borné
+        par QUERY_TIMEOUT_MAX_MS
+
+    Returns
+    -------
+    QueryBudget
+        Budget de la requête
+    """
+    budget_ms = min(
+        x_query_timeout_ms or settings.QUERY_TIMEOUT_MS, settings.QUERY_TIMEOUT_MAX_MS
+    )
+    return QueryBudget(request, Deadline(budget_ms / 1000))
@@ -0,0 +1,131 @@
+"""
+Exécution des traitements bloquants hors de la boucle asyncio.
+
+Les routes sont déclarées ``async def`` mais les services effectuent des
+calculs pandas/NumPy synchrones. Ce module les exécute dans un pool de
+threads dédié : la boucle d'événements reste disponible pour les autres
+requêtes (santé, agrégats matérialisés) pendant une recherche coûteuse.
+NumPy et pandas libèrent le GIL dans leurs boucles internes, ce qui
+permet à plusieurs calculs de progresser en parallèle.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from banking_api.config import settings
+from banking_api.models import PoolMetrics
+
+T = TypeVar("T")
+
+
+class ComputePool:
+    """
+    Pool de threads des traitements bloquants.
+
+    Attributes
+    ----------
+    workers : int
+        Nombre de threads du pool
+    """
+
+    def __init__(self, workers: int) -> None:
+        """
+        Initialise le pool.
+
+        Parameters
+        ----------
+        workers : int
+            Nombre de threads du pool
+        """
+        self.workers = max(workers, 1)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="compute"
+        )
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Exécute une fonction bloquante dans le pool et attend son résultat.
+
+        Parameters
+        ----------
+        func : Callable[..., T]
+            Fonction synchrone (méthode de service)
+        *args : Any
+            Arguments positionnels
+        **kwargs : Any
+            Arguments nommés
+
+        Returns
+        -------
+        T
+            Résultat de la fonction
+
+        Raises
+        ------
+        Exception
+            Toute exception levée par la fonction
+        """
+        with self._lock:
+            self._queued += 1
+        loop = asyncio.get_running_loop()
+        # Le thread hérite du contexte de la requête (échéance, voir deadline)
+        context = contextvars.copy_context()
+        call = functools.partial(context.run, self._call, func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, call)
+
+    def _call(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """
+        Exécute la fonction dans un thread du pool, en tenant les compteurs.
+
+        Parameters
+        ----------
+        func : Callable[..., T]
+            Fonction synchrone
+        *args : Any
+            Arguments positionnels
+        **kwargs : Any
+            Arguments nommés
+
+        Returns
+        -------
+        T
+            Résultat de la fonction
+        """
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+
+    def metrics(self) -> PoolMetrics:
+        """
+        Retourne les compteurs du pool.
+
+        Returns
+        -------
+        PoolMetrics
+            Taille, traitements en attente, en cours et terminés
+        """
+        with self._lock:
+            return PoolMetrics(
+                workers=self.workers,
+                queued=self._queued,
+                active=self._active,
+                completed=self._completed,
+            )
+
+
+# Pool global des traitements bloquants
+compute_pool: ComputePool = ComputePool(settings.COMPUTE_THREADS)
@@ -0,0 +1,141 @@
+"""
+Requêtes HTTP conditionnelles liées à l'état du dataset.
+
+Les réponses des endpoints d'agrégats (statistiques, fraude, clients,
+types) ne dépendent que de l'état du dataset (version publiée et
+dernière modification de l'API lue, voir DatasetView.state) et des
+paramètres de la requête. Ce module leur attribue un ETag construit à partir de ces deux
+éléments : une requête dont l'en-tête If-None-Match correspond reçoit un
+304 sans que l'endpoint soit exécuté. L'en-tête Cache-Control permet en
+outre à un proxy inverse de conserver les réponses.
+"""
+
+import hashlib
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+from banking_api.config import settings
+from banking_api.data_manager import data_manager
+
+# Préfixes des endpoints dont les réponses sont conditionnelles
+CONDITIONAL_PREFIXES: List[str] = [
+    "/api/stats",
+    "/api/fraud",
+    "/api/customers",
+    "/api/transactions/types",
+]
+
+
+def is_conditional(request: Request) -> bool:
+    """
+    Indique si une requête relève des réponses conditionnelles.
+
+    Parameters
+    ----------
+    request : Request
+        Requête HTTP
+
+    Returns
+    -------
+    bool
+        True pour un GET (ou HEAD) sur l'un des CONDITIONAL_PREFIXES
+    """
+    if request.method not in ("GET", "HEAD"):
+        return False
+    path = request.url.path
+    return any(
+        path == prefix or path.startswith(prefix + "/")
+        for prefix in CONDITIONAL_PREFIXES
+    )
+
+
+def compute_etag(state: Tuple[int, int], request: Request) -> str:
+    """
+    Calcule l'ETag d'une requête pour un état du dataset.
+
+    Les paramètres de la requête sont triés : l'ordre dans lequel le client
+    les transmet ne change pas l'ETag.
+
+    Parameters
+    ----------
+    state : Tuple[int, int]
+        Version du dataset et numéro de la dernière modification lue
+    request : Request
+        Requête HTTP
+
+    Returns
+    -------
+    str
+        ETag entre guillemets (ex: "3.120-1f2e...")
+    """
+    params = sorted(request.query_params.multi_items())
+    document = f"{request.url.path}?{params}"
+    digest = hashlib.sha1(document.encode()).hexdigest()[:16]
+    version, sequence = state
+    return f'"{version}.{sequence}-{digest}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """
+    Compare un ETag à l'en-tête If-None-Match (comparaison faible).
+
+    Parameters
+    ----------
+    etag : str
+        ETag de la réponse courante
+    if_none_match : Optional[str]
+        Valeur de l'en-tête If-None-Match
+
+    Returns
+    -------
+    bool
+        True si l'un des ETags transmis (ou "*") correspond
+    """
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate == etag:
+            return True
+    return False
+
+
+async def conditional_requests(
+    request: Request, call_next: Callable[[Request], Awaitable[Response]]
+) -> Response:
+    """
+    Middleware des requêtes conditionnelles.
+
+    Répond 304 lorsque If-None-Match correspond à l'ETag courant, sans
+    exécuter l'endpoint ; sinon ajoute ETag et Cache-Control aux réponses
+    200. La vue dont l'état forme l'ETag est fixée pour toute la requête
+    (voir DataManager.pinned) : l'endpoint sert cet état même si le
+    dataset est modifié pendant son exécution.
+
+    Parameters
+    ----------
+    request : Request
+        Requête HTTP
+    call_next : Callable[[Request], Awaitable[Response]]
+        Suite de la chaîne de traitement
+
+    Returns
+    -------
+    Response
+        Réponse 304, ou réponse de l'endpoint
+    """
+    if data_manager.get_version() == 0 or not is_conditional(request):
+        return await call_next(request)
+
+    with data_manager.pinned() as view:
+        etag = compute_etag(view.state, request)
+        headers = {"ETag": etag, "Cache-Control": settings.CACHE_CONTROL}
+        if etag_matches(etag, request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        response = await call_next(request)
+    if response.status_code == 200:
+        response.headers.update(headers)
+    return response
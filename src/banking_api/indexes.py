@@ -0,0 +1,1182 @@
+"""
+Index en mémoire sur le dataset des transactions.
+
+Ce module définit les structures d'accès construites au chargement de
+chaque instantané du dataset, afin d'éviter les parcours complets de
+colonnes lors des recherches.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PrimaryKeyIndex:
+    """
+    Index de hachage associant un identifiant à sa position de ligne.
+
+    L'index s'appuie sur la table de hachage d'un pd.Index : la recherche
+    d'une clé, présente ou absente, se fait en temps constant. Les lignes
+    ajoutées par extend() forment des segments distincts, sans reconstruire
+    la table des lignes existantes.
+    """
+
+    # Nombre maximal de segments ajoutés avant leur fusion
+    MAX_SEGMENTS: int = 8
+
+    def __init__(self, keys: pd.Series) -> None:
+        """
+        Construit l'index.
+
+        Parameters
+        ----------
+        keys : pd.Series
+            Colonne des identifiants, dans l'ordre des lignes
+        """
+        index = pd.Index(keys.to_numpy(), copy=False)
+        # Construit la table de hachage dès le chargement
+        if not index.is_unique:
+            logger.warning("Duplicate transaction ids: lookups return the first row")
+        self._segments: List[Tuple[int, pd.Index]] = [(0, index)]
+
+    def extend(self, keys: pd.Series) -> "PrimaryKeyIndex":
+        """
+        Construit l'index des lignes existantes suivies de nouvelles lignes.
+
+        Parameters
+        ----------
+        keys : pd.Series
+            Identifiants des lignes ajoutées, dans l'ordre des lignes
+
+        Returns
+        -------
+        PrimaryKeyIndex
+            Nouvel index (l'index courant n'est pas modifié)
+        """
+        extended = PrimaryKeyIndex(keys)
+        _, tail = extended._segments[0]
+        segments = self._segments + [(len(self), tail)]
+        if len(segments) > self.MAX_SEGMENTS + 1:
+            # Fusion des segments ajoutés : le segment initial est conservé
+            start = segments[1][0]
+            merged = segments[1][1].append([index for _, index in segments[2:]])
+            segments = [segments[0], (start, merged)]
+        extended._segments = segments
+        return extended
+
+    def lookup(self, key: Any) -> Optional[int]:
+        """
+        Retourne la position de la ligne portant l'identifiant donné.
+
+        Parameters
+        ----------
+        key : Any
+            Identifiant recherché
+
+        Returns
+        -------
+        Optional[int]
+            Position de la ligne (la première en cas de doublon) ou None
+        """
+        for start, index in self._segments:
+            try:
+                location = index.get_loc(key)
+            except (KeyError, TypeError):
+                continue
+            if isinstance(location, slice):
+                return start + int(location.start)
+            if isinstance(location, np.ndarray):
+                return start + int(np.flatnonzero(location)[0])
+            return start + int(location)
+        return None
+
+    def lookup_all(self, key: Any) -> np.ndarray:
+        """
+        Retourne les positions de toutes les lignes portant l'identifiant.
+
+        Parameters
+        ----------
+        key : Any
+            Identifiant recherché
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes des lignes (vide si l'identifiant est
+            absent)
+        """
+        found: List[np.ndarray] = []
+        for start, index in self._segments:
+            try:
+                location = index.get_loc(key)
+            except (KeyError, TypeError):
+                continue
+            if isinstance(location, slice):
+                found.append(np.arange(location.start, location.stop) + start)
+            elif isinstance(location, np.ndarray):
+                found.append(np.flatnonzero(location) + start)
+            else:
+                found.append(np.array([start + int(location)]))
+        if not found:
+            return np.array([], dtype=np.int64)
+        return np.concatenate(found)
+
+    def __len__(self) -> int:
+        """
+        Retourne le nombre de clés indexées.
+
+        Returns
+        -------
+        int
+            Nombre de clés
+        """
+        start, index = self._segments[-1]
+        return start + len(index)
+
+
+def _position_dtype(size: int) -> type:
+    """
+    Retourne le type entier le plus étroit pour des positions de lignes.
+
+    Parameters
+    ----------
+    size : int
+        Nombre de lignes
+
+    Returns
+    -------
+    type
+        np.int32 ou np.int64
+    """
+    return np.int32 if size < np.iinfo(np.int32).max else np.int64
+
+
+class GroupIndex:
+    """
+    Index groupé des lignes par valeur de clé (disposition CSR).
+
+    Les positions des lignes sont triées par clé (tri stable) ; le tableau
+    offsets délimite la tranche contiguë de chaque clé. Une recherche se
+    résume à une recherche dichotomique suivie d'un découpage, sans
+    dépendre de la taille totale du dataset.
+
+    Attributes
+    ----------
+    keys : np.ndarray
+        Clés distinctes, triées
+    offsets : np.ndarray
+        Début de la tranche de chaque clé (len(keys) + 1 éléments)
+    positions : np.ndarray
+        Positions des lignes triées par clé puis par ordre d'origine
+    """
+
+    def __init__(self, keys: pd.Series) -> None:
+        """
+        Construit l'index.
+
+        Parameters
+        ----------
+        keys : pd.Series
+            Colonne de clés, dans l'ordre des lignes
+        """
+        values = keys.to_numpy()
+        order = np.argsort(values, kind="stable")
+        order = order.astype(_position_dtype(len(values)))
+        sorted_keys = values[order]
+        starts = np.flatnonzero(sorted_keys[1:] != sorted_keys[:-1]) + 1
+        starts = np.concatenate(([0], starts)) if len(values) else starts
+        self.keys = sorted_keys[starts]
+        self.offsets = np.append(starts, len(values)).astype(np.int64)
+        self.positions = order
+
+    def extend(self, keys: pd.Series) -> "GroupIndex":
+        """
+        Construit l'index des lignes existantes suivies de nouvelles lignes.
+
+        Seules les nouvelles lignes sont triées ; les tranches existantes
+        sont recopiées à leur nouvel emplacement, chacune suivie des
+        positions ajoutées pour la même clé.
+
+        Parameters
+        ----------
+        keys : pd.Series
+            Clés des lignes ajoutées, dans l'ordre des lignes
+
+        Returns
+        -------
+        GroupIndex
+            Nouvel index (l'index courant n'est pas modifié)
+        """
+        tail = GroupIndex(keys)
+        size = len(self.positions)
+        merged_keys = np.union1d(self.keys, tail.keys)
+        own_slots = np.searchsorted(merged_keys, self.keys)
+        tail_slots = np.searchsorted(merged_keys, tail.keys)
+        own_counts = np.diff(self.offsets)
+        tail_counts = np.diff(tail.offsets)
+        counts = np.zeros(len(merged_keys), dtype=np.int64)
+        counts[own_slots] += own_counts
+        before_tail = counts.copy()
+        counts[tail_slots] += tail_counts
+        offsets = np.concatenate(([0], np.cumsum(counts)))
+
+        total = size + len(tail.positions)
+        positions: np.ndarray = np.empty(total, dtype=_position_dtype(total))
+        # Décalage de chaque tranche vers son nouvel emplacement
+        shifts = np.repeat(offsets[own_slots] - self.offsets[:-1], own_counts)
+        positions[np.arange(size) + shifts] = self.positions
+        shifts = np.repeat(
+            offsets[tail_slots] + before_tail[tail_slots] - tail.offsets[:-1],
+            tail_counts,
+        )
+        positions[np.arange(len(tail.positions)) + shifts] = tail.positions + size
+
+        extended = object.__new__(GroupIndex)
+        extended.keys = merged_keys
+        extended.offsets = offsets.astype(np.int64)
+        extended.positions = positions
+        return extended
+
+    def _slot(self, key: Any) -> Optional[int]:
+        """
+        Retourne le rang de la clé parmi les clés distinctes.
+
+        Parameters
+        ----------
+        key : Any
+            Clé recherchée
+
+        Returns
+        -------
+        Optional[int]
+            Rang de la clé, ou None si elle est absente
+        """
+        slot = int(np.searchsorted(self.keys, key))
+        if slot == len(self.keys) or self.keys[slot] != key:
+            return None
+        return slot
+
+    def lookup(self, key: Any) -> np.ndarray:
+        """
+        Retourne les positions des lignes portant la clé.
+
+        Parameters
+        ----------
+        key : Any
+            Clé recherchée
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes des lignes (vide si la clé est absente)
+        """
+        slot = self._slot(key)
+        if slot is None:
+            return self.positions[:0]
+        return self.positions[self.offsets[slot]:self.offsets[slot + 1]]
+
+    def count(self, key: Any) -> int:
+        """
+        Retourne le nombre de lignes portant la clé.
+
+        Parameters
+        ----------
+        key : Any
+            Clé recherchée
+
+        Returns
+        -------
+        int
+            Nombre de lignes
+        """
+        slot = self._slot(key)
+        if slot is None:
+            return 0
+        return int(self.offsets[slot + 1] - self.offsets[slot])
+
+
+class SortedIndex:
+    """
+    Index trié d'une colonne numérique pour les prédicats d'intervalle.
+
+    L'index conserve la permutation des positions triée par valeur : un
+    intervalle [low, high] se résout par deux recherches dichotomiques en
+    une tranche contiguë de positions.
+
+    Attributes
+    ----------
+    order : np.ndarray
+        Positions des lignes triées par valeur croissante
+    values : np.ndarray
+        Valeurs triées (values[i] est la valeur de la ligne order[i])
+    """
+
+    def __init__(self, values: pd.Series) -> None:
+        """
+        Construit l'index.
+
+        Parameters
+        ----------
+        values : pd.Series
+            Colonne numérique, dans l'ordre des lignes
+        """
+        data = values.to_numpy()
+        order: np.ndarray = np.argsort(data, kind="stable")
+        self.order: np.ndarray = order.astype(_position_dtype(len(data)))
+        self.values: np.ndarray = data[self.order]
+
+    def extend(self, values: pd.Series) -> "SortedIndex":
+        """
+        Construit l'index des lignes existantes suivies de nouvelles lignes.
+
+        Seules les nouvelles valeurs sont triées, puis fusionnées avec
+        l'ordre existant (après les valeurs égales, comme un tri stable) :
+        chaque tableau est alloué une seule fois et rempli par deux
+        affectations, sans décalages successifs.
+
+        Parameters
+        ----------
+        values : pd.Series
+            Valeurs des lignes ajoutées, dans l'ordre des lignes
+
+        Returns
+        -------
+        SortedIndex
+            Nouvel index (l'index courant n'est pas modifié)
+        """
+        tail = SortedIndex(values)
+        size = len(self.order) + len(tail.order)
+        # Rang final de chaque nouvelle valeur dans l'index fusionné
+        targets = np.searchsorted(self.values, tail.values, side="right")
+        targets += np.arange(len(tail.values))
+        existing = np.ones(size, dtype=bool)
+        existing[targets] = False
+
+        merged_values = np.empty(size, dtype=np.result_type(self.values, tail.values))
+        merged_values[existing] = self.values
+        merged_values[targets] = tail.values
+        merged_order: np.ndarray = np.empty(size, dtype=_position_dtype(size))
+        merged_order[existing] = self.order
+        merged_order[targets] = tail.order + len(self.order)
+
+        extended = object.__new__(SortedIndex)
+        extended.values = merged_values
+        extended.order = merged_order
+        return extended
+
+    def bounds(
+        self, low: Optional[Any] = None, high: Optional[Any] = None
+    ) -> Tuple[int, int]:
+        """
+        Retourne la tranche de l'index couvrant l'intervalle [low, high].
+
+        Parameters
+        ----------
+        low : Optional[Any], optional
+            Borne inférieure incluse (aucune si None)
+        high : Optional[Any], optional
+            Borne supérieure incluse (aucune si None)
+
+        Returns
+        -------
+        Tuple[int, int]
+            Début et fin (exclue) de la tranche dans order
+        """
+        start = 0 if low is None else int(np.searchsorted(self.values, low, "left"))
+        stop = (
+            len(self.values)
+            if high is None
+            else int(np.searchsorted(self.values, high, "right"))
+        )
+        return start, max(start, stop)
+
+    def positions(
+        self, low: Optional[Any] = None, high: Optional[Any] = None
+    ) -> np.ndarray:
+        """
+        Retourne les positions des lignes dont la valeur est dans [low, high].
+
+        Parameters
+        ----------
+        low : Optional[Any], optional
+            Borne inférieure incluse
+        high : Optional[Any], optional
+            Borne supérieure incluse
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes des lignes
+        """
+        start, stop = self.bounds(low, high)
+        return np.sort(self.order[start:stop])
+
+
+# Nombre de bits à 1 pour chaque valeur d'octet
+_POPCOUNT: np.ndarray = np.array(
+    [bin(i).count("1") for i in range(256)], dtype=np.uint8
+)
+
+
+def popcount(bitmap: np.ndarray) -> int:
+    """
+    Compte les bits à 1 d'un bitmap compacté.
+
+    Parameters
+    ----------
+    bitmap : np.ndarray
+        Bitmap compacté (np.packbits)
+
+    Returns
+    -------
+    int
+        Nombre de lignes sélectionnées
+    """
+    return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+
+def intersect(bitmaps: List[np.ndarray]) -> np.ndarray:
+    """
+    Calcule l'intersection (ET logique) de bitmaps compactés.
+
+    Parameters
+    ----------
+    bitmaps : List[np.ndarray]
+        Bitmaps compactés de même taille (au moins un)
+
+    Returns
+    -------
+    np.ndarray
+        Bitmap compacté de l'intersection
+    """
+    result = bitmaps[0].copy()
+    for bitmap in bitmaps[1:]:
+        np.bitwise_and(result, bitmap, out=result)
+    return result
+
+
+def to_positions(bitmap: np.ndarray, size: int) -> np.ndarray:
+    """
+    Convertit un bitmap compacté en positions de lignes croissantes.
+
+    Parameters
+    ----------
+    bitmap : np.ndarray
+        Bitmap compacté
+    size : int
+        Nombre de lignes du dataset
+
+    Returns
+    -------
+    np.ndarray
+        Positions des bits à 1
+    """
+    return np.flatnonzero(np.unpackbits(bitmap, count=size))
+
+
+def bitmap_page(bitmap: np.ndarray, start: int, stop: int) -> np.ndarray:
+    """
+    Extrait les positions de rang [start, stop) d'un bitmap compacté.
+
+    Seuls les octets couvrant la page sont décompactés : leur repérage
+    s'appuie sur le cumul des popcounts par octet.
+
+    Parameters
+    ----------
+    bitmap : np.ndarray
+        Bitmap compacté
+    start : int
+        Rang de la première ligne sélectionnée à retourner
+    stop : int
+        Rang de fin (exclu)
+
+    Returns
+    -------
+    np.ndarray
+        Positions croissantes des lignes de la page
+    """
+    cumulative = np.cumsum(_POPCOUNT[bitmap], dtype=np.int64)
+    first = int(np.searchsorted(cumulative, start, side="right"))
+    last = int(np.searchsorted(cumulative, stop, side="left")) + 1
+    skipped = int(cumulative[first - 1]) if first > 0 else 0
+    window = np.flatnonzero(np.unpackbits(bitmap[first:last])) + first * 8
+    return window[start - skipped:stop - skipped]
+
+
+def contains(bitmap: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """
+    Teste l'appartenance de positions à un bitmap compacté.
+
+    Parameters
+    ----------
+    bitmap : np.ndarray
+        Bitmap compacté
+    positions : np.ndarray
+        Positions à tester
+
+    Returns
+    -------
+    np.ndarray
+        Masque booléen aligné sur positions
+    """
+    shifts = (7 - (positions & 7)).astype(np.uint8)
+    mask: np.ndarray = np.asarray((bitmap[positions >> 3] >> shifts) & 1, dtype=bool)
+    return mask
+
+
+def _append_bits(bitmap: np.ndarray, size: int, mask: np.ndarray) -> np.ndarray:
+    """
+    Prolonge un bitmap compacté par de nouvelles lignes.
+
+    Parameters
+    ----------
+    bitmap : np.ndarray
+        Bitmap compacté de size lignes
+    size : int
+        Nombre de lignes du bitmap
+    mask : np.ndarray
+        Masque booléen des lignes ajoutées
+
+    Returns
+    -------
+    np.ndarray
+        Bitmap compacté de size + len(mask) lignes
+    """
+    full = size // 8
+    partial = np.unpackbits(bitmap[full:], count=size % 8).astype(bool)
+    return np.concatenate((bitmap[:full], np.packbits(np.concatenate((partial, mask)))))
+
+
+class BitmapIndex:
+    """
+    Index bitmap d'une colonne à faible cardinalité.
+
+    Chaque valeur est associée à l'ensemble des lignes qui la portent. À la
+    manière des bitmaps « roaring », un ensemble peu dense est conservé
+    sous forme de positions triées et un ensemble dense sous forme de
+    bitmap compacté (np.packbits), selon la représentation la plus petite.
+
+    Attributes
+    ----------
+    size : int
+        Nombre de lignes indexées
+    """
+
+    def __init__(self, size: int) -> None:
+        """
+        Initialise un index vide.
+
+        Parameters
+        ----------
+        size : int
+            Nombre de lignes indexées
+        """
+        self.size = size
+        self._sets: Dict[Any, np.ndarray] = {}
+        self._counts: Dict[Any, int] = {}
+
+    def _add(self, key: Any, positions: np.ndarray) -> None:
+        """
+        Enregistre l'ensemble des lignes portant une valeur.
+
+        Parameters
+        ----------
+        key : Any
+            Valeur indexée
+        positions : np.ndarray
+            Positions croissantes des lignes
+        """
+        self._counts[key] = len(positions)
+        if positions.nbytes < (self.size + 7) // 8:
+            self._sets[key] = positions
+        else:
+            mask = np.zeros(self.size, dtype=bool)
+            mask[positions] = True
+            self._sets[key] = np.packbits(mask)
+
+    @classmethod
+    def from_column(cls, series: pd.Series) -> "BitmapIndex":
+        """
+        Construit l'index des valeurs d'une colonne.
+
+        Parameters
+        ----------
+        series : pd.Series
+            Colonne catégorielle ou entière
+
+        Returns
+        -------
+        BitmapIndex
+            Index construit
+        """
+        index = cls(len(series))
+        categorical = isinstance(series.dtype, pd.CategoricalDtype)
+        groups = GroupIndex(series.cat.codes if categorical else series)
+        for slot, key in enumerate(groups.keys.tolist()):
+            if categorical:
+                if key < 0:
+                    continue
+                key = series.cat.categories[key]
+            start, end = groups.offsets[slot], groups.offsets[slot + 1]
+            index._add(key, groups.positions[start:end])
+        return index
+
+    @classmethod
+    def from_tokens(cls, series: pd.Series, separator: str = ",") -> "BitmapIndex":
+        """
+        Construit l'index des jetons d'une colonne multi-valuée.
+
+        Utilisé pour la colonne errors, dont chaque valeur est une liste
+        de drapeaux séparés par des virgules (ex: "Bad PIN,Bad CVV").
+
+        Parameters
+        ----------
+        series : pd.Series
+            Colonne catégorielle multi-valuée
+        separator : str, optional
+            Séparateur des jetons (défaut: ",")
+
+        Returns
+        -------
+        BitmapIndex
+            Index construit
+        """
+        index = cls(len(series))
+        codes = series.cat.codes.to_numpy()
+        token_codes: Dict[str, List[int]] = {}
+        for code, label in enumerate(series.cat.categories):
+            for token in str(label).split(separator):
+                token = token.strip()
+                if token:
+                    token_codes.setdefault(token, []).append(code)
+        for token, token_code_list in token_codes.items():
+            index._add(token, np.flatnonzero(np.isin(codes, token_code_list)))
+        return index
+
+    def count(self, key: Any) -> int:
+        """
+        Retourne le nombre de lignes portant une valeur.
+
+        Parameters
+        ----------
+        key : Any
+            Valeur recherchée
+
+        Returns
+        -------
+        int
+            Nombre de lignes
+        """
+        return self._counts.get(key, 0)
+
+    def is_dense(self, key: Any) -> bool:
+        """
+        Indique si l'ensemble d'une valeur est stocké en bitmap compacté.
+
+        Parameters
+        ----------
+        key : Any
+            Valeur recherchée
+
+        Returns
+        -------
+        bool
+            True pour un bitmap, False pour des positions (ou une absence)
+        """
+        stored = self._sets.get(key)
+        return stored is not None and stored.dtype == np.uint8
+
+    def positions(self, key: Any) -> np.ndarray:
+        """
+        Retourne les positions croissantes des lignes portant une valeur.
+
+        Parameters
+        ----------
+        key : Any
+            Valeur recherchée
+
+        Returns
+        -------
+        np.ndarray
+            Positions des lignes (vide si la valeur est absente)
+        """
+        stored = self._sets.get(key)
+        if stored is None:
+            return np.array([], dtype=np.int64)
+        if stored.dtype == np.uint8:
+            return to_positions(stored, self.size)
+        return stored
+
+    def bitmap(self, key: Any) -> np.ndarray:
+        """
+        Retourne le bitmap compacté des lignes portant une valeur.
+
+        Parameters
+        ----------
+        key : Any
+            Valeur recherchée
+
+        Returns
+        -------
+        np.ndarray
+            Bitmap compacté (vide si la valeur est absente)
+        """
+        stored = self._sets.get(key)
+        if stored is not None and stored.dtype == np.uint8:
+            return stored
+        mask = np.zeros(self.size, dtype=bool)
+        if stored is not None:
+            mask[stored] = True
+        return np.packbits(mask)
+
+    def extend(self, tail: "BitmapIndex") -> "BitmapIndex":
+        """
+        Construit l'index des lignes existantes suivies de nouvelles lignes.
+
+        Les bitmaps existants sont prolongés sans être décompactés (seul
+        leur dernier octet est recomposé) ; les ensembles peu denses sont
+        prolongés par concaténation de positions.
+
+        Parameters
+        ----------
+        tail : BitmapIndex
+            Index des lignes ajoutées (positions relatives à ces lignes)
+
+        Returns
+        -------
+        BitmapIndex
+            Nouvel index (l'index courant n'est pas modifié)
+        """
+        extended = BitmapIndex(self.size + tail.size)
+        for key in list(self._sets) + [k for k in tail._sets if k not in self._sets]:
+            stored = self._sets.get(key)
+            added = tail.positions(key) + self.size
+            count = self.count(key) + tail.count(key)
+            if stored is not None and stored.dtype == np.uint8:
+                mask = np.zeros(tail.size, dtype=bool)
+                mask[added - self.size] = True
+                extended._sets[key] = _append_bits(stored, self.size, mask)
+                extended._counts[key] = count
+            else:
+                own = stored if stored is not None else added[:0]
+                extended._add(key, np.concatenate((own, added)))
+        return extended
+
+
+class Selection:
+    """
+    Ensemble de lignes sélectionnées par un filtrage.
+
+    L'ensemble est représenté soit par toutes les lignes, soit par des
+    positions croissantes, soit par un bitmap compacté : dans ce dernier
+    cas le total provient d'un popcount et seule la page demandée est
+    décompactée.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        positions: Optional[np.ndarray] = None,
+        bitmap: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Initialise la sélection (toutes les lignes par défaut).
+
+        Parameters
+        ----------
+        size : int
+            Nombre de lignes du dataset
+        positions : Optional[np.ndarray], optional
+            Positions croissantes des lignes sélectionnées
+        bitmap : Optional[np.ndarray], optional
+            Bitmap compacté des lignes sélectionnées
+        """
+        self.size = size
+        self.positions = positions
+        self.bitmap = bitmap
+        if positions is not None:
+            self.total = len(positions)
+        elif bitmap is not None:
+            self.total = popcount(bitmap)
+        else:
+            self.total = size
+
+    def page(self, start: int, stop: int) -> Union[np.ndarray, slice]:
+        """
+        Retourne les positions des lignes de rang [start, stop).
+
+        Parameters
+        ----------
+        start : int
+            Rang de début
+        stop : int
+            Rang de fin (exclu)
+
+        Returns
+        -------
+        Union[np.ndarray, slice]
+            Positions des lignes de la page
+        """
+        if self.positions is not None:
+            return self.positions[start:stop]
+        if self.bitmap is not None:
+            return bitmap_page(self.bitmap, start, stop)
+        return slice(start, min(stop, self.size))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Mémoire occupée par la représentation de la sélection.
+
+        Returns
+        -------
+        int
+            Taille en octets
+        """
+        if self.positions is not None:
+            return int(self.positions.nbytes)
+        if self.bitmap is not None:
+            return int(self.bitmap.nbytes)
+        return 0
+
+    def after(self, position: int, count: int) -> np.ndarray:
+        """
+        Retourne les positions sélectionnées qui suivent une position.
+
+        Le coût est proportionnel à la taille de la page et non au rang de
+        la position : recherche dichotomique dans les positions, ou
+        décompactage du bitmap par fenêtres à partir de la position.
+
+        Parameters
+        ----------
+        position : int
+            Dernière position déjà retournée (-1 pour partir du début)
+        count : int
+            Nombre maximum de positions à retourner
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes strictement supérieures à position
+        """
+        first = position + 1
+        if self.positions is not None:
+            start = int(np.searchsorted(self.positions, first, side="left"))
+            return self.positions[start:start + count]
+        if self.bitmap is None:
+            return np.arange(first, min(first + count, self.size))
+
+        found: List[np.ndarray] = []
+        remaining = count
+        byte = first >> 3
+        window = max(count // 8, 64)
+        while remaining > 0 and byte < len(self.bitmap):
+            chunk = np.flatnonzero(np.unpackbits(self.bitmap[byte:byte + window]))
+            chunk = chunk + byte * 8
+            chunk = chunk[(chunk >= first) & (chunk < self.size)][:remaining]
+            found.append(chunk)
+            remaining -= len(chunk)
+            byte += window
+            window *= 2
+        if not found:
+            return np.array([], dtype=np.int64)
+        return np.concatenate(found)
+
+    def to_positions(self) -> np.ndarray:
+        """
+        Retourne toutes les positions sélectionnées.
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes
+        """
+        if self.positions is not None:
+            return self.positions
+        if self.bitmap is not None:
+            return to_positions(self.bitmap, self.size)
+        return np.arange(self.size)
+
+    def without(self, removed: np.ndarray) -> "Selection":
+        """
+        Retire des lignes de la sélection.
+
+        Parameters
+        ----------
+        removed : np.ndarray
+            Positions croissantes des lignes à retirer
+
+        Returns
+        -------
+        Selection
+            Nouvelle sélection (la sélection courante n'est pas modifiée)
+        """
+        removed = removed[removed < self.size]
+        if len(removed) == 0:
+            return self
+        if self.positions is not None:
+            kept = self.positions[~np.isin(self.positions, removed)]
+            return Selection(self.size, positions=kept)
+        if self.bitmap is not None:
+            bitmap = self.bitmap.copy()
+        else:
+            bitmap = np.packbits(np.ones(self.size, dtype=bool))
+        masks = np.invert(np.left_shift(1, 7 - (removed & 7)).astype(np.uint8))
+        np.bitwise_and.at(bitmap, removed >> 3, masks)
+        return Selection(self.size, bitmap=bitmap)
+
+
+class MergedSelection:
+    """
+    Sélection portant sur les lignes d'un instantané suivies de lignes
+    ajoutées depuis.
+
+    Les positions des lignes ajoutées sont décalées du nombre de lignes de
+    l'instantané : les deux sélections forment une seule suite croissante,
+    paginée comme une Selection.
+
+    Attributes
+    ----------
+    head : Selection
+        Lignes sélectionnées de l'instantané
+    tail : Selection
+        Lignes ajoutées sélectionnées, en positions locales
+    offset : int
+        Position de la première ligne ajoutée
+    total : int
+        Nombre de lignes sélectionnées
+    """
+
+    def __init__(self, head: Selection, tail: Selection, offset: int) -> None:
+        """
+        Initialise la sélection.
+
+        Parameters
+        ----------
+        head : Selection
+            Lignes sélectionnées de l'instantané
+        tail : Selection
+            Lignes ajoutées sélectionnées, en positions locales
+        offset : int
+            Position de la première ligne ajoutée
+        """
+        self.head = head
+        self.tail = tail
+        self.offset = offset
+        self.total = head.total + tail.total
+
+    def page(self, start: int, stop: int) -> np.ndarray:
+        """
+        Retourne les positions des lignes de rang [start, stop).
+
+        Parameters
+        ----------
+        start : int
+            Rang de début
+        stop : int
+            Rang de fin (exclu)
+
+        Returns
+        -------
+        np.ndarray
+            Positions des lignes de la page
+        """
+        split = self.head.total
+        parts = [_as_positions(self.head.page(min(start, split), min(stop, split)))]
+        if stop > split:
+            rows = self.tail.page(max(start - split, 0), stop - split)
+            parts.append(_as_positions(rows) + self.offset)
+        return np.concatenate(parts)
+
+    def after(self, position: int, count: int) -> np.ndarray:
+        """
+        Retourne les positions sélectionnées qui suivent une position.
+
+        Parameters
+        ----------
+        position : int
+            Dernière position déjà retournée (-1 pour partir du début)
+        count : int
+            Nombre maximum de positions à retourner
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes strictement supérieures à position
+        """
+        head = self.head.after(position, count) if position < self.offset else None
+        if head is not None and len(head) >= count:
+            return head
+        remaining = count - (len(head) if head is not None else 0)
+        local = max(position - self.offset, -1)
+        tail = self.tail.after(local, remaining) + self.offset
+        return tail if head is None else np.concatenate((head, tail))
+
+    def to_positions(self) -> np.ndarray:
+        """
+        Retourne toutes les positions sélectionnées.
+
+        Returns
+        -------
+        np.ndarray
+            Positions croissantes
+        """
+        return np.concatenate(
+            (self.head.to_positions(), self.tail.to_positions() + self.offset)
+        )
+
+
+def _as_positions(rows: Union[np.ndarray, slice]) -> np.ndarray:
+    """
+    Convertit le résultat de Selection.page en positions.
+
+    Parameters
+    ----------
+    rows : Union[np.ndarray, slice]
+        Positions ou tranche de positions
+
+    Returns
+    -------
+    np.ndarray
+        Positions croissantes
+    """
+    if isinstance(rows, slice):
+        return np.arange(rows.start, max(rows.start, rows.stop))
+    return rows
+
+
+class ColumnStatistics:
+    """
+    Statistiques d'une colonne, utilisées pour estimer la sélectivité.
+
+    Attributes
+    ----------
+    rows : int
+        Nombre de lignes
+    cardinality : int
+        Nombre de valeurs distinctes
+    frequencies : Optional[Dict[Any, int]]
+        Histogramme exact des valeurs (colonnes à faible cardinalité)
+    quantiles : Optional[np.ndarray]
+        Bornes d'un histogramme équi-profondeur (colonnes numériques)
+    """
+
+    # Cardinalité maximale pour conserver un histogramme exact
+    MAX_FREQUENCIES: int = 10_000
+
+    # Nombre de classes de l'histogramme équi-profondeur
+    QUANTILE_BUCKETS: int = 64
+
+    def __init__(self, series: pd.Series) -> None:
+        """
+        Calcule les statistiques de la colonne.
+
+        Parameters
+        ----------
+        series : pd.Series
+            Colonne analysée
+        """
+        self.rows = len(series)
+        self.frequencies: Optional[Dict[Any, int]] = None
+        self.quantiles: Optional[np.ndarray] = None
+
+        counts = series.value_counts(sort=False)
+        counts = counts[counts > 0]
+        self.cardinality = len(counts)
+        if self.cardinality <= self.MAX_FREQUENCIES:
+            self.frequencies = {key: int(count) for key, count in counts.items()}
+        values = series.to_numpy()
+        if values.dtype.kind in "iuf" and self.rows > 0:
+            edges = np.linspace(0, 1, self.QUANTILE_BUCKETS + 1)
+            self.quantiles = np.quantile(values, edges)
+
+    def extend(self, series: pd.Series) -> "ColumnStatistics":
+        """
+        Combine les statistiques existantes avec celles de nouvelles lignes.
+
+        L'histogramme exact est additionné ; au-delà de MAX_FREQUENCIES, la
+        cardinalité est estimée par le maximum des deux parties. Les
+        histogrammes équi-profondeur sont fusionnés par interpolation de
+        leurs fonctions de répartition, pondérées par le nombre de lignes.
+
+        Parameters
+        ----------
+        series : pd.Series
+            Lignes ajoutées
+
+        Returns
+        -------
+        ColumnStatistics
+            Nouvelles statistiques (les statistiques courantes ne sont pas
+            modifiées)
+        """
+        tail = ColumnStatistics(series)
+        extended = object.__new__(ColumnStatistics)
+        extended.rows = self.rows + tail.rows
+        extended.frequencies = None
+        extended.quantiles = self.quantiles if tail.rows == 0 else tail.quantiles
+        if self.frequencies is not None and tail.frequencies is not None:
+            frequencies = dict(self.frequencies)
+            for key, count in tail.frequencies.items():
+                frequencies[key] = frequencies.get(key, 0) + count
+            extended.cardinality = len(frequencies)
+            if extended.cardinality <= self.MAX_FREQUENCIES:
+                extended.frequencies = frequencies
+        else:
+            extended.cardinality = max(self.cardinality, tail.cardinality)
+        if self.quantiles is not None and tail.quantiles is not None:
+            points = np.union1d(self.quantiles, tail.quantiles)
+            levels = np.linspace(0, 1, self.QUANTILE_BUCKETS + 1)
+            cumulative = (
+                np.interp(points, self.quantiles, levels) * self.rows
+                + np.interp(points, tail.quantiles, levels) * tail.rows
+            ) / extended.rows
+            extended.quantiles = np.interp(levels, cumulative, points)
+        return extended
+
+    def estimate_equal(self, value: Any) -> float:
+        """
+        Estime le nombre de lignes égales à une valeur.
+
+        Parameters
+        ----------
+        value : Any
+            Valeur recherchée
+
+        Returns
+        -------
+        float
+            Nombre de lignes estimé
+        """
+        if self.frequencies is not None:
+            return float(self.frequencies.get(value, 0))
+        return self.rows / max(self.cardinality, 1)
+
+    def estimate_range(
+        self, low: Optional[Any] = None, high: Optional[Any] = None
+    ) -> float:
+        """
+        Estime le nombre de lignes dans l'intervalle [low, high].
+
+        Parameters
+        ----------
+        low : Optional[Any], optional
+            Borne inférieure incluse
+        high : Optional[Any], optional
+            Borne supérieure incluse
+
+        Returns
+        -------
+        float
+            Nombre de lignes estimé
+        """
+        if self.quantiles is None:
+            return float(self.rows)
+        levels = np.linspace(0, 1, len(self.quantiles))
+        lower = 0.0 if low is None else float(np.interp(low, self.quantiles, levels))
+        upper = 1.0 if high is None else float(np.interp(high, self.quantiles, levels))
+        return max(upper - lower, 0.0) * self.rows
@@ -0,0 +1,672 @@
+"""
+Modifications des transactions par l'API.
+
+Les transactions reçues et les suppressions sont ajoutées à un tampon en
+mémoire (delta), optimisé pour l'écriture : une modification ne coûte
+qu'une vérification d'existence, la normalisation de ses lignes au schéma
+compact, son écriture dans le journal (voir banking_api.wal) et un ajout
+à une liste. Un thread de compaction intègre le delta au dataset lorsqu'il
+atteint DELTA_COMPACTION_ROWS modifications, ou au plus tard après
+DELTA_COMPACTION_INTERVAL secondes, en publiant une nouvelle version du
+dataset : les transactions sont ajoutées à la fin des colonnes et les
+suppressions marquent des lignes mortes, sans recopier les lignes
+existantes (voir DataManager._append).
+
+Les lectures (consultation, listes, recherches, agrégats) portent sur le
+dataset publié et le delta ensemble (voir DatasetView) : une modification
+est visible dès son acquittement. La vue est prolongée avec les seules
+modifications reçues depuis la lecture précédente, et les caches de
+réponses et ETags sont indexés par l'état qu'elle décrit (version publiée
+et numéro de la dernière modification).
+
+Lorsque WAL_DIR est configuré, chaque modification est journalisée avant
+d'être acquittée. Au démarrage, le dernier point de reprise (transactions
+de l'API au format colonnaire et identifiants supprimés du fichier) et
+les enregistrements suivants du journal sont appliqués en bloc au dataset
+chargé ; ils sont aussi réappliqués à chaque relecture complète du
+fichier CSV. Un point de reprise est écrit dès que le journal dépasse
+WAL_CHECKPOINT_BYTES, puis les segments qu'il couvre sont supprimés.
+"""
+
+import bisect
+import json
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+
+from banking_api.columnar_cache import ColumnarCache
+from banking_api.config import settings
+from banking_api.data_manager import DatasetSnapshot, DatasetView, data_manager
+from banking_api.models import IngestionMetrics, IngestResult, Transaction
+from banking_api.schema import apply_schema
+from banking_api.wal import RECORD_DELETE, RECORD_INSERT, WriteAheadLog
+
+logger = logging.getLogger(__name__)
+
+# Sous-répertoire de WAL_DIR contenant le point de reprise
+CHECKPOINT_DIR_NAME: str = "checkpoint"
+
+
+class DuplicateTransactionError(ValueError):
+    """Transaction dont l'identifiant existe déjà."""
+
+
+class PendingChange(NamedTuple):
+    """
+    Modification en attente de compaction.
+
+    rows est le lot, normalisé au schéma compact, qui contient la
+    transaction ajoutée (None : suppression).
+    """
+
+    sequence: int
+    lsn: int
+    transaction_id: str
+    rows: Optional[pd.DataFrame]
+
+
+class DeltaBuffer:
+    """
+    Tampon des modifications de l'API, compacté en arrière-plan.
+
+    Chaque modification reçoit un numéro d'ingestion croissant ; un
+    instantané retient le numéro de la dernière modification compactée
+    (DatasetSnapshot.sequence). Les vues (voir view) lisent l'instantané
+    et les seules modifications suivantes : elles ne voient ni doublon ni
+    transaction manquante.
+
+    Les modifications d'un même identifiant sont ordonnées : un
+    identifiant en cours de journalisation reste réservé jusqu'à ce que
+    sa modification soit visible.
+
+    Attributes
+    ----------
+    threshold : int
+        Nombre de modifications en attente déclenchant une compaction
+    interval : float
+        Délai maximal avant la compaction (secondes)
+    checkpoint_bytes : int
+        Taille du journal déclenchant un point de reprise (0 : jamais)
+    """
+
+    def __init__(
+        self, threshold: int, interval: float, checkpoint_bytes: int = 0
+    ) -> None:
+        """
+        Initialise le tampon.
+
+        Parameters
+        ----------
+        threshold : int
+            Nombre de modifications en attente déclenchant une compaction
+        interval : float
+            Délai maximal avant la compaction (secondes)
+        checkpoint_bytes : int, optional
+            Taille du journal déclenchant un point de reprise (0 : jamais)
+        """
+        self.threshold = max(threshold, 1)
+        self.interval = interval
+        self.checkpoint_bytes = checkpoint_bytes
+        self._rows: List[PendingChange] = []
+        self._latest: Dict[str, PendingChange] = {}
+        self._reserved: Set[str] = set()
+        self._sequence = 0
+        self._lock = threading.Lock()
+        self._compaction_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ingested = 0
+        self._deletions = 0
+        self._compactions = 0
+        self._last_compaction_ms = 0.0
+        self._view: Optional[DatasetView] = None
+        self._view_lock = threading.Lock()
+        # Journal, et modifications compactées réappliquées au fichier relu
+        self._log: Optional[WriteAheadLog] = None
+        self._lsn = 0
+        self._unapplied: Set[int] = set()
+        self._inserted: Set[str] = set()
+        self._deleted: Set[str] = set()
+        self._checkpoint_lsn = 0
+        self._checkpoints = 0
+
+    def append(self, transactions: List[Transaction]) -> IngestResult:
+        """
+        Ajoute des transactions au tampon.
+
+        Le lot est accepté ou refusé en entier, et journalisé avant d'être
+        visible.
+
+        Parameters
+        ----------
+        transactions : List[Transaction]
+            Transactions à ingérer
+
+        Returns
+        -------
+        IngestResult
+            Nombre de transactions acceptées et en attente
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        DuplicateTransactionError
+            Si un identifiant existe déjà (dataset, tampon ou lot)
+        OSError
+            Si le lot n'a pas pu être journalisé
+        """
+        ids = [transaction.id for transaction in transactions]
+        if len(set(ids)) != len(ids):
+            raise DuplicateTransactionError("Duplicate transaction ids in batch")
+        items = [transaction.model_dump() for transaction in transactions]
+        # Mêmes valeurs avant et après la compaction (voir schema)
+        rows = apply_schema(pd.DataFrame(items))
+        with self._lock:
+            # Instantané lu sous le verrou : une modification retirée du
+            # tampon par une compaction y figure forcément
+            snapshot = data_manager.get_snapshot()
+            for transaction_id in ids:
+                if transaction_id in self._reserved or self._exists(
+                    transaction_id, snapshot
+                ):
+                    raise DuplicateTransactionError(
+                        f"Transaction {transaction_id} already exists"
+                    )
+            lsn = self._reserve(ids)
+        self._write(lsn, RECORD_INSERT, items)
+        count = self._publish(lsn, [(transaction_id, rows) for transaction_id in ids])
+        return IngestResult(
+            accepted=len(transactions),
+            pending=count,
+            dataset_version=snapshot.version,
+        )
+
+    def delete(self, transaction_id: str) -> bool:
+        """
+        Supprime une transaction.
+
+        La suppression est journalisée, immédiatement visible, et
+        appliquée au dataset à la compaction suivante.
+
+        Parameters
+        ----------
+        transaction_id : str
+            Identifiant de la transaction
+
+        Returns
+        -------
+        bool
+            True si supprimée, False si elle n'existe pas
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        OSError
+            Si la suppression n'a pas pu être journalisée
+        """
+        with self._lock:
+            snapshot = data_manager.get_snapshot()
+            if transaction_id in self._reserved or not self._exists(
+                transaction_id, snapshot
+            ):
+                return False
+            lsn = self._reserve([transaction_id])
+        self._write(lsn, RECORD_DELETE, [transaction_id])
+        self._publish(lsn, [(transaction_id, None)])
+        return True
+
+    def view(self) -> DatasetView:
+        """
+        Retourne la vue du dataset publié et des modifications en attente.
+
+        La vue précédente est réutilisée tant qu'aucune modification n'est
+        reçue ; sinon elle est prolongée avec les seules nouvelles
+        modifications (voir DatasetView.extend), ou reconstruite à partir
+        des modifications restantes si une autre version a été publiée.
+
+        Returns
+        -------
+        DatasetView
+            Vue courante
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        """
+        snapshot = data_manager.get_snapshot()
+        view = self._view
+        if view is not None and view.snapshot is snapshot and view.sequence >= (
+            self._sequence
+        ):
+            return view
+        with self._view_lock:
+            with self._lock:
+                snapshot = data_manager.get_snapshot()
+                view = self._view
+                if view is None or view.snapshot is not snapshot:
+                    view = DatasetView(snapshot)
+                start = bisect.bisect_right(
+                    self._rows, view.sequence, key=lambda change: change.sequence
+                )
+                changes = self._rows[start:]
+            if changes:
+                view = view.extend(
+                    [(change.transaction_id, change.rows) for change in changes],
+                    changes[-1].sequence,
+                )
+            self._view = view
+        return view
+
+    def compact(self) -> Optional[DatasetSnapshot]:
+        """
+        Intègre les modifications en attente au dataset.
+
+        Les transactions ajoutées sont intégrées dans l'ordre et aux
+        positions de la vue courante, y compris celles supprimées depuis
+        (marquées mortes) : une position lue avant la compaction reste
+        valide après. Les modifications continuent pendant la compaction :
+        seules celles de la vue sont intégrées. Un point de reprise est
+        ensuite écrit si le journal dépasse checkpoint_bytes.
+
+        Returns
+        -------
+        Optional[DatasetSnapshot]
+            Instantané publié, ou None si aucune modification n'était en
+            attente
+        """
+        with self._compaction_lock:
+            view = self.view()
+            with self._lock:
+                end = bisect.bisect_right(
+                    self._rows, view.sequence, key=lambda change: change.sequence
+                )
+                batch = self._rows[:end]
+            if not batch:
+                return None
+            started = time.perf_counter()
+            # Identifiants retirés des lignes publiées : une transaction
+            # ajoutée puis supprimée dans le lot est morte dans view.tail
+            inserted: Set[str] = set()
+            removed: List[str] = []
+            for change in batch:
+                if change.rows is not None:
+                    inserted.add(change.transaction_id)
+                elif change.transaction_id in inserted:
+                    inserted.discard(change.transaction_id)
+                else:
+                    removed.append(change.transaction_id)
+            tail = view.tail
+            # Mis à jour avant la publication (voir _restore)
+            with self._lock:
+                self._fold(
+                    (change.transaction_id, change.rows is not None)
+                    for change in batch
+                )
+            snapshot = data_manager._append(
+                tail.data if tail is not None else pd.DataFrame(),
+                sequence=batch[-1].sequence,
+                removed=removed,
+                discarded=tail.dead.tolist() if tail is not None else (),
+            )
+            with self._lock:
+                del self._rows[:len(batch)]
+                for change in batch:
+                    if self._latest.get(change.transaction_id) is change:
+                        del self._latest[change.transaction_id]
+                    self._unapplied.discard(change.lsn)
+                self._compactions += 1
+                self._last_compaction_ms = (time.perf_counter() - started) * 1000
+            logger.info(
+                f"Compacted {len(batch)} changes into version {snapshot.version}"
+            )
+            log = self._log
+            if (
+                log is not None
+                and self.checkpoint_bytes > 0
+                and log.size() >= self.checkpoint_bytes
+            ):
+                self._checkpoint(log)
+        return snapshot
+
+    def recover(self, directory: str) -> int:
+        """
+        Ouvre le journal et applique au dataset les modifications qu'il
+        contient.
+
+        Le dernier point de reprise et les enregistrements suivants sont
+        appliqués en bloc au dataset chargé, puis réappliqués à chaque
+        relecture complète du fichier. Les modifications suivantes sont
+        journalisées dans un nouveau segment.
+
+        Parameters
+        ----------
+        directory : str
+            Répertoire du journal (WAL_DIR)
+
+        Returns
+        -------
+        int
+            Nombre d'enregistrements du journal rejoués
+
+        Raises
+        ------
+        RuntimeError
+            Si les données ne sont pas chargées
+        """
+        log = WriteAheadLog(directory)
+        records = log.open()
+        checkpoint = ColumnarCache(str(log.directory / CHECKPOINT_DIR_NAME)).read()
+        watermark = 0
+        inserted: Set[str] = set()
+        deleted: Set[str] = set()
+        rows = pd.DataFrame()
+        if checkpoint is not None:
+            rows, source = checkpoint
+            watermark = int(source["lsn"])
+            inserted = set(rows["id"])
+            deleted = set(source["deleted"])
+
+        # Enregistrements suivant le point de reprise, dans l'ordre : l'état
+        # final d'une transaction est celui de son dernier enregistrement
+        replayed = sorted(
+            (record for record in records if record.lsn > watermark),
+            key=lambda record: record.lsn,
+        )
+        final: Dict[str, Optional[dict]] = {}
+        changes: List[Tuple[str, bool]] = []
+        for record in replayed:
+            items = json.loads(record.payload)
+            if record.kind == RECORD_INSERT:
+                for item in items:
+                    final[item["id"]] = item
+                    changes.append((item["id"], True))
+            elif record.kind == RECORD_DELETE:
+                for transaction_id in items:
+                    final[transaction_id] = None
+                    changes.append((transaction_id, False))
+
+        with self._lock:
+            self._inserted, self._deleted = inserted, deleted
+            self._fold(changes)
+            removed = self._inserted | self._deleted
+            self._lsn = max([watermark] + [record.lsn for record in records])
+            self._checkpoint_lsn = watermark
+
+        # Lignes du point de reprise non remplacées, puis lignes du journal
+        if len(rows) and final:
+            rows = rows[~rows["id"].isin(list(final))].reset_index(drop=True)
+        data_manager._append(rows, removed=removed)
+        added = [item for item in final.values() if item is not None]
+        if added:
+            data_manager._append(apply_schema(pd.DataFrame(added)))
+
+        self._log = log
+        data_manager._restore = self._restore
+        logger.info(
+            f"Recovered {len(self._inserted)} ingested and {len(self._deleted)} "
+            f"deleted transactions ({len(replayed)} log records replayed)"
+        )
+        return len(replayed)
+
+    def start(self) -> None:
+        """Démarre le thread de compaction."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="delta-compactor", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Arrête le thread de compaction après une dernière compaction, puis
+        ferme le journal.
+        """
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.close()
+
+    def close(self) -> None:
+        """Ferme le journal : les modifications suivantes ne sont plus durables."""
+        log, self._log = self._log, None
+        if log is not None:
+            log.close()
+        if data_manager._restore == self._restore:
+            data_manager._restore = None
+
+    def metrics(self) -> IngestionMetrics:
+        """
+        Retourne les compteurs de l'ingestion.
+
+        Returns
+        -------
+        IngestionMetrics
+            Modifications en attente et reçues, compactions, journal et
+            points de reprise
+        """
+        log = self._log
+        records, syncs = log.metrics() if log is not None else (0, 0)
+        with self._lock:
+            return IngestionMetrics(
+                pending=len(self._rows),
+                ingested=self._ingested,
+                deleted=self._deletions,
+                compactions=self._compactions,
+                last_compaction_ms=self._last_compaction_ms,
+                log_records=records,
+                log_syncs=syncs,
+                checkpoints=self._checkpoints,
+            )
+
+    def _exists(self, transaction_id: str, snapshot: DatasetSnapshot) -> bool:
+        """
+        Indique si une transaction existe (appelé sous _lock).
+
+        Parameters
+        ----------
+        transaction_id : str
+            Identifiant de la transaction
+        snapshot : DatasetSnapshot
+            Instantané courant, lu sous _lock
+
+        Returns
+        -------
+        bool
+            True si la dernière modification en attente est un ajout ou,
+            sans modification en attente, si l'instantané la contient
+        """
+        pending = self._latest.get(transaction_id)
+        if pending is not None:
+            return pending.rows is not None
+        return snapshot.locate(transaction_id) is not None
+
+    def _reserve(self, ids: List[str]) -> int:
+        """
+        Réserve des identifiants et un numéro de journal (appelé sous _lock).
+
+        Parameters
+        ----------
+        ids : List[str]
+            Identifiants modifiés
+
+        Returns
+        -------
+        int
+            Numéro de l'enregistrement du journal
+        """
+        self._reserved.update(ids)
+        self._lsn += 1
+        self._unapplied.add(self._lsn)
+        return self._lsn
+
+    def _write(self, lsn: int, kind: int, items: list) -> None:
+        """
+        Journalise une modification réservée, ou libère sa réservation.
+
+        Parameters
+        ----------
+        lsn : int
+            Numéro réservé
+        kind : int
+            Type de l'enregistrement
+        items : list
+            Transactions ajoutées ou identifiants supprimés
+
+        Raises
+        ------
+        OSError
+            Si l'enregistrement n'a pas pu être écrit
+        """
+        log = self._log
+        if log is None:
+            return
+        try:
+            log.append(lsn, kind, json.dumps(items).encode("utf-8"))
+        except Exception:
+            with self._lock:
+                self._reserved.difference_update(
+                    item["id"] if kind == RECORD_INSERT else item for item in items
+                )
+                self._unapplied.discard(lsn)
+            raise
+
+    def _publish(
+        self, lsn: int, changes: List[Tuple[str, Optional[pd.DataFrame]]]
+    ) -> int:
+        """
+        Rend visibles des modifications journalisées.
+
+        Parameters
+        ----------
+        lsn : int
+            Numéro de leur enregistrement
+        changes : List[Tuple[str, Optional[pd.DataFrame]]]
+            Identifiants et lots normalisés (None pour une suppression),
+            dans l'ordre des lignes de chaque lot
+
+        Returns
+        -------
+        int
+            Nombre de modifications en attente
+        """
+        with self._lock:
+            # Les numéros prolongent ceux déjà intégrés au dataset publié
+            snapshot = data_manager.get_snapshot()
+            self._sequence = max(self._sequence, snapshot.sequence)
+            for transaction_id, rows in changes:
+                self._sequence += 1
+                pending = PendingChange(self._sequence, lsn, transaction_id, rows)
+                self._rows.append(pending)
+                self._latest[transaction_id] = pending
+                self._reserved.discard(transaction_id)
+                if rows is None:
+                    self._deletions += 1
+                else:
+                    self._ingested += 1
+            count = len(self._rows)
+        if count >= self.threshold:
+            self._wakeup.set()
+        return count
+
+    def _fold(self, changes: Iterable[Tuple[str, bool]]) -> None:
+        """
+        Intègre des modifications aux ensembles réappliqués au fichier relu
+        (appelé sous _lock).
+
+        Rejouer une modification déjà intégrée ne change pas le résultat.
+
+        Parameters
+        ----------
+        changes : Iterable[Tuple[str, bool]]
+            Identifiants, avec True pour un ajout et False pour une
+            suppression, dans l'ordre
+        """
+        for transaction_id, present in changes:
+            if present:
+                self._inserted.add(transaction_id)
+            elif transaction_id in self._inserted:
+                self._inserted.discard(transaction_id)
+            else:
+                self._deleted.add(transaction_id)
+
+    def _restore(self, snapshot: DatasetSnapshot) -> Tuple[Set[str], pd.DataFrame]:
+        """
+        Modifications de l'API à réappliquer au fichier relu.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané courant, qui contient les transactions de l'API
+
+        Returns
+        -------
+        Tuple[Set[str], pd.DataFrame]
+            Identifiants à retirer du fichier et transactions de l'API
+        """
+        with self._lock:
+            inserted = set(self._inserted)
+            removed = inserted | self._deleted
+        return removed, snapshot.rows_with_ids(inserted)
+
+    def _checkpoint(self, log: WriteAheadLog) -> None:
+        """
+        Écrit un point de reprise et supprime les segments qu'il couvre
+        (appelé sous _compaction_lock).
+
+        Parameters
+        ----------
+        log : WriteAheadLog
+            Journal ouvert
+        """
+        started = time.perf_counter()
+        with self._lock:
+            # Tous les enregistrements jusqu'à watermark sont compactés
+            watermark = min(self._unapplied) - 1 if self._unapplied else self._lsn
+            snapshot = data_manager.get_snapshot()
+            inserted = set(self._inserted)
+            deleted = sorted(self._deleted)
+        if watermark <= self._checkpoint_lsn:
+            return
+        log.rotate()
+        rows = snapshot.rows_with_ids(inserted)
+        cache = ColumnarCache(str(log.directory / CHECKPOINT_DIR_NAME))
+        cache.write(rows, {"lsn": watermark, "deleted": deleted})
+        self._checkpoint_lsn = watermark
+        removed = log.remove(watermark)
+        self._checkpoints += 1
+        logger.info(
+            f"Checkpoint at log record {watermark}: {len(rows)} transactions, "
+            f"{removed} segments removed in "
+            f"{(time.perf_counter() - started) * 1000:.0f} ms"
+        )
+
+    def _run(self) -> None:
+        """Boucle de compaction."""
+        while not self._stop.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.compact()
+            except Exception as e:
+                # Les modifications restent en attente pour la tentative suivante
+                logger.error(f"Error compacting transactions: {str(e)}")
+
+
+# Instance globale du tampon, lue par DataManager.get_view
+delta_buffer: DeltaBuffer = DeltaBuffer(
+    settings.DELTA_COMPACTION_ROWS,
+    settings.DELTA_COMPACTION_INTERVAL,
+    settings.WAL_CHECKPOINT_BYTES,
+)
+data_manager._overlay = delta_buffer.view
@@ -13,6 +13,9 @@ from pathlib import Path
 
 from banking_api.config import settings
 from banking_api.data_manager import data_manager
+from banking_api.http_cache import conditional_requests
+from banking_api.ingestion import delta_buffer
+from banking_api.reloader import dataset_reloader
 from banking_api.routes import transactions, stats, fraud, customers, system
 
 # Configuration du logging
@@ -40,7 +43,10 @@ def create_app() -> FastAPI:
         redoc_url="/redoc",
     )
 
-    # Configuration CORS
+    # ETag et réponses 304 sur les endpoints d'agrégats
+    app.middleware("http")(conditional_requests)
+
+    # Configuration CORS (enregistrée en dernier : elle enveloppe les autres)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=["*"],
@@ -92,17 +98,25 @@ def create_app() -> FastAPI:
         """
         Événement exécuté au démarrage de l'application.
 
-        Charge les données depuis le fichier CSV.
+        Charge les données depuis le cache colonnaire s'il est à jour,
+        sinon depuis le fichier CSV, rejoue le journal des modifications
+        de l'API, puis surveille le fichier pour le recharger à chaud.
         """
         logger.info("Starting Banking Transactions API")
         try:
             if settings.DATA_PATH:
                 data_path = Path(settings.DATA_PATH)
                 if data_path.exists():
-                    data_manager.load_data(str(data_path))
+                    data_manager.load_data(
+                        str(data_path), snapshot_dir=settings.SNAPSHOT_DIR
+                    )
                     logger.info(
                         f"Data loaded: {data_manager.get_record_count()} transactions"
                     )
+                    if settings.WAL_DIR:
+                        delta_buffer.recover(settings.WAL_DIR)
+                    dataset_reloader.start(str(data_path))
+                    delta_buffer.start()
                 else:
                     logger.warning(
                         f"Data file not found: {settings.DATA_PATH}. "
@@ -119,6 +133,8 @@ def create_app() -> FastAPI:
         Événement exécuté à l'arrêt de l'application.
         """
         logger.info("Shutting down Banking Transactions API")
+        dataset_reloader.stop()
+        delta_buffer.stop()
 
     # Route racine
     @app.get("/", tags=["Root"])
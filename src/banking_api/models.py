@@ -5,7 +5,7 @@ Ce module contient tous les modèles Pydantic utilisés pour la validation
 et la sérialisation des données dans l'API REST.
 """
 
-from typing import Optional, List, Literal
+from typing import Any, Dict, Optional, List, Literal
 from pydantic import BaseModel, Field, field_validator
 
 
@@ -75,6 +75,53 @@ class Transaction(BaseModel):
         }
 
 
+class QueryStage(BaseModel):
+    """
+    Étape d'exécution d'un plan de recherche.
+
+    Attributes
+    ----------
+    predicate : str
+        Prédicat évalué (ex: "use_chip = 'Chip Transaction'")
+    access_path : str
+        Chemin d'accès utilisé (index, bitmap, parcours...)
+    estimated_rows : int
+        Nombre de lignes estimé par le planificateur
+    output_rows : int
+        Nombre de lignes restantes après l'étape
+    elapsed_ms : float
+        Durée de l'étape en millisecondes
+    """
+
+    predicate: str = Field(..., description="Evaluated predicate")
+    access_path: str = Field(..., description="Access path used")
+    estimated_rows: int = Field(..., ge=0, description="Estimated matching rows")
+    output_rows: int = Field(..., ge=0, description="Rows left after the stage")
+    elapsed_ms: float = Field(..., ge=0, description="Stage duration (ms)")
+
+
+class QueryPlan(BaseModel):
+    """
+    Plan d'exécution d'une recherche (EXPLAIN).
+
+    Attributes
+    ----------
+    stages : List[QueryStage]
+        Étapes, dans l'ordre d'exécution
+    planning_ms : float
+        Durée de l'estimation et du tri des prédicats
+    fetch_ms : float
+        Durée de la construction de la page de résultats
+    total_ms : float
+        Durée totale de la recherche
+    """
+
+    stages: List[QueryStage] = Field(..., description="Execution stages")
+    planning_ms: float = Field(..., ge=0, description="Planning duration (ms)")
+    fetch_ms: float = Field(..., ge=0, description="Page fetch duration (ms)")
+    total_ms: float = Field(..., ge=0, description="Total duration (ms)")
+
+
 class TransactionResponse(BaseModel):
     """
     Réponse paginée pour la liste des transactions.
@@ -89,12 +136,48 @@ class TransactionResponse(BaseModel):
         Nombre total de transactions
     transactions : List[Transaction]
         Liste des transactions
+    explain : Optional[QueryPlan]
+        Plan d'exécution (uniquement sur demande)
+    next_cursor : Optional[str]
+        Curseur de la page suivante (None sur la dernière page)
     """
 
     page: int = Field(..., ge=1, description="Current page number")
     limit: int = Field(..., ge=1, le=1000, description="Items per page")
     total: int = Field(..., ge=0, description="Total number of transactions")
     transactions: List[Transaction] = Field(..., description="List of transactions")
+    explain: Optional[QueryPlan] = Field(None, description="Query execution plan")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page")
+
+
+class ColumnarTransactionResponse(BaseModel):
+    """
+    Réponse paginée en disposition colonnaire (layout=columnar).
+
+    Attributes
+    ----------
+    page : int
+        Numéro de page actuel
+    limit : int
+        Nombre d'éléments par page
+    total : int
+        Nombre total de transactions
+    transactions : Dict[str, List[Any]]
+        Valeurs des transactions, un tableau par champ
+    explain : Optional[QueryPlan]
+        Plan d'exécution (uniquement sur demande)
+    next_cursor : Optional[str]
+        Curseur de la page suivante (None sur la dernière page)
+    """
+
+    page: int = Field(..., ge=1, description="Current page number")
+    limit: int = Field(..., ge=1, le=1000, description="Items per page")
+    total: int = Field(..., ge=0, description="Total number of transactions")
+    transactions: Dict[str, List[Any]] = Field(
+        ..., description="Transaction values, one array per field"
+    )
+    explain: Optional[QueryPlan] = Field(None, description="Query execution plan")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page")
 
 
 class TransactionSearchRequest(BaseModel):
@@ -115,6 +198,8 @@ class TransactionSearchRequest(BaseModel):
         État du commerçant
     mcc : Optional[int]
         Code catégorie marchand
+    errors : Optional[str]
+        Drapeau d'erreur (ex: Bad PIN)
     """
 
     use_chip: Optional[str] = Field(
@@ -127,6 +212,9 @@ class TransactionSearchRequest(BaseModel):
     merchant_id: Optional[int] = Field(None, description="Merchant ID filter")
     merchant_state: Optional[str] = Field(None, description="Merchant state filter")
     mcc: Optional[int] = Field(None, description="Merchant Category Code filter")
+    errors: Optional[str] = Field(
+        None, description="Error flag filter (e.g. Bad PIN, Insufficient Balance)"
+    )
 
     @field_validator("amount_range")
     @classmethod
@@ -368,12 +456,15 @@ class CustomerListResponse(BaseModel):
         Nombre total de clients
     customers : List[str]
         Liste des identifiants clients
+    next_cursor : Optional[str]
+        Curseur de la page suivante (None sur la dernière page)
     """
 
     page: int = Field(..., ge=1, description="Page number")
     limit: int = Field(..., ge=1, le=1000, description="Items per page")
     total: int = Field(..., ge=0, description="Total customers")
     customers: List[str] = Field(..., description="Customer IDs")
+    next_cursor: Optional[str] = Field(None, description="Cursor of the next page")
 
 
 class SystemHealth(BaseModel):
@@ -420,6 +511,218 @@ class SystemMetadata(BaseModel):
     python_version: str = Field(..., description="Python version")
 
 
+class CacheMetrics(BaseModel):
+    """
+    Compteurs d'un cache de réponses.
+
+    Attributes
+    ----------
+    entries : int
+        Nombre d'entrées mémorisées
+    bytes : int
+        Taille cumulée des entrées en octets
+    max_bytes : int
+        Taille maximale du cache en octets
+    hits : int
+        Nombre de requêtes servies depuis le cache
+    misses : int
+        Nombre de requêtes calculées
+    evictions : int
+        Nombre d'entrées évincées faute de place
+    expirations : int
+        Nombre d'entrées expirées (TTL)
+    invalidations : int
+        Nombre d'entrées invalidées par une nouvelle version du dataset
+    """
+
+    entries: int = Field(..., ge=0, description="Cached entries")
+    bytes: int = Field(..., ge=0, description="Cached bytes")
+    max_bytes: int = Field(..., ge=0, description="Maximum cached bytes")
+    hits: int = Field(..., ge=0, description="Cache hits")
+    misses: int = Field(..., ge=0, description="Cache misses")
+    evictions: int = Field(..., ge=0, description="Entries evicted for space")
+    expirations: int = Field(..., ge=0, description="Entries expired by TTL")
+    invalidations: int = Field(..., ge=0, description="Entries dropped on reload")
+
+
+class SingleFlightMetrics(BaseModel):
+    """
+    Compteurs du regroupement des calculs identiques.
+
+    Attributes
+    ----------
+    executions : int
+        Nombre de calculs exécutés
+    coalesced : int
+        Nombre de requêtes ayant attendu un calcul déjà en cours
+    in_flight : int
+        Nombre de calculs en cours
+    """
+
+    executions: int = Field(..., ge=0, description="Computations executed")
+    coalesced: int = Field(..., ge=0, description="Requests sharing a computation")
+    in_flight: int = Field(..., ge=0, description="Computations in progress")
+
+
+class PoolMetrics(BaseModel):
+    """
+    Compteurs du pool des traitements bloquants.
+
+    Attributes
+    ----------
+    workers : int
+        Nombre de threads du pool
+    queued : int
+        Traitements en attente d'un thread
+    active : int
+        Traitements en cours
+    completed : int
+        Traitements terminés
+    """
+
+    workers: int = Field(..., ge=1, description="Worker threads")
+    queued: int = Field(..., ge=0, description="Tasks waiting for a worker")
+    active: int = Field(..., ge=0, description="Tasks running")
+    completed: int = Field(..., ge=0, description="Tasks completed")
+
+
+class IngestionMetrics(BaseModel):
+    """
+    Compteurs de l'ingestion des transactions.
+
+    Attributes
+    ----------
+    pending : int
+        Modifications en attente de compaction
+    ingested : int
+        Transactions reçues depuis le démarrage
+    deleted : int
+        Transactions supprimées depuis le démarrage
+    compactions : int
+        Compactions effectuées
+    last_compaction_ms : float
+        Durée de la dernière compaction en millisecondes
+    log_records : int
+        Enregistrements écrits dans le journal
+    log_syncs : int
+        Synchronisations du journal (chacune couvre un lot d'enregistrements)
+    checkpoints : int
+        Points de reprise écrits
+    """
+
+    pending: int = Field(..., ge=0, description="Changes awaiting compaction")
+    ingested: int = Field(..., ge=0, description="Transactions received")
+    deleted: int = Field(..., ge=0, description="Transactions deleted")
+    compactions: int = Field(..., ge=0, description="Compactions performed")
+    last_compaction_ms: float = Field(
+        ..., ge=0, description="Duration of the last compaction (ms)"
+    )
+    log_records: int = Field(..., ge=0, description="Write-ahead log records")
+    log_syncs: int = Field(..., ge=0, description="Write-ahead log group commits")
+    checkpoints: int = Field(..., ge=0, description="Log checkpoints written")
+
+
+class IngestResult(BaseModel):
+    """
+    Résultat d'une requête d'ingestion.
+
+    Attributes
+    ----------
+    accepted : int
+        Transactions acceptées
+    pending : int
+        Transactions en attente de compaction, y compris celles-ci
+    dataset_version : int
+        Version du dataset publiée au moment de l'ingestion
+    """
+
+    accepted: int = Field(..., ge=0, description="Transactions accepted")
+    pending: int = Field(..., ge=0, description="Transactions awaiting compaction")
+    dataset_version: int = Field(..., ge=0, description="Published dataset version")
+
+
+class AdmissionMetrics(BaseModel):
+    """
+    Compteurs du contrôle d'admission d'une classe d'endpoints.
+
+    Attributes
+    ----------
+    name : str
+        Classe d'endpoints
+    limit : int
+        Nombre maximal de requêtes simultanées
+    queue_size : int
+        Nombre maximal de requêtes en attente
+    active : int
+        Requêtes en cours
+    queued : int
+        Requêtes en attente d'une place
+    admitted : int
+        Requêtes admises
+    rejected : int
+        Requêtes rejetées (503)
+    """
+
+    name: str = Field(..., description="Endpoint class")
+    limit: int = Field(..., ge=1, description="Concurrency limit")
+    queue_size: int = Field(..., ge=0, description="Wait queue capacity")
+    active: int = Field(..., ge=0, description="Requests running")
+    queued: int = Field(..., ge=0, description="Requests waiting")
+    admitted: int = Field(..., ge=0, description="Requests admitted")
+    rejected: int = Field(..., ge=0, description="Requests rejected with 503")
+
+
+class SystemMetrics(BaseModel):
+    """
+    Métriques de fonctionnement de l'API.
+
+    Attributes
+    ----------
+    dataset_version : int
+        Version du dataset publiée
+    response_cache : CacheMetrics
+        Compteurs du cache des réponses
+    single_flight : SingleFlightMetrics
+        Compteurs du regroupement des calculs identiques
+    compute_pool : PoolMetrics
+        Compteurs du pool des traitements bloquants
+    admission : List[AdmissionMetrics]
+        Compteurs du contrôle d'admission, par classe d'endpoints
+    ingestion : IngestionMetrics
+        Compteurs de l'ingestion des transactions
+    """
+
+    dataset_version: int = Field(..., ge=0, description="Published dataset version")
+    response_cache: CacheMetrics = Field(..., description="Response cache counters")
+    single_flight: SingleFlightMetrics = Field(
+        ..., description="Request coalescing counters"
+    )
+    compute_pool: PoolMetrics = Field(..., description="Compute pool counters")
+    admission: List[AdmissionMetrics] = Field(
+        ..., description="Admission control counters per endpoint class"
+    )
+    ingestion: IngestionMetrics = Field(..., description="Ingestion counters")
+
+
+class ReloadResult(BaseModel):
+    """
+    Résultat d'un rechargement du dataset.
+
+    Attributes
+    ----------
+    dataset_version : int
+        Version du dataset publiée
+    total_records : int
+        Nombre d'enregistrements de la version publiée
+    duration_ms : float
+        Durée du rechargement en millisecondes
+    """
+
+    dataset_version: int = Field(..., ge=0, description="Published dataset version")
+    total_records: int = Field(..., ge=0, description="Total records in dataset")
+    duration_ms: float = Field(..., ge=0, description="Reload duration (ms)")
+
+
 class ErrorResponse(BaseModel):
     """
     Réponse d'erreur standardisée.
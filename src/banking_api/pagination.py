@@ -0,0 +1,151 @@
+"""
+Pagination par curseur des listes de l'API.
+
+Un curseur est un jeton opaque (JSON encodé en base64 URL) qui contient
+la version du dataset parcourue, l'empreinte des filtres, la clé de la
+dernière ligne retournée et le rang de la ligne suivante. La page
+suivante reprend directement après cette clé : sur le dataset courant
+tant que les positions de ses lignes sont inchangées (ajouts et
+suppressions de l'API, voir DatasetSnapshot.layout), sinon sur la même
+version du dataset, même si celui-ci a été rechargé entre-temps.
+"""
+
+import base64
+import binascii
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+
+class InvalidCursorError(ValueError):
+    """Curseur illisible ou émis pour d'autres filtres."""
+
+
+class Cursor:
+    """
+    Position de reprise d'un parcours paginé.
+
+    Attributes
+    ----------
+    version : int
+        Version du dataset parcourue
+    fingerprint : str
+        Empreinte des filtres du parcours
+    key : int
+        Clé de la dernière ligne retournée
+    offset : int
+        Rang de la ligne suivante dans le résultat
+    layout : int
+        Disposition des positions de la version parcourue
+    """
+
+    def __init__(
+        self,
+        version: int,
+        fingerprint: str,
+        key: int,
+        offset: int,
+        layout: Optional[int] = None,
+    ) -> None:
+        """
+        Initialise le curseur.
+
+        Parameters
+        ----------
+        version : int
+            Version du dataset parcourue
+        fingerprint : str
+            Empreinte des filtres du parcours
+        key : int
+            Clé de la dernière ligne retournée
+        offset : int
+            Rang de la ligne suivante dans le résultat
+        layout : Optional[int], optional
+            Disposition des positions de la version parcourue (défaut:
+            version)
+        """
+        self.version = version
+        self.fingerprint = fingerprint
+        self.key = key
+        self.offset = offset
+        self.layout = version if layout is None else layout
+
+    def encode(self) -> str:
+        """
+        Encode le curseur en jeton opaque.
+
+        Returns
+        -------
+        str
+            Jeton base64 URL, sans remplissage
+        """
+        payload = json.dumps(
+            {
+                "v": self.version,
+                "f": self.fingerprint,
+                "k": self.key,
+                "o": self.offset,
+                "l": self.layout,
+            },
+            separators=(",", ":"),
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str, fingerprint: str) -> "Cursor":
+        """
+        Décode un jeton et vérifie qu'il correspond aux filtres courants.
+
+        Parameters
+        ----------
+        token : str
+            Jeton reçu du client
+        fingerprint : str
+            Empreinte des filtres de la requête
+
+        Returns
+        -------
+        Cursor
+            Curseur décodé
+
+        Raises
+        ------
+        InvalidCursorError
+            Si le jeton est illisible ou a été émis pour d'autres filtres
+        """
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            cursor = cls(
+                int(payload["v"]),
+                str(payload["f"]),
+                int(payload["k"]),
+                int(payload["o"]),
+                int(payload.get("l", payload["v"])),
+            )
+        except (binascii.Error, ValueError, KeyError, TypeError) as e:
+            raise InvalidCursorError("Invalid cursor") from e
+        if cursor.fingerprint != fingerprint:
+            raise InvalidCursorError("Cursor does not match the request filters")
+        return cursor
+
+
+def fingerprint(scope: str, filters: Dict[str, Any]) -> str:
+    """
+    Calcule l'empreinte d'un ensemble de filtres.
+
+    Parameters
+    ----------
+    scope : str
+        Liste parcourue (ex: "transactions")
+    filters : Dict[str, Any]
+        Filtres de la requête (les valeurs None sont ignorées)
+
+    Returns
+    -------
+    str
+        Empreinte hexadécimale (16 caractères)
+    """
+    active = {name: value for name, value in filters.items() if value is not None}
+    document = json.dumps([scope, active], sort_keys=True, default=str)
+    return hashlib.sha1(document.encode()).hexdigest()[:16]
@@ -0,0 +1,508 @@
+"""
+Planificateur de requêtes pour la recherche de transactions.
+
+Ce module choisit l'ordre d'évaluation des filtres d'une recherche à
+partir d'estimations de sélectivité : le prédicat le plus sélectif est
+évalué sur la colonne complète (via son index lorsqu'il existe), les
+suivants ne sont testés que sur les lignes encore candidates.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from banking_api.data_manager import DatasetSnapshot
+from banking_api.deadline import budgeted_chunks, check_deadline
+from banking_api.indexes import Selection, contains, to_positions
+from banking_api.models import QueryStage
+from banking_api.schema import AMOUNT_COLUMN, AMOUNT_SCALE, equals
+
+# Fraction du dataset au-delà de laquelle un intervalle de montants est
+# évalué par parcours de colonne plutôt que via l'index trié
+RANGE_SCAN_THRESHOLD: float = 0.25
+
+
+def _scan(size: int, matches: Callable[[slice], np.ndarray]) -> np.ndarray:
+    """
+    Parcourt une colonne par blocs et retourne les positions retenues.
+
+    L'échéance de la requête est vérifiée entre deux blocs (voir
+    budgeted_chunks).
+
+    Parameters
+    ----------
+    size : int
+        Nombre de lignes de la colonne
+    matches : Callable[[slice], np.ndarray]
+        Masque booléen des lignes retenues d'un bloc
+
+    Returns
+    -------
+    np.ndarray
+        Positions croissantes des lignes retenues
+    """
+    parts = [
+        np.flatnonzero(matches(chunk)) + chunk.start for chunk in budgeted_chunks(size)
+    ]
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.intp)
+
+
+def _elapsed_ms(started: float) -> float:
+    """
+    Retourne la durée écoulée depuis un instant de référence.
+
+    Parameters
+    ----------
+    started : float
+        Instant de référence (time.perf_counter)
+
+    Returns
+    -------
+    float
+        Durée en millisecondes
+    """
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+class Predicate(ABC):
+    """
+    Prédicat de filtrage d'une recherche.
+
+    Attributes
+    ----------
+    column : str
+        Colonne filtrée
+    """
+
+    column: str
+
+    @abstractmethod
+    def describe(self) -> str:
+        """
+        Retourne une représentation lisible du prédicat.
+
+        Returns
+        -------
+        str
+            Description du prédicat
+        """
+
+    @abstractmethod
+    def estimate(self, snapshot: DatasetSnapshot) -> float:
+        """
+        Estime le nombre de lignes satisfaisant le prédicat.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        float
+            Nombre de lignes estimé
+        """
+
+    @abstractmethod
+    def evaluate(
+        self, snapshot: DatasetSnapshot
+    ) -> Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Évalue le prédicat sur la colonne complète.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]
+            Chemin d'accès, positions croissantes ou bitmap compacté
+            (l'un des deux est None)
+        """
+
+    def dense_bitmap(self, snapshot: DatasetSnapshot) -> Optional[np.ndarray]:
+        """
+        Retourne le bitmap compacté du prédicat s'il est déjà indexé.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            Bitmap partagé (ne pas modifier), ou None
+        """
+        return None
+
+    @abstractmethod
+    def test(self, snapshot: DatasetSnapshot, positions: np.ndarray) -> np.ndarray:
+        """
+        Teste le prédicat sur des lignes candidates.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+        positions : np.ndarray
+            Positions croissantes des lignes candidates
+
+        Returns
+        -------
+        np.ndarray
+            Masque booléen aligné sur positions
+        """
+
+
+class EqualsPredicate(Predicate):
+    """Prédicat d'égalité ``column == value``."""
+
+    def __init__(self, column: str, value: Any) -> None:
+        """
+        Initialise le prédicat.
+
+        Parameters
+        ----------
+        column : str
+            Colonne filtrée
+        value : Any
+            Valeur recherchée
+        """
+        self.column = column
+        self.value = value
+
+    def describe(self) -> str:
+        """
+        Retourne une représentation lisible du prédicat.
+
+        Returns
+        -------
+        str
+            Description du prédicat
+        """
+        return f"{self.column} = {self.value!r}"
+
+    def estimate(self, snapshot: DatasetSnapshot) -> float:
+        """
+        Estime le nombre de lignes égales à la valeur.
+
+        Les index bitmap et groupés donnent un décompte exact ; à défaut,
+        l'estimation provient des statistiques de la colonne.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        float
+            Nombre de lignes estimé
+        """
+        bitmap_index = snapshot.bitmaps.get(self.column)
+        if bitmap_index is not None:
+            return float(bitmap_index.count(self.value))
+        group_index = snapshot.groups.get(self.column)
+        if group_index is not None:
+            return float(group_index.count(self.value))
+        statistics = snapshot.statistics.get(self.column)
+        if statistics is not None:
+            return statistics.estimate_equal(self.value)
+        return float(len(snapshot))
+
+    def evaluate(
+        self, snapshot: DatasetSnapshot
+    ) -> Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Évalue le prédicat sur la colonne complète.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]
+            Chemin d'accès, positions ou bitmap compacté
+        """
+        bitmap_index = snapshot.bitmaps.get(self.column)
+        if bitmap_index is not None:
+            if bitmap_index.is_dense(self.value):
+                return "bitmap", None, bitmap_index.bitmap(self.value)
+            return "bitmap-positions", bitmap_index.positions(self.value), None
+        group_index = snapshot.groups.get(self.column)
+        if group_index is not None:
+            return "group-index", group_index.lookup(self.value), None
+        column = snapshot.column(self.column)
+        positions = _scan(
+            len(column), lambda chunk: equals(column.iloc[chunk], self.value)
+        )
+        return "scan", positions, None
+
+    def dense_bitmap(self, snapshot: DatasetSnapshot) -> Optional[np.ndarray]:
+        """
+        Retourne le bitmap compacté de la valeur s'il est déjà indexé.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        Optional[np.ndarray]
+            Bitmap partagé (ne pas modifier), ou None
+        """
+        bitmap_index = snapshot.bitmaps.get(self.column)
+        if bitmap_index is not None and bitmap_index.is_dense(self.value):
+            return bitmap_index.bitmap(self.value)
+        return None
+
+    def test(self, snapshot: DatasetSnapshot, positions: np.ndarray) -> np.ndarray:
+        """
+        Teste l'égalité sur des lignes candidates.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+        positions : np.ndarray
+            Positions croissantes des lignes candidates
+
+        Returns
+        -------
+        np.ndarray
+            Masque booléen aligné sur positions
+        """
+        bitmap_index = snapshot.bitmaps.get(self.column)
+        if bitmap_index is not None:
+            # Passage obligé pour les drapeaux multi-valués (errors)
+            if bitmap_index.is_dense(self.value):
+                return contains(bitmap_index.bitmap(self.value), positions)
+            members = bitmap_index.positions(self.value)
+            return np.isin(positions, members, assume_unique=True)
+        values = snapshot.column(self.column).iloc[positions]
+        return equals(values, self.value)
+
+
+class AmountRangePredicate(Predicate):
+    """Prédicat d'intervalle ``low <= amount_cents <= high``."""
+
+    column = AMOUNT_COLUMN
+
+    def __init__(self, low: Optional[int], high: Optional[int]) -> None:
+        """
+        Initialise le prédicat.
+
+        Parameters
+        ----------
+        low : Optional[int]
+            Borne inférieure incluse, en centimes
+        high : Optional[int]
+            Borne supérieure incluse, en centimes
+        """
+        self.low = low
+        self.high = high
+
+    def describe(self) -> str:
+        """
+        Retourne une représentation lisible du prédicat.
+
+        Returns
+        -------
+        str
+            Description du prédicat
+        """
+        low = "-inf" if self.low is None else f"{self.low / AMOUNT_SCALE:.2f}"
+        high = "+inf" if self.high is None else f"{self.high / AMOUNT_SCALE:.2f}"
+        return f"amount BETWEEN {low} AND {high}"
+
+    def estimate(self, snapshot: DatasetSnapshot) -> float:
+        """
+        Estime le nombre de lignes dans l'intervalle.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        float
+            Nombre de lignes estimé (histogramme équi-profondeur)
+        """
+        statistics = snapshot.statistics.get(self.column)
+        if statistics is not None:
+            return statistics.estimate_range(self.low, self.high)
+        return float(len(snapshot))
+
+    def _in_range(self, cents: np.ndarray) -> np.ndarray:
+        """
+        Évalue l'intervalle sur des montants.
+
+        Parameters
+        ----------
+        cents : np.ndarray
+            Montants en centimes
+
+        Returns
+        -------
+        np.ndarray
+            Masque booléen
+        """
+        in_range = np.ones(len(cents), dtype=bool)
+        if self.low is not None:
+            in_range &= cents >= self.low
+        if self.high is not None:
+            in_range &= cents <= self.high
+        return in_range
+
+    def evaluate(
+        self, snapshot: DatasetSnapshot
+    ) -> Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Évalue l'intervalle sur la colonne complète.
+
+        Un intervalle étroit est une tranche contiguë de l'index trié ; un
+        intervalle large est évalué par parcours vectorisé de la colonne.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+
+        Returns
+        -------
+        Tuple[str, Optional[np.ndarray], Optional[np.ndarray]]
+            Chemin d'accès et positions
+        """
+        amount_index = snapshot.amount_index
+        if amount_index is not None:
+            start, stop = amount_index.bounds(self.low, self.high)
+            if stop - start <= len(snapshot) * RANGE_SCAN_THRESHOLD:
+                return "sorted-index", amount_index.positions(self.low, self.high), None
+        cents = snapshot.column(self.column).to_numpy()
+        positions = _scan(len(cents), lambda chunk: self._in_range(cents[chunk]))
+        return "scan", positions, None
+
+    def test(self, snapshot: DatasetSnapshot, positions: np.ndarray) -> np.ndarray:
+        """
+        Teste l'intervalle sur des lignes candidates.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+        positions : np.ndarray
+            Positions croissantes des lignes candidates
+
+        Returns
+        -------
+        np.ndarray
+            Masque booléen aligné sur positions
+        """
+        cents = snapshot.column(self.column).to_numpy()
+        return self._in_range(cents[positions])
+
+
+class QueryPlanner:
+    """
+    Planificateur et exécuteur des recherches de transactions.
+
+    Les prédicats sont triés par nombre de lignes estimé croissant. Le
+    premier est évalué sur la colonne complète ; les bitmaps denses des
+    suivants sont combinés par ET logique tant que le résultat reste un
+    bitmap, les autres prédicats sont testés sur les positions survivantes.
+    """
+
+    def __init__(self, snapshot: DatasetSnapshot) -> None:
+        """
+        Initialise le planificateur.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+        """
+        self.snapshot = snapshot
+
+    def plan(self, predicates: List[Predicate]) -> List[Tuple[Predicate, float]]:
+        """
+        Ordonne les prédicats par sélectivité estimée.
+
+        Parameters
+        ----------
+        predicates : List[Predicate]
+            Prédicats de la recherche
+
+        Returns
+        -------
+        List[Tuple[Predicate, float]]
+            Prédicats et estimations, du plus sélectif au moins sélectif
+        """
+        estimated = [
+            (predicate, predicate.estimate(self.snapshot)) for predicate in predicates
+        ]
+        return sorted(estimated, key=lambda item: item[1])
+
+    def execute(
+        self, planned: List[Tuple[Predicate, float]]
+    ) -> Tuple[Selection, List[QueryStage]]:
+        """
+        Exécute un plan et mesure chacune de ses étapes.
+
+        Parameters
+        ----------
+        planned : List[Tuple[Predicate, float]]
+            Plan retourné par plan()
+
+        Returns
+        -------
+        Tuple[Selection, List[QueryStage]]
+            Lignes sélectionnées et étapes exécutées
+        """
+        snapshot = self.snapshot
+        size = len(snapshot)
+        positions: Optional[np.ndarray] = None
+        bitmap: Optional[np.ndarray] = None
+        owned = False
+        selection = Selection(size)
+        stages: List[QueryStage] = []
+
+        for step, (predicate, estimate) in enumerate(planned):
+            check_deadline()
+            started = time.perf_counter()
+            dense = predicate.dense_bitmap(snapshot) if bitmap is not None else None
+            if step == 0:
+                access_path, positions, bitmap = predicate.evaluate(snapshot)
+            elif bitmap is not None and dense is not None:
+                if not owned:
+                    bitmap = bitmap.copy()
+                    owned = True
+                np.bitwise_and(bitmap, dense, out=bitmap)
+                access_path = "bitmap-and"
+            else:
+                if positions is None and bitmap is not None:
+                    positions = to_positions(bitmap, size)
+                    bitmap = None
+                if positions is not None:
+                    positions = positions[predicate.test(snapshot, positions)]
+                access_path = "filter"
+            selection = Selection(size, positions=positions, bitmap=bitmap)
+            stages.append(
+                QueryStage(
+                    predicate=predicate.describe(),
+                    access_path=access_path,
+                    estimated_rows=int(round(estimate)),
+                    output_rows=selection.total,
+                    elapsed_ms=_elapsed_ms(started),
+                )
+            )
+
+        return selection, stages
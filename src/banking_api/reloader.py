@@ -0,0 +1,161 @@
+"""
+Rechargement à chaud du fichier de données.
+
+Un thread surveille la date de modification et la taille du fichier CSV
+(settings.DATA_PATH). Lorsqu'un changement est détecté et que le fichier
+est stable (inchangé depuis la vérification précédente, pour ne pas lire
+un fichier en cours d'écriture), le dataset est rechargé par
+DataManager.reload() et publié atomiquement, sans redémarrer le serveur.
+Le rechargement peut aussi être demandé par l'endpoint d'administration
+POST /api/system/reload.
+"""
+
+import logging
+import os
+import threading
+from typing import Optional, Tuple
+
+from banking_api.config import settings
+from banking_api.data_manager import DatasetSnapshot, data_manager
+
+logger = logging.getLogger(__name__)
+
+# Signature d'un fichier : (date de modification en ns, taille en octets)
+Signature = Tuple[int, int]
+
+
+def file_signature(file_path: str) -> Optional[Signature]:
+    """
+    Calcule la signature d'un fichier.
+
+    Parameters
+    ----------
+    file_path : str
+        Chemin du fichier
+
+    Returns
+    -------
+    Optional[Signature]
+        Date de modification et taille, ou None si le fichier n'existe pas
+    """
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class DatasetReloader:
+    """
+    Surveille le fichier de données et le recharge lorsqu'il change.
+
+    Attributes
+    ----------
+    interval : float
+        Intervalle entre deux vérifications (secondes)
+    """
+
+    def __init__(self, interval: float) -> None:
+        """
+        Initialise la surveillance.
+
+        Parameters
+        ----------
+        interval : float
+            Intervalle entre deux vérifications (secondes)
+        """
+        self.interval = interval
+        self._path: Optional[str] = None
+        self._loaded: Optional[Signature] = None
+        self._seen: Optional[Signature] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, file_path: str) -> None:
+        """
+        Démarre la surveillance d'un fichier déjà chargé.
+
+        Sans intervalle (RELOAD_INTERVAL à 0), le fichier est seulement
+        mémorisé pour les rechargements demandés explicitement.
+
+        Parameters
+        ----------
+        file_path : str
+            Chemin du fichier CSV
+        """
+        self._path = file_path
+        self._loaded = self._seen = file_signature(file_path)
+        if self._thread is not None or self.interval <= 0:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="dataset-watcher", daemon=True
+        )
+        self._thread.start()
+        logger.info(f"Watching {file_path} every {self.interval}s")
+
+    def stop(self) -> None:
+        """Arrête la surveillance."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(self.interval + 1)
+            self._thread = None
+
+    def poll(self) -> bool:
+        """
+        Vérifie le fichier et le recharge s'il a changé et est stable.
+
+        Returns
+        -------
+        bool
+            True si une nouvelle version a été publiée
+        """
+        if self._path is None:
+            return False
+        signature = file_signature(self._path)
+        stable = signature == self._seen
+        self._seen = signature
+        if signature is None or signature == self._loaded or not stable:
+            return False
+        try:
+            self.reload()
+        except Exception as e:
+            # Un fichier invalide n'est pas relu tant qu'il ne change pas
+            self._loaded = signature
+            logger.error(f"Error reloading data: {str(e)}")
+            return False
+        return True
+
+    def reload(self) -> DatasetSnapshot:
+        """
+        Recharge le fichier de données et mémorise sa signature.
+
+        Returns
+        -------
+        DatasetSnapshot
+            Instantané publié
+
+        Raises
+        ------
+        RuntimeError
+            Si aucun fichier n'a été chargé
+        FileNotFoundError
+            Si le fichier n'existe plus
+        ValueError
+            Si le fichier est invalide
+        """
+        # Signature lue avant la lecture : une écriture concurrente sera
+        # détectée à la vérification suivante
+        signature = file_signature(self._path) if self._path else None
+        snapshot = data_manager.reload()
+        self._loaded = self._seen = signature
+        return snapshot
+
+    def _run(self) -> None:
+        """Boucle de surveillance."""
+        while not self._stop.wait(self.interval):
+            self.poll()
+
+
+# Instance globale de la surveillance
+dataset_reloader: DatasetReloader = DatasetReloader(settings.RELOAD_INTERVAL)
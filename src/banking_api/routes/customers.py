@@ -5,9 +5,19 @@ Ce module définit les endpoints FastAPI pour explorer
 les profils et portefeuilles des clients.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Dict, Any, Optional
+from banking_api.admission import admit
+from banking_api.data_manager import SnapshotExpiredError
+from banking_api.deadline import (
+    QueryBudget,
+    QueryCancelledError,
+    QueryTimeoutError,
+    query_budget,
+)
+from banking_api.executor import compute_pool
 from banking_api.models import Customer, CustomerListResponse, ErrorResponse
+from banking_api.pagination import InvalidCursorError
 from banking_api.services.customer_service import CustomerService
 
 router = APIRouter(prefix="/api/customers", tags=["Customers"])
@@ -15,14 +25,21 @@ router = APIRouter(prefix="/api/customers", tags=["Customers"])
 
 @router.get(
     "",
+    dependencies=[Depends(admit("analytics"))],
     response_model=CustomerListResponse,
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        400: {"model": ErrorResponse},
+        410: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Liste des clients",
     description="Liste paginée des clients",
 )
 async def get_customers(
     skip: int = Query(0, ge=0, description="Nombre d'éléments à ignorer"),
     limit: int = Query(100, ge=1, le=1000, description="Éléments par page"),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante"),
 ) -> CustomerListResponse:
     """
     Liste paginée des clients.
@@ -33,6 +50,8 @@ async def get_customers(
         Nombre d'éléments à ignorer
     limit : int
         Éléments par page
+    cursor : Optional[str]
+        Curseur retourné par la page précédente (next_cursor)
 
     Returns
     -------
@@ -46,20 +65,32 @@ async def get_customers(
     """
     try:
         page = (skip // limit) + 1
-        return CustomerService.get_customers(page, limit)
+        return await compute_pool.run(
+            CustomerService.get_customers, page, limit, offset=skip, cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SnapshotExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get(
     "/top",
+    dependencies=[Depends(admit("analytics"))],
     response_model=List[Dict[str, Any]],
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
+    },
     summary="Top clients",
     description="Clients avec le plus grand volume de transactions",
 )
 async def get_top_customers(
-    limit: int = Query(10, ge=1, le=100, description="Nombre de clients")
+    limit: int = Query(10, ge=1, le=100, description="Nombre de clients"),
+    budget: QueryBudget = Depends(query_budget),
 ) -> List[Dict[str, Any]]:
     """
     Top clients par volume de transactions.
@@ -68,6 +99,8 @@ async def get_top_customers(
     ----------
     limit : int
         Nombre de clients à retourner
+    budget : QueryBudget
+        Budget de temps de la requête (en-tête X-Query-Timeout-Ms)
 
     Returns
     -------
@@ -80,19 +113,28 @@ async def get_top_customers(
         Si une erreur se produit
     """
     try:
-        top_customers = CustomerService.get_top_customers(limit)
+        top_customers = await budget.run(CustomerService.get_top_customers, limit)
         return [
             {"customer_id": cust_id, "total_amount": amount}
             for cust_id, amount in top_customers
         ]
+    except QueryTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except QueryCancelledError as e:
+        raise HTTPException(status_code=499, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get(
     "/{customer_id}",
+    dependencies=[Depends(admit("analytics"))],
     response_model=Customer,
-    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    responses={
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Profil client",
     description="Profil détaillé d'un client",
 )
@@ -116,7 +158,9 @@ async def get_customer_profile(customer_id: int) -> Customer:
         Si le client n'est pas trouvé
     """
     try:
-        customer = CustomerService.get_customer_profile(customer_id)
+        customer = await compute_pool.run(
+            CustomerService.get_customer_profile, customer_id
+        )
         if customer is None:
             raise HTTPException(status_code=404, detail="Customer not found")
         return customer
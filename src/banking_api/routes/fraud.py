@@ -5,8 +5,9 @@ Ce module définit les endpoints FastAPI pour l'analyse
 et la prédiction de fraude.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from typing import List
+from banking_api.admission import admit
 from banking_api.models import (
     FraudSummary,
     FraudByType,
@@ -21,8 +22,12 @@ router = APIRouter(prefix="/api/fraud", tags=["Fraud Detection"])
 
 @router.get(
     "/summary",
+    dependencies=[Depends(admit("analytics"))],
     response_model=FraudSummary,
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Résumé des fraudes",
     description="Vue d'ensemble des statistiques de fraude",
 )
@@ -48,8 +53,12 @@ async def get_fraud_summary() -> FraudSummary:
 
 @router.get(
     "/by-merchant",
+    dependencies=[Depends(admit("analytics"))],
     response_model=List[FraudByType],
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Fraude par mode",
     description="Taux de transactions suspectes par mode (Swipe/Chip/Online)",
 )
@@ -75,8 +84,12 @@ async def get_fraud_by_type() -> List[FraudByType]:
 
 @router.post(
     "/predict",
+    dependencies=[Depends(admit("lookup"))],
     response_model=FraudPredictionResponse,
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Prédiction de fraude",
     description="Prédit si une transaction est frauduleuse",
 )
@@ -5,8 +5,9 @@ Ce module définit les endpoints FastAPI pour consulter
 les statistiques et agrégations sur les transactions.
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List
+from banking_api.admission import admit
 from banking_api.models import (
     StatsOverview,
     AmountDistribution,
@@ -14,6 +15,12 @@ from banking_api.models import (
     DailyStats,
     ErrorResponse,
 )
+from banking_api.deadline import (
+    QueryBudget,
+    QueryCancelledError,
+    QueryTimeoutError,
+    query_budget,
+)
 from banking_api.services.stats_service import StatsService
 
 router = APIRouter(prefix="/api/stats", tags=["Statistics"])
@@ -21,8 +28,12 @@ router = APIRouter(prefix="/api/stats", tags=["Statistics"])
 
 @router.get(
     "/overview",
+    dependencies=[Depends(admit("analytics"))],
     response_model=StatsOverview,
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Statistiques globales",
     description="Vue d'ensemble des statistiques du dataset",
 )
@@ -48,13 +59,19 @@ async def get_overview() -> StatsOverview:
 
 @router.get(
     "/amount-distribution",
+    dependencies=[Depends(admit("analytics"))],
     response_model=AmountDistribution,
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
+    },
     summary="Distribution des montants",
     description="Histogramme des montants de transactions",
 )
 async def get_amount_distribution(
-    bins: int = Query(10, ge=5, le=50, description="Nombre de classes")
+    bins: int = Query(10, ge=5, le=50, description="Nombre de classes"),
+    budget: QueryBudget = Depends(query_budget),
 ) -> AmountDistribution:
     """
     Distribution des montants de transactions.
@@ -63,6 +80,8 @@ async def get_amount_distribution(
     ----------
     bins : int
         Nombre de classes pour l'histogramme
+    budget : QueryBudget
+        Budget de temps de la requête (en-tête X-Query-Timeout-Ms)
 
     Returns
     -------
@@ -75,15 +94,23 @@ async def get_amount_distribution(
         Si une erreur se produit
     """
     try:
-        return StatsService.get_amount_distribution(bins)
+        return await budget.run(StatsService.get_amount_distribution, bins)
+    except QueryTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except QueryCancelledError as e:
+        raise HTTPException(status_code=499, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get(
     "/by-chip",
+    dependencies=[Depends(admit("analytics"))],
     response_model=List[StatsByType],
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Statistiques par mode",
     description="Statistiques agrégées par mode de transaction (Swipe/Chip/Online)",
 )
@@ -109,8 +136,12 @@ async def get_stats_by_type() -> List[StatsByType]:
 
 @router.get(
     "/daily",
+    dependencies=[Depends(admit("analytics"))],
     response_model=List[DailyStats],
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Statistiques quotidiennes",
     description="Statistiques agrégées par jour (step)",
 )
@@ -5,13 +5,49 @@ Ce module définit les endpoints FastAPI pour la supervision
 et les métadonnées du système.
 """
 
-from fastapi import APIRouter, HTTPException
-from banking_api.models import SystemHealth, SystemMetadata, ErrorResponse
+import secrets
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from banking_api.config import settings
+from banking_api.executor import compute_pool
+from banking_api.models import (
+    ReloadResult,
+    SystemHealth,
+    SystemMetadata,
+    SystemMetrics,
+    ErrorResponse,
+)
 from banking_api.services.system_service import SystemService
 
 router = APIRouter(prefix="/api/system", tags=["System"])
 
 
+def require_admin(
+    x_admin_token: Optional[str] = Header(None, description="Jeton d'administration"),
+) -> None:
+    """
+    Dépendance FastAPI réservant un endpoint aux administrateurs.
+
+    Parameters
+    ----------
+    x_admin_token : Optional[str]
+        Jeton transmis dans l'en-tête X-Admin-Token
+
+    Raises
+    ------
+    HTTPException
+        403 si les endpoints d'administration sont désactivés (ADMIN_TOKEN
+        vide) ou si le jeton est invalide
+    """
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token is None or not secrets.compare_digest(
+        x_admin_token.encode(), settings.ADMIN_TOKEN.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
 @router.get(
     "/health",
     response_model=SystemHealth,
@@ -64,3 +100,71 @@ async def get_metadata() -> SystemMetadata:
         return SystemService.get_metadata()
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get(
+    "/metrics",
+    response_model=SystemMetrics,
+    responses={500: {"model": ErrorResponse}},
+    summary="Métriques",
+    description="Compteurs du cache des réponses et du regroupement des calculs",
+)
+async def get_metrics() -> SystemMetrics:
+    """
+    Métriques de fonctionnement du système.
+
+    Returns
+    -------
+    SystemMetrics
+        Version du dataset, compteurs du cache des réponses et du
+        regroupement des calculs
+
+    Raises
+    ------
+    HTTPException
+        Si une erreur se produit
+    """
+    try:
+        return SystemService.get_metrics()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/reload",
+    response_model=ReloadResult,
+    dependencies=[Depends(require_admin)],
+    responses={
+        403: {"model": ErrorResponse},
+        409: {"model": ErrorResponse},
+        422: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="Rechargement des données",
+    description="Relit le fichier de données et publie une nouvelle version",
+)
+async def reload_dataset() -> ReloadResult:
+    """
+    Recharge le dataset sans redémarrer le serveur.
+
+    Les requêtes en cours continuent d'utiliser la version précédente.
+
+    Returns
+    -------
+    ReloadResult
+        Version publiée, nombre d'enregistrements et durée
+
+    Raises
+    ------
+    HTTPException
+        409 si aucun fichier n'a été chargé, 422 si le fichier est absent
+        ou invalide (la version courante reste publiée)
+    """
+    try:
+        return await compute_pool.run(SystemService.reload_dataset)
+    except (FileNotFoundError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -5,23 +5,78 @@ Ce module définit les endpoints FastAPI pour consulter,
 filtrer et rechercher des transactions bancaires.
 """
 
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, List
+from fastapi import APIRouter, Body, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
+from typing import Any, Dict, Literal, Optional, List, Union
+from banking_api.admission import admit
+from banking_api.config import settings
 from banking_api.models import (
+    ColumnarTransactionResponse,
+    IngestResult,
     Transaction,
     TransactionResponse,
     TransactionSearchRequest,
     ErrorResponse,
 )
+from banking_api.data_manager import SnapshotExpiredError, data_manager
+from banking_api.deadline import (
+    QueryBudget,
+    QueryCancelledError,
+    QueryTimeoutError,
+    query_budget,
+)
+from banking_api.executor import compute_pool
+from banking_api.ingestion import DuplicateTransactionError
+from banking_api.pagination import InvalidCursorError, fingerprint
+from banking_api.serialization import (
+    MEDIA_TYPES,
+    FormatUnavailableError,
+    ORJSONResponse,
+    UnknownFieldError,
+    negotiate,
+    parse_fields,
+)
+from banking_api.services.response_cache import CachedResponse, response_cache
 from banking_api.services.transactions_service import TransactionsService
 
 router = APIRouter(prefix="/api/transactions", tags=["Transactions"])
 
+# Formats binaires proposés en plus de JSON par les listes de transactions
+BINARY_CONTENT: Dict[str, Dict[str, Any]] = {
+    MEDIA_TYPES["arrow"]: {},
+    MEDIA_TYPES["parquet"]: {},
+}
+
+# Réponses 200 des listes : JSON par transaction (layout=rows), JSON par
+# champ (layout=columnar) ou format binaire
+PAGE_RESPONSE: Dict[str, Any] = {
+    "model": Union[TransactionResponse, ColumnarTransactionResponse],
+    "content": BINARY_CONTENT,
+}
+LIST_RESPONSE: Dict[str, Any] = {
+    "model": Union[List[Transaction], Dict[str, List[Any]]],
+    "content": BINARY_CONTENT,
+}
+
+# Format de réponse demandé explicitement
+ResponseFormat = Optional[Literal["json", "arrow", "parquet"]]
+
+# Disposition des transactions dans une réponse JSON
+ResponseLayout = Literal["rows", "columnar"]
+
 
 @router.get(
     "",
-    response_model=TransactionResponse,
-    responses={500: {"model": ErrorResponse}},
+    dependencies=[Depends(admit("search"))],
+    responses={
+        200: PAGE_RESPONSE,
+        400: {"model": ErrorResponse},
+        406: {"model": ErrorResponse},
+        410: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
+    },
     summary="Liste des transactions",
     description="Récupère une liste paginée de transactions avec filtres optionnels",
 )
@@ -32,7 +87,13 @@ async def get_transactions(
     merchant_state: Optional[str] = Query(None, description="État du commerçant"),
     min_amount: Optional[float] = Query(None, description="Montant minimum"),
     max_amount: Optional[float] = Query(None, description="Montant maximum"),
-) -> TransactionResponse:
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante"),
+    format: ResponseFormat = Query(None, description="Format de réponse"),
+    accept: Optional[str] = Header(None, description="Types de contenu acceptés"),
+    fields: Optional[str] = Query(None, description="Champs à inclure (ex: id,amount)"),
+    layout: ResponseLayout = Query("rows", description="Disposition des transactions"),
+    budget: QueryBudget = Depends(query_budget),
+) -> Response:
     """
     Liste paginée des transactions.
 
@@ -50,10 +111,22 @@ async def get_transactions(
         Montant minimum
     max_amount : Optional[float]
         Montant maximum
+    cursor : Optional[str]
+        Curseur retourné par la page précédente (next_cursor)
+    format : ResponseFormat
+        Format de réponse : json, arrow (Arrow IPC) ou parquet
+    accept : Optional[str]
+        En-tête Accept, utilisé en l'absence du paramètre format
+    fields : Optional[str]
+        Champs à inclure, séparés par des virgules (défaut: tous)
+    layout : ResponseLayout
+        "rows" (un objet par transaction) ou "columnar" (un tableau par champ)
+    budget : QueryBudget
+        Budget de temps de la requête (en-tête X-Query-Timeout-Ms)
 
     Returns
     -------
-    TransactionResponse
+    Response
         Liste paginée de transactions
 
     Raises
@@ -63,22 +136,51 @@ async def get_transactions(
     """
     try:
         page = (skip // limit) + 1
-        return TransactionsService.get_transactions(
-            page=page,
-            limit=limit,
-            use_chip=use_chip,
-            merchant_state=merchant_state,
-            min_amount=min_amount,
-            max_amount=max_amount,
-        )
+        response_format = negotiate(format, accept)
+        projection = parse_fields(fields)
+
+        def render() -> Response:
+            transactions_page = TransactionsService.get_transactions_page(
+                page=page,
+                limit=limit,
+                use_chip=use_chip,
+                merchant_state=merchant_state,
+                min_amount=min_amount,
+                max_amount=max_amount,
+                offset=skip,
+                cursor=cursor,
+            )
+            return transactions_page.render(response_format, projection, layout)
+
+        return await budget.run(render)
+    except FormatUnavailableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except UnknownFieldError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SnapshotExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except QueryTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except QueryCancelledError as e:
+        raise HTTPException(status_code=499, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.post(
     "/search",
-    response_model=TransactionResponse,
-    responses={500: {"model": ErrorResponse}},
+    dependencies=[Depends(admit("search"))],
+    responses={
+        200: PAGE_RESPONSE,
+        400: {"model": ErrorResponse},
+        406: {"model": ErrorResponse},
+        410: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+        504: {"model": ErrorResponse},
+    },
     summary="Recherche multicritère",
     description="Recherche des transactions selon plusieurs critères",
 )
@@ -86,7 +188,14 @@ async def search_transactions(
     search_request: TransactionSearchRequest,
     skip: int = Query(0, ge=0, description="Nombre d'éléments à ignorer"),
     limit: int = Query(100, ge=1, le=1000, description="Éléments par page"),
-) -> TransactionResponse:
+    explain: bool = Query(False, description="Inclure le plan d'exécution"),
+    cursor: Optional[str] = Query(None, description="Curseur de la page suivante"),
+    format: ResponseFormat = Query(None, description="Format de réponse"),
+    accept: Optional[str] = Header(None, description="Types de contenu acceptés"),
+    fields: Optional[str] = Query(None, description="Champs à inclure (ex: id,amount)"),
+    layout: ResponseLayout = Query("rows", description="Disposition des transactions"),
+    budget: QueryBudget = Depends(query_budget),
+) -> Response:
     """
     Recherche multicritère de transactions.
 
@@ -98,10 +207,24 @@ async def search_transactions(
         Nombre d'éléments à ignorer
     limit : int
         Éléments par page
+    explain : bool
+        Inclure le plan d'exécution et les durées de chaque étape
+    cursor : Optional[str]
+        Curseur retourné par la page précédente (next_cursor)
+    format : ResponseFormat
+        Format de réponse : json, arrow (Arrow IPC) ou parquet
+    accept : Optional[str]
+        En-tête Accept, utilisé en l'absence du paramètre format
+    fields : Optional[str]
+        Champs à inclure, séparés par des virgules (défaut: tous)
+    layout : ResponseLayout
+        "rows" (un objet par transaction) ou "columnar" (un tableau par champ)
+    budget : QueryBudget
+        Budget de temps de la requête (en-tête X-Query-Timeout-Ms)
 
     Returns
     -------
-    TransactionResponse
+    Response
         Résultats paginés
 
     Raises
@@ -111,15 +234,118 @@ async def search_transactions(
     """
     try:
         page = (skip // limit) + 1
-        return TransactionsService.search_transactions(search_request, page, limit)
+        response_format = negotiate(format, accept)
+        projection = parse_fields(fields)
+
+        def render() -> Response:
+            transactions_page = TransactionsService.search_transactions_page(
+                search_request, page, limit, explain=explain, offset=skip, cursor=cursor
+            )
+            return transactions_page.render(response_format, projection, layout)
+
+        if explain:
+            # Les durées du plan d'exécution ne sont pas réutilisables
+            return await budget.run(render)
+        key = (
+            "search",
+            fingerprint("search", search_request.model_dump()),
+            skip,
+            limit,
+            cursor,
+            response_format,
+            tuple(projection) if projection is not None else None,
+            layout,
+        )
+        # La réponse est calculée sur la vue dont l'état indexe le cache,
+        # même si le dataset est modifié entre-temps
+        with data_manager.pinned() as view:
+            cached: CachedResponse = await budget.run(
+                response_cache.get_or_compute,
+                view.state,
+                key,
+                lambda: CachedResponse.from_response(render()),
+                lambda response: response.nbytes,
+            )
+        return cached.to_response()
+    except FormatUnavailableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except UnknownFieldError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except SnapshotExpiredError as e:
+        raise HTTPException(status_code=410, detail=str(e))
+    except QueryTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e))
+    except QueryCancelledError as e:
+        raise HTTPException(status_code=499, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# Type de contenu de chaque format d'export
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.post(
+    "/export",
+    dependencies=[Depends(admit("search"))],
+    response_class=StreamingResponse,
+    responses={
+        200: {"content": {media: {} for media in EXPORT_MEDIA_TYPES.values()}},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
+    summary="Export des résultats",
+    description="Exporte en flux les transactions d'une recherche (NDJSON ou CSV)",
+)
+async def export_transactions(
+    search_request: TransactionSearchRequest,
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Format d'export"),
+) -> StreamingResponse:
+    """
+    Export en flux des résultats d'une recherche.
+
+    Parameters
+    ----------
+    search_request : TransactionSearchRequest
+        Critères de recherche
+    format : Literal["ndjson", "csv"]
+        Format d'export
+
+    Returns
+    -------
+    StreamingResponse
+        Transactions encodées, transmises par blocs
+
+    Raises
+    ------
+    HTTPException
+        Si une erreur se produit
+    """
+    try:
+        chunks = await compute_pool.run(
+            TransactionsService.export_transactions, search_request, format
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="transactions.{format}"'
+        },
+    )
 
 
 @router.get(
     "/types",
+    dependencies=[Depends(admit("lookup"))],
     response_model=List[str],
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Types de transactions",
     description="Liste des types de transactions disponibles",
 )
@@ -145,14 +371,18 @@ async def get_transaction_types() -> List[str]:
 
 @router.get(
     "/recent",
+    dependencies=[Depends(admit("search"))],
     response_model=List[Transaction],
-    responses={500: {"model": ErrorResponse}},
+    responses={
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Transactions récentes",
     description="Récupère les N dernières transactions",
 )
 async def get_recent_transactions(
     limit: int = Query(10, ge=1, le=100, description="Nombre de transactions")
-) -> List[Transaction]:
+) -> ORJSONResponse:
     """
     Transactions récentes.
 
@@ -163,8 +393,8 @@ async def get_recent_transactions(
 
     Returns
     -------
-    List[Transaction]
-        Dernières transactions
+    ORJSONResponse
+        Dernières transactions (JSON)
 
     Raises
     ------
@@ -172,22 +402,35 @@ async def get_recent_transactions(
         Si une erreur se produit
     """
     try:
-        return TransactionsService.get_recent_transactions(limit)
+        transactions_page = await compute_pool.run(
+            TransactionsService.get_recent_transactions_page, limit
+        )
+        return ORJSONResponse(transactions_page.to_json())
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get(
     "/by-customer",
-    response_model=List[Transaction],
-    responses={500: {"model": ErrorResponse}},
+    dependencies=[Depends(admit("search"))],
+    responses={
+        200: LIST_RESPONSE,
+        400: {"model": ErrorResponse},
+        406: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Transactions par client",
     description="Liste des transactions émises par un client",
 )
 async def get_transactions_by_customer(
     client_id: int = Query(..., description="Identifiant du client"),
     limit: int = Query(100, ge=1, le=1000, description="Nombre maximum de transactions"),
-) -> List[Transaction]:
+    format: ResponseFormat = Query(None, description="Format de réponse"),
+    accept: Optional[str] = Header(None, description="Types de contenu acceptés"),
+    fields: Optional[str] = Query(None, description="Champs à inclure (ex: id,amount)"),
+    layout: ResponseLayout = Query("rows", description="Disposition des transactions"),
+) -> Response:
     """
     Transactions émises par un client.
 
@@ -197,10 +440,18 @@ async def get_transactions_by_customer(
         Identifiant du client
     limit : int
         Nombre maximum de résultats
+    format : ResponseFormat
+        Format de réponse : json, arrow (Arrow IPC) ou parquet
+    accept : Optional[str]
+        En-tête Accept, utilisé en l'absence du paramètre format
+    fields : Optional[str]
+        Champs à inclure, séparés par des virgules (défaut: tous)
+    layout : ResponseLayout
+        "rows" (un objet par transaction) ou "columnar" (un tableau par champ)
 
     Returns
     -------
-    List[Transaction]
+    Response
         Liste des transactions
 
     Raises
@@ -209,22 +460,45 @@ async def get_transactions_by_customer(
         Si une erreur se produit
     """
     try:
-        return TransactionsService.get_transactions_by_customer(str(client_id), limit)
+        response_format = negotiate(format, accept)
+        projection = parse_fields(fields)
+
+        def render() -> Response:
+            transactions_page = TransactionsService.get_transactions_by_customer_page(
+                str(client_id), limit
+            )
+            return transactions_page.render(response_format, projection, layout)
+
+        return await compute_pool.run(render)
+    except FormatUnavailableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except UnknownFieldError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get(
     "/to-merchant",
-    response_model=List[Transaction],
-    responses={500: {"model": ErrorResponse}},
+    dependencies=[Depends(admit("search"))],
+    responses={
+        200: LIST_RESPONSE,
+        400: {"model": ErrorResponse},
+        406: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Transactions vers un commerçant",
     description="Liste des transactions vers un commerçant",
 )
 async def get_transactions_to_merchant(
     merchant_id: int = Query(..., description="Identifiant du commerçant"),
     limit: int = Query(100, ge=1, le=1000, description="Nombre maximum de transactions"),
-) -> List[Transaction]:
+    format: ResponseFormat = Query(None, description="Format de réponse"),
+    accept: Optional[str] = Header(None, description="Types de contenu acceptés"),
+    fields: Optional[str] = Query(None, description="Champs à inclure (ex: id,amount)"),
+    layout: ResponseLayout = Query("rows", description="Disposition des transactions"),
+) -> Response:
     """
     Transactions vers un commerçant.
 
@@ -234,10 +508,18 @@ async def get_transactions_to_merchant(
         Identifiant du commerçant
     limit : int
         Nombre maximum de résultats
+    format : ResponseFormat
+        Format de réponse : json, arrow (Arrow IPC) ou parquet
+    accept : Optional[str]
+        En-tête Accept, utilisé en l'absence du paramètre format
+    fields : Optional[str]
+        Champs à inclure, séparés par des virgules (défaut: tous)
+    layout : ResponseLayout
+        "rows" (un objet par transaction) ou "columnar" (un tableau par champ)
 
     Returns
     -------
-    List[Transaction]
+    Response
         Liste des transactions
 
     Raises
@@ -246,15 +528,121 @@ async def get_transactions_to_merchant(
         Si une erreur se produit
     """
     try:
-        return TransactionsService.get_transactions_to_merchant(str(merchant_id), limit)
+        response_format = negotiate(format, accept)
+        projection = parse_fields(fields)
+
+        def render() -> Response:
+            transactions_page = TransactionsService.get_transactions_to_merchant_page(
+                str(merchant_id), limit
+            )
+            return transactions_page.render(response_format, projection, layout)
+
+        return await compute_pool.run(render)
+    except FormatUnavailableError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+    except UnknownFieldError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "",
+    status_code=202,
+    response_model=IngestResult,
+    responses={
+        409: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="Ingérer une transaction",
+    description="Ajoute une transaction, intégrée à la compaction suivante",
+)
+async def ingest_transaction(transaction: Transaction) -> IngestResult:
+    """
+    Ingestion d'une transaction.
+
+    Parameters
+    ----------
+    transaction : Transaction
+        Transaction à ingérer
+
+    Returns
+    -------
+    IngestResult
+        Nombre de transactions acceptées et en attente
+
+    Raises
+    ------
+    HTTPException
+        409 si l'identifiant existe déjà
+    """
+    try:
+        return await compute_pool.run(
+            TransactionsService.ingest_transactions, [transaction]
+        )
+    except DuplicateTransactionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post(
+    "/batch",
+    status_code=202,
+    response_model=IngestResult,
+    responses={
+        409: {"model": ErrorResponse},
+        413: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+    },
+    summary="Ingérer un lot de transactions",
+    description="Ajoute un lot de transactions, accepté ou refusé en entier",
+)
+async def ingest_transactions(
+    transactions: List[Transaction] = Body(..., min_length=1),
+) -> IngestResult:
+    """
+    Ingestion d'un lot de transactions.
+
+    Parameters
+    ----------
+    transactions : List[Transaction]
+        Transactions à ingérer (au plus INGEST_MAX_BATCH)
+
+    Returns
+    -------
+    IngestResult
+        Nombre de transactions acceptées et en attente
+
+    Raises
+    ------
+    HTTPException
+        413 si le lot est trop grand, 409 si un identifiant existe déjà
+    """
+    if len(transactions) > settings.INGEST_MAX_BATCH:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch exceeds {settings.INGEST_MAX_BATCH} transactions",
+        )
+    try:
+        return await compute_pool.run(
+            TransactionsService.ingest_transactions, transactions
+        )
+    except DuplicateTransactionError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get(
     "/{id}",
+    dependencies=[Depends(admit("lookup"))],
     response_model=Transaction,
-    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    responses={
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Détails d'une transaction",
     description="Récupère les détails d'une transaction par son identifiant",
 )
@@ -290,10 +678,15 @@ async def get_transaction_by_id(id: str) -> Transaction:
 
 @router.delete(
     "/{id}",
+    dependencies=[Depends(admit("lookup"))],
     response_model=dict,
-    responses={404: {"model": ErrorResponse}, 500: {"model": ErrorResponse}},
+    responses={
+        404: {"model": ErrorResponse},
+        500: {"model": ErrorResponse},
+        503: {"model": ErrorResponse},
+    },
     summary="Supprimer une transaction",
-    description="Supprime une transaction (mode test uniquement)",
+    description="Supprime une transaction de façon durable (journalisée)",
 )
 async def delete_transaction(id: str) -> dict:
     """
@@ -315,7 +708,8 @@ async def delete_transaction(id: str) -> dict:
         Si la transaction n'est pas trouvée
     """
     try:
-        deleted = TransactionsService.delete_transaction(id)
+        # Attente de la synchronisation du journal hors de la boucle
+        deleted = await compute_pool.run(TransactionsService.delete_transaction, id)
         if not deleted:
             raise HTTPException(status_code=404, detail="Transaction not found")
         return {"message": "Transaction deleted successfully", "id": id}
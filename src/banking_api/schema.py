@@ -0,0 +1,299 @@
+"""
+Schéma typé du dataset des transactions.
+
+Ce module définit la représentation compacte des colonnes en mémoire :
+chaînes à faible cardinalité encodées en catégories, identifiants stockés
+sur l'entier le plus étroit possible et montants en centimes (int64).
+"""
+
+import math
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Facteur de conversion entre montant (float) et centimes (int64)
+AMOUNT_SCALE: int = 100
+
+# Colonne des montants en centimes
+AMOUNT_COLUMN: str = "amount_cents"
+
+# Chaînes à faible cardinalité, encodées en catégories
+CATEGORICAL_COLUMNS: List[str] = [
+    "use_chip",
+    "merchant_city",
+    "merchant_state",
+    "errors",
+]
+
+# Identifiants et codes, stockés sur l'entier signé le plus étroit
+INTEGER_COLUMNS: List[str] = ["client_id", "card_id", "merchant_id", "mcc", "zip"]
+
+_ZERO: int = ord("0")
+_NINE: int = ord("9")
+_MINUS: int = ord("-")
+_DOT: int = ord(".")
+
+
+def to_cents(amount: float) -> int:
+    """
+    Convertit un montant en centimes.
+
+    Parameters
+    ----------
+    amount : float
+        Montant
+
+    Returns
+    -------
+    int
+        Montant en centimes, arrondi au plus proche
+    """
+    return int(round(amount * AMOUNT_SCALE))
+
+
+def cents_lower_bound(amount: float) -> int:
+    """
+    Convertit une borne inférieure de montant en centimes.
+
+    Parameters
+    ----------
+    amount : float
+        Montant minimum (inclus)
+
+    Returns
+    -------
+    int
+        Plus petit nombre de centimes supérieur ou égal à la borne
+    """
+    return math.ceil(round(amount * AMOUNT_SCALE, 6))
+
+
+def cents_upper_bound(amount: float) -> int:
+    """
+    Convertit une borne supérieure de montant en centimes.
+
+    Parameters
+    ----------
+    amount : float
+        Montant maximum (inclus)
+
+    Returns
+    -------
+    int
+        Plus grand nombre de centimes inférieur ou égal à la borne
+    """
+    return math.floor(round(amount * AMOUNT_SCALE, 6))
+
+
+def parse_amount_cents(values: np.ndarray) -> np.ndarray:
+    """
+    Convertit des montants textuels (ex: "$-77.00") en centimes.
+
+    L'analyse est vectorisée : les chaînes sont vues comme une matrice
+    d'octets et les chiffres sont accumulés colonne par colonne. Les
+    caractères autres que les chiffres, le signe et le point décimal
+    ("$", ",", espaces) sont ignorés ; une valeur manquante vaut 0.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Montants sous forme de chaînes ou de nombres
+
+    Returns
+    -------
+    np.ndarray
+        Montants en centimes (int64)
+    """
+    if values.dtype.kind in "iuf":
+        return np.round(np.nan_to_num(values) * AMOUNT_SCALE).astype(np.int64)
+
+    text = np.where(pd.isna(values), "", values).astype("S")
+    width = text.dtype.itemsize
+    if width == 0 or len(text) == 0:
+        return np.zeros(len(text), dtype=np.int64)
+    chars = text.view(np.uint8).reshape(len(text), width)
+
+    units: np.ndarray = np.zeros(len(text), dtype=np.int64)
+    decimals: np.ndarray = np.zeros(len(text), dtype=np.int64)
+    fraction_digits = np.zeros(len(text), dtype=np.int64)
+    round_up = np.zeros(len(text), dtype=bool)
+    in_fraction = np.zeros(len(text), dtype=bool)
+    negative = np.zeros(len(text), dtype=bool)
+
+    for position in range(width):
+        char = chars[:, position].astype(np.int64)
+        is_digit = (char >= _ZERO) & (char <= _NINE)
+        digit = char - _ZERO
+
+        integer_part = is_digit & ~in_fraction
+        units = np.where(integer_part, units * 10 + digit, units)
+
+        fraction_part = is_digit & in_fraction
+        kept = fraction_part & (fraction_digits < 2)
+        decimals = np.where(kept, decimals * 10 + digit, decimals)
+        round_up |= fraction_part & (fraction_digits == 2) & (digit >= 5)
+        fraction_digits += fraction_part
+
+        negative |= char == _MINUS
+        in_fraction |= char == _DOT
+
+    # Compléter à deux décimales ("12.5" -> 1250)
+    decimals = np.where(fraction_digits == 0, 0, decimals)
+    decimals = np.where(fraction_digits == 1, decimals * 10, decimals)
+    cents = units * AMOUNT_SCALE + decimals + round_up
+    return np.where(negative, -cents, cents)
+
+
+def _narrow_integers(series: pd.Series) -> pd.Series:
+    """
+    Convertit une colonne entière vers le type signé le plus étroit.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Colonne numérique (les valeurs manquantes valent 0)
+
+    Returns
+    -------
+    pd.Series
+        Colonne convertie
+    """
+    values = series.fillna(0).astype(np.int64)
+    return pd.to_numeric(values, downcast="integer")
+
+
+def clean_text(series: pd.Series, name: str) -> pd.Series:
+    """
+    Nettoie une colonne textuelle et l'encode en catégorie.
+
+    Les valeurs manquantes deviennent des chaînes vides ; pour la colonne
+    errors, la chaîne littérale "nan" devient une valeur manquante.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Colonne textuelle (object ou catégorielle)
+    name : str
+        Nom de la colonne
+
+    Returns
+    -------
+    pd.Series
+        Colonne catégorielle nettoyée
+    """
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype("category")
+    if series.hasnans:
+        if "" not in series.cat.categories:
+            series = series.cat.add_categories("")
+        series = series.fillna("")
+    if name == "errors" and "nan" in series.cat.categories:
+        series = series.cat.remove_categories("nan")
+    return series
+
+
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Applique le schéma compact à un DataFrame de transactions.
+
+    La fonction est idempotente et ignore les colonnes absentes : les
+    colonnes déjà catégorielles sont conservées telles quelles.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame brut ou déjà typé
+
+    Returns
+    -------
+    pd.DataFrame
+        Nouveau DataFrame typé
+    """
+    columns: Dict[str, Any] = {}
+    for name in df.columns:
+        series = df[name]
+        if name == "amount":
+            columns[AMOUNT_COLUMN] = parse_amount_cents(series.to_numpy())
+        elif name == "id":
+            columns[name] = series if series.dtype == object else series.astype(str)
+        elif name in INTEGER_COLUMNS:
+            columns[name] = _narrow_integers(series)
+        elif name in CATEGORICAL_COLUMNS:
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = clean_text(series.astype(str).mask(series.isna()), name)
+            columns[name] = series
+        else:
+            columns[name] = series
+    return pd.DataFrame(columns, index=df.index, copy=False)
+
+
+def category_code(series: pd.Series, value: str) -> int:
+    """
+    Retourne le code entier d'une valeur dans une colonne catégorielle.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Colonne catégorielle
+    value : str
+        Valeur recherchée
+
+    Returns
+    -------
+    int
+        Code de la valeur, ou -2 si elle est absente (aucune ligne ne
+        porte ce code, -1 étant réservé aux valeurs manquantes)
+    """
+    categories = series.cat.categories
+    if value not in categories:
+        return -2
+    return int(categories.get_loc(value))
+
+
+def equals(series: pd.Series, value: Any) -> np.ndarray:
+    """
+    Évalue le prédicat d'égalité ``series == value`` sur des entiers.
+
+    Les colonnes catégorielles sont comparées sur leurs codes ; une valeur
+    hors de l'intervalle du type entier ne correspond à aucune ligne.
+
+    Parameters
+    ----------
+    series : pd.Series
+        Colonne catégorielle ou entière
+    value : Any
+        Valeur recherchée
+
+    Returns
+    -------
+    np.ndarray
+        Masque booléen des lignes correspondantes
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+        return np.asarray(codes == category_code(series, str(value)))
+    values = series.to_numpy()
+    if values.dtype.kind in "iu":
+        info = np.iinfo(values.dtype)
+        if not info.min <= value <= info.max:
+            return np.zeros(len(values), dtype=bool)
+        return np.asarray(values == values.dtype.type(value))
+    return np.asarray(values == value)
+
+
+def amounts(df: pd.DataFrame) -> pd.Series:
+    """
+    Retourne les montants en unités monétaires (float).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        DataFrame typé
+
+    Returns
+    -------
+    pd.Series
+        Montants
+    """
+    return (df[AMOUNT_COLUMN] / AMOUNT_SCALE).rename("amount")
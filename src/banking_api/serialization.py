@@ -0,0 +1,635 @@
+"""
+Sérialisation des pages de transactions.
+
+Les lignes du dataset sont déjà typées (voir schema.apply_schema) : une
+page est convertie colonne par colonne en objets Python natifs puis
+encodée en JSON par orjson en une seule passe, sans validation Pydantic
+ligne à ligne.
+
+Les clients analytiques peuvent aussi recevoir les colonnes au format
+Arrow IPC ou Parquet (dépendance optionnelle pyarrow).
+"""
+
+import io
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import orjson
+import pandas as pd
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from banking_api.models import QueryPlan, Transaction, TransactionResponse
+from banking_api.schema import AMOUNT_COLUMN, AMOUNT_SCALE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    pa = None
+    pq = None
+
+# Champs d'une transaction, dans l'ordre du modèle
+TRANSACTION_FIELDS: List[str] = list(Transaction.model_fields)
+
+# Type de contenu de chaque format de réponse
+MEDIA_TYPES: Dict[str, str] = {
+    "json": "application/json",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class FormatUnavailableError(RuntimeError):
+    """Format de réponse demandé mais non disponible sur le serveur."""
+
+
+class UnknownFieldError(ValueError):
+    """Champ de projection qui n'appartient pas au modèle Transaction."""
+
+
+def parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """
+    Analyse un paramètre de projection (ex: "id,date,amount").
+
+    Parameters
+    ----------
+    fields : Optional[str]
+        Champs séparés par des virgules
+
+    Returns
+    -------
+    Optional[List[str]]
+        Champs demandés, sans doublon et dans l'ordre donné (None pour
+        tous les champs)
+
+    Raises
+    ------
+    UnknownFieldError
+        Si un champ n'existe pas
+    """
+    if fields is None or not fields.strip():
+        return None
+    names = list(dict.fromkeys(name.strip() for name in fields.split(",")))
+    names = [name for name in names if name]
+    unknown = [name for name in names if name not in TRANSACTION_FIELDS]
+    if unknown:
+        raise UnknownFieldError(f"Unknown fields: {', '.join(unknown)}")
+    return names
+
+
+def _source_column(name: str) -> str:
+    """
+    Retourne la colonne du dataset qui porte un champ Transaction.
+
+    Parameters
+    ----------
+    name : str
+        Champ du modèle Transaction
+
+    Returns
+    -------
+    str
+        Nom de la colonne typée
+    """
+    return AMOUNT_COLUMN if name == "amount" else name
+
+
+def _column_values(df: pd.DataFrame, name: str) -> List[Any]:
+    """
+    Convertit une colonne typée en liste de valeurs Python natives.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Page de résultats
+    name : str
+        Champ du modèle Transaction
+
+    Returns
+    -------
+    List[Any]
+        Valeurs de la colonne (None pour une colonne absente)
+    """
+    values: List[Any]
+    if name == "amount" and AMOUNT_COLUMN in df.columns:
+        values = (df[AMOUNT_COLUMN].to_numpy() / AMOUNT_SCALE).tolist()
+        return values
+    if name not in df.columns:
+        return [None] * len(df)
+    series = df[name]
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Le code -1 (valeur manquante) désigne le None ajouté en fin
+        labels: List[Any] = series.cat.categories.tolist() + [None]
+        return [labels[code] for code in series.cat.codes.tolist()]
+    values = series.tolist()
+    return values
+
+
+def transaction_rows(
+    df: pd.DataFrame, fields: Optional[List[str]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Convertit une page typée en dictionnaires compatibles Transaction.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Page de résultats
+    fields : Optional[List[str]], optional
+        Champs à inclure (défaut: tous les champs du modèle)
+
+    Returns
+    -------
+    List[Dict[str, Any]]
+        Enregistrements avec montants en float et chaînes natives
+    """
+    names = fields or TRANSACTION_FIELDS
+    columns = [_column_values(df, name) for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def transaction_columns(
+    df: pd.DataFrame, fields: Optional[List[str]] = None
+) -> Dict[str, List[Any]]:
+    """
+    Convertit une page typée en un tableau de valeurs par champ.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Page de résultats
+    fields : Optional[List[str]], optional
+        Champs à inclure (défaut: tous les champs du modèle)
+
+    Returns
+    -------
+    Dict[str, List[Any]]
+        Valeurs de chaque champ, dans l'ordre des lignes
+    """
+    return {name: _column_values(df, name) for name in fields or TRANSACTION_FIELDS}
+
+
+def ndjson_chunk(df: pd.DataFrame) -> bytes:
+    """
+    Encode des lignes typées en NDJSON (une transaction par ligne).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Bloc de lignes
+
+    Returns
+    -------
+    bytes
+        Lignes JSON terminées par un saut de ligne
+    """
+    return b"".join(
+        orjson.dumps(row, option=orjson.OPT_APPEND_NEWLINE)
+        for row in transaction_rows(df)
+    )
+
+
+def csv_chunk(df: pd.DataFrame, header: bool = False) -> bytes:
+    """
+    Encode des lignes typées en CSV, colonnes dans l'ordre du modèle.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Bloc de lignes
+    header : bool, optional
+        Inclure la ligne d'en-tête (défaut: False)
+
+    Returns
+    -------
+    bytes
+        Lignes CSV encodées en UTF-8
+    """
+    columns = {name: _column_values(df, name) for name in TRANSACTION_FIELDS}
+    text: str = pd.DataFrame(columns, columns=TRANSACTION_FIELDS).to_csv(
+        index=False, header=header, lineterminator="\n"
+    )
+    return text.encode("utf-8")
+
+
+def arrow_table(df: pd.DataFrame, fields: Optional[List[str]] = None) -> "pa.Table":
+    """
+    Construit une table Arrow à partir des colonnes typées.
+
+    Les colonnes numériques sont transmises sans conversion, les colonnes
+    catégorielles deviennent des colonnes dictionnaire (codes et libellés).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Lignes à encoder
+    fields : Optional[List[str]], optional
+        Champs à inclure (défaut: tous les champs du modèle)
+
+    Returns
+    -------
+    pa.Table
+        Table Arrow, une colonne par champ
+
+    Raises
+    ------
+    FormatUnavailableError
+        Si pyarrow n'est pas installé
+    """
+    if pa is None:
+        raise FormatUnavailableError("Arrow formats require pyarrow")
+    names = fields or TRANSACTION_FIELDS
+    arrays = []
+    for name in names:
+        if name == "amount" and AMOUNT_COLUMN in df.columns:
+            arrays.append(pa.array(df[AMOUNT_COLUMN].to_numpy() / AMOUNT_SCALE))
+        elif name not in df.columns:
+            arrays.append(pa.nulls(len(df)))
+        elif isinstance(df[name].dtype, pd.CategoricalDtype):
+            series = df[name]
+            codes = series.cat.codes.to_numpy()
+            arrays.append(
+                pa.DictionaryArray.from_arrays(
+                    pa.array(codes, mask=codes < 0),
+                    pa.array(series.cat.categories.to_numpy(dtype=object)),
+                )
+            )
+        else:
+            arrays.append(pa.array(df[name].to_numpy()))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+def arrow_stream(df: pd.DataFrame, fields: Optional[List[str]] = None) -> bytes:
+    """
+    Encode des lignes au format Arrow IPC (flux).
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Lignes à encoder
+    fields : Optional[List[str]], optional
+        Champs à inclure (défaut: tous les champs du modèle)
+
+    Returns
+    -------
+    bytes
+        Flux Arrow IPC
+    """
+    table = arrow_table(df, fields)
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return bytes(sink.getvalue())
+
+
+def parquet_file(df: pd.DataFrame, fields: Optional[List[str]] = None) -> bytes:
+    """
+    Encode des lignes au format Parquet.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Lignes à encoder
+    fields : Optional[List[str]], optional
+        Champs à inclure (défaut: tous les champs du modèle)
+
+    Returns
+    -------
+    bytes
+        Fichier Parquet
+    """
+    table = arrow_table(df, fields)
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer)
+    return buffer.getvalue()
+
+
+def negotiate(format: Optional[str], accept: Optional[str]) -> str:
+    """
+    Choisit le format de réponse.
+
+    Le paramètre format est prioritaire ; à défaut, l'en-tête Accept est
+    comparé aux types de contenu binaires. JSON est le format par défaut.
+
+    Parameters
+    ----------
+    format : Optional[str]
+        Format explicite ("json", "arrow" ou "parquet")
+    accept : Optional[str]
+        En-tête Accept de la requête
+
+    Returns
+    -------
+    str
+        Format retenu
+    """
+    if format is not None:
+        return format
+    for name in ("arrow", "parquet"):
+        if accept and MEDIA_TYPES[name] in accept:
+            return name
+    return "json"
+
+
+def _default(value: Any) -> Any:
+    """
+    Convertit les objets non pris en charge nativement par orjson.
+
+    Parameters
+    ----------
+    value : Any
+        Objet à convertir
+
+    Returns
+    -------
+    Any
+        Représentation sérialisable
+
+    Raises
+    ------
+    TypeError
+        Si l'objet n'est pas sérialisable
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Encode un contenu en JSON avec orjson.
+
+    Parameters
+    ----------
+    content : Any
+        Contenu (types natifs, tableaux NumPy ou modèles Pydantic)
+
+    Returns
+    -------
+    bytes
+        Document JSON
+    """
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class ORJSONResponse(Response):
+    """
+    Réponse JSON encodée par orjson.
+
+    Un contenu déjà encodé (bytes) est transmis tel quel.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """
+        Encode le contenu de la réponse.
+
+        Parameters
+        ----------
+        content : Any
+            Contenu à encoder, ou document JSON déjà encodé
+
+        Returns
+        -------
+        bytes
+            Corps de la réponse
+        """
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+class TransactionPage:
+    """
+    Page de transactions issue du dataset, avant sérialisation.
+
+    Sans numéro de page, la page représente une simple liste de
+    transactions ; sinon une réponse paginée (TransactionResponse).
+
+    Lorsque des positions sont fournies, frame est le dataset complet et
+    l'extraction des lignes est différée jusqu'à l'encodage : seules les
+    colonnes projetées sont alors extraites.
+
+    Attributes
+    ----------
+    frame : pd.DataFrame
+        Lignes de la page, ou dataset complet si positions est fourni
+    positions : Optional[Union[np.ndarray, slice]]
+        Positions des lignes de la page dans frame
+    page : Optional[int]
+        Numéro de page
+    limit : Optional[int]
+        Nombre d'éléments par page
+    total : Optional[int]
+        Nombre total de résultats
+    explain : Optional[QueryPlan]
+        Plan d'exécution de la recherche
+    next_cursor : Optional[str]
+        Curseur de la page suivante
+    """
+
+    def __init__(
+        self,
+        frame: pd.DataFrame,
+        page: Optional[int] = None,
+        limit: Optional[int] = None,
+        total: Optional[int] = None,
+        explain: Optional[QueryPlan] = None,
+        next_cursor: Optional[str] = None,
+        positions: Optional[Union[np.ndarray, slice]] = None,
+    ) -> None:
+        """
+        Initialise la page.
+
+        Parameters
+        ----------
+        frame : pd.DataFrame
+            Lignes de la page, ou dataset complet si positions est fourni
+        page : Optional[int], optional
+            Numéro de page
+        limit : Optional[int], optional
+            Nombre d'éléments par page
+        total : Optional[int], optional
+            Nombre total de résultats
+        explain : Optional[QueryPlan], optional
+            Plan d'exécution de la recherche
+        next_cursor : Optional[str], optional
+            Curseur de la page suivante
+        positions : Optional[Union[np.ndarray, slice]], optional
+            Positions des lignes de la page dans frame
+        """
+        self.frame = frame
+        self.positions = positions
+        self.page = page
+        self.limit = limit
+        self.total = total
+        self.explain = explain
+        self.next_cursor = next_cursor
+
+    def rows(self, fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Extrait les colonnes de la page nécessaires à une projection.
+
+        Parameters
+        ----------
+        fields : Optional[List[str]], optional
+            Champs demandés (défaut: tous les champs du modèle)
+
+        Returns
+        -------
+        pd.DataFrame
+            Lignes de la page, restreintes aux colonnes utiles
+        """
+        index = self.frame.index
+        if self.positions is not None:
+            index = index[self.positions]
+        columns = {}
+        for name in fields or TRANSACTION_FIELDS:
+            column = _source_column(name)
+            if column in self.frame.columns:
+                series = self.frame[column]
+                if self.positions is not None:
+                    series = series.iloc[self.positions]
+                columns[column] = series
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def to_transactions(self) -> List[Transaction]:
+        """
+        Construit les modèles Transaction de la page, sans validation.
+
+        Returns
+        -------
+        List[Transaction]
+            Transactions de la page
+        """
+        return [
+            Transaction.model_construct(**row) for row in transaction_rows(self.rows())
+        ]
+
+    def to_response(self) -> TransactionResponse:
+        """
+        Construit la réponse paginée.
+
+        Returns
+        -------
+        TransactionResponse
+            Réponse paginée
+
+        Raises
+        ------
+        ValueError
+            Si la page n'a pas de métadonnées de pagination
+        """
+        if self.page is None or self.limit is None or self.total is None:
+            raise ValueError("Transaction page has no pagination metadata")
+        return TransactionResponse(
+            page=self.page,
+            limit=self.limit,
+            total=self.total,
+            transactions=self.to_transactions(),
+            explain=self.explain,
+            next_cursor=self.next_cursor,
+        )
+
+    def headers(self) -> Dict[str, str]:
+        """
+        Retourne les métadonnées de pagination sous forme d'en-têtes.
+
+        Utilisé par les formats binaires, qui ne transportent que les
+        lignes.
+
+        Returns
+        -------
+        Dict[str, str]
+            En-têtes X-Page, X-Limit, X-Total-Count et X-Next-Cursor
+        """
+        headers: Dict[str, str] = {}
+        for name, value in (
+            ("X-Page", self.page),
+            ("X-Limit", self.limit),
+            ("X-Total-Count", self.total),
+            ("X-Next-Cursor", self.next_cursor),
+        ):
+            if value is not None:
+                headers[name] = str(value)
+        return headers
+
+    def render(
+        self,
+        format: str = "json",
+        fields: Optional[List[str]] = None,
+        layout: str = "rows",
+    ) -> Response:
+        """
+        Construit la réponse HTTP dans le format demandé.
+
+        Parameters
+        ----------
+        format : str, optional
+            "json", "arrow" ou "parquet" (défaut: "json")
+        fields : Optional[List[str]], optional
+            Champs à inclure (défaut: tous les champs du modèle)
+        layout : str, optional
+            Disposition JSON, "rows" ou "columnar" (défaut: "rows")
+
+        Returns
+        -------
+        Response
+            Réponse encodée
+
+        Raises
+        ------
+        FormatUnavailableError
+            Si un format Arrow est demandé sans pyarrow
+        """
+        if format == "arrow":
+            content = arrow_stream(self.rows(fields), fields)
+        elif format == "parquet":
+            content = parquet_file(self.rows(fields), fields)
+        else:
+            return ORJSONResponse(self.to_json(fields, layout))
+        return Response(
+            content, media_type=MEDIA_TYPES[format], headers=self.headers()
+        )
+
+    def to_json(
+        self, fields: Optional[List[str]] = None, layout: str = "rows"
+    ) -> bytes:
+        """
+        Encode la page en JSON, dans le format du modèle de réponse.
+
+        Avec la disposition "columnar", les transactions sont remplacées
+        par un tableau de valeurs par champ.
+
+        Parameters
+        ----------
+        fields : Optional[List[str]], optional
+            Champs à inclure (défaut: tous les champs du modèle)
+        layout : str, optional
+            "rows" ou "columnar" (défaut: "rows")
+
+        Returns
+        -------
+        bytes
+            Document JSON (liste ou réponse paginée)
+        """
+        frame = self.rows(fields)
+        rows: Any = (
+            transaction_columns(frame, fields)
+            if layout == "columnar"
+            else transaction_rows(frame, fields)
+        )
+        if self.page is None:
+            return dumps(rows)
+        return dumps(
+            {
+                "page": self.page,
+                "limit": self.limit,
+                "total": self.total,
+                "transactions": rows,
+                "explain": self.explain,
+                "next_cursor": self.next_cursor,
+            }
+        )
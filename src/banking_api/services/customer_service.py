@@ -6,8 +6,14 @@ des portefeuilles clients.
 """
 
 from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
 from banking_api.models import Customer, CustomerListResponse
-from banking_api.data_manager import data_manager
+from banking_api.data_manager import DatasetView, data_manager
+from banking_api.deadline import budgeted_chunks
+from banking_api.pagination import Cursor, fingerprint
+from banking_api.schema import AMOUNT_COLUMN, AMOUNT_SCALE
+from banking_api.services.response_cache import response_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -22,7 +28,12 @@ class CustomerService:
     """
 
     @staticmethod
-    def get_customers(page: int = 1, limit: int = 100) -> CustomerListResponse:
+    def get_customers(
+        page: int = 1,
+        limit: int = 100,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> CustomerListResponse:
         """
         Récupère une liste paginée des clients.
 
@@ -32,25 +43,58 @@ class CustomerService:
             Numéro de page (défaut: 1)
         limit : int, optional
             Éléments par page (défaut: 100)
+        offset : Optional[int], optional
+            Rang exact du premier client (défaut: (page - 1) * limit)
+        cursor : Optional[str], optional
+            Curseur de la page précédente (prioritaire sur page et offset)
 
         Returns
         -------
         CustomerListResponse
             Liste paginée des clients
+
+        Raises
+        ------
+        InvalidCursorError
+            Si le curseur est invalide
+        SnapshotExpiredError
+            Si la version du curseur n'est plus conservée
         """
-        df = data_manager.get_data()
+        key = fingerprint("customers", {})
+        resume = Cursor.decode(cursor, key) if cursor is not None else None
+        view = (
+            data_manager.resume(resume.version, resume.layout)
+            if resume is not None
+            else data_manager.get_view()
+        )
 
-        # Get all unique customers (convert to string)
-        customers = sorted(df["client_id"].unique().tolist())
+        # Clients distincts, déjà triés par l'index groupé
+        customers = view.keys("client_id")
         total = len(customers)
 
-        # Pagination
-        start_idx = (page - 1) * limit
+        # Pagination (reprise après le dernier client du curseur)
+        start_idx = (page - 1) * limit if offset is None else offset
+        if resume is not None:
+            start_idx = int(np.searchsorted(customers, resume.key, side="right"))
         end_idx = start_idx + limit
-        customers_page = [str(c) for c in customers[start_idx:end_idx]]
+        customers_page = customers[start_idx:end_idx].tolist()
+
+        next_cursor: Optional[str] = None
+        if customers_page and end_idx < total:
+            next_cursor = Cursor(
+                view.snapshot.version,
+                key,
+                customers_page[-1],
+                end_idx,
+                view.snapshot.layout,
+            ).encode()
 
         return CustomerListResponse(
-            page=page, limit=limit, total=total, customers=customers_page
+            page=start_idx // limit + 1,
+            limit=limit,
+            total=total,
+            customers=[str(c) for c in customers_page],
+            next_cursor=next_cursor,
         )
 
     @staticmethod
@@ -68,17 +112,17 @@ class CustomerService:
         Optional[Customer]
             Profil du client ou None si non trouvé
         """
-        df = data_manager.get_data()
+        view = data_manager.get_view()
 
         # Get all transactions for this customer
-        df_customer = df[df["client_id"] == customer_id]
+        df_customer = view.take(view.lookup("client_id", customer_id))
 
         if df_customer.empty:
             return None
 
         transactions_count = len(df_customer)
-        avg_amount = float(df_customer["amount"].mean())
-        total_amount = float(df_customer["amount"].sum())
+        avg_amount = float(df_customer[AMOUNT_COLUMN].mean()) / AMOUNT_SCALE
+        total_amount = float(df_customer[AMOUNT_COLUMN].sum()) / AMOUNT_SCALE
         unique_merchants = int(df_customer["merchant_id"].nunique())
 
         return Customer(
@@ -94,6 +138,10 @@ class CustomerService:
         """
         Récupère les clients avec le plus grand volume de transactions.
 
+        Le classement est mémorisé par état du dataset ; les requêtes
+        identiques simultanées partagent un seul calcul (voir
+        response_cache).
+
         Parameters
         ----------
         n : int, optional
@@ -104,12 +152,47 @@ class CustomerService:
         List[Tuple[int, float]]
             Liste de tuples (customer_id, total_amount)
         """
-        df = data_manager.get_data()
-
-        # Grouper par client et calculer le volume total (en valeur absolue pour inclure remboursements)
-        customer_volumes = (
-            df.groupby("client_id")["amount"].apply(lambda x: x.abs().sum())
-            .sort_values(ascending=False).head(n)
+        view = data_manager.get_view()
+        customers = response_cache.get_or_compute(
+            view.state,
+            ("top-customers", n),
+            lambda: CustomerService._top_customers(view, n),
+            lambda customers: 64 * (len(customers) + 1),
         )
+        return list(customers)
 
-        return [(int(idx), float(val)) for idx, val in customer_volumes.items()]
+    @staticmethod
+    def _top_customers(view: DatasetView, n: int) -> List[Tuple[int, float]]:
+        """
+        Calcule le classement des clients d'une vue du dataset.
+
+        Parameters
+        ----------
+        view : DatasetView
+            Vue lue
+        n : int
+            Nombre de clients à retourner
+
+        Returns
+        -------
+        List[Tuple[int, float]]
+            Liste de tuples (customer_id, total_amount)
+        """
+        rows = view.frame([AMOUNT_COLUMN, "client_id"])
+        cents = rows[AMOUNT_COLUMN]
+        clients = rows["client_id"]
+
+        # Volume total par client (en valeur absolue pour inclure remboursements),
+        # cumulé par blocs : l'échéance est vérifiée entre deux blocs
+        volumes: Optional[pd.Series] = None
+        for chunk in budgeted_chunks(len(cents)):
+            part = cents.iloc[chunk].abs().groupby(clients.iloc[chunk]).sum()
+            volumes = part if volumes is None else volumes.add(part, fill_value=0)
+        if volumes is None:
+            return []
+        customer_volumes = volumes.sort_values(ascending=False).head(n)
+
+        return [
+            (int(idx), float(val) / AMOUNT_SCALE)
+            for idx, val in customer_volumes.items()
+        ]
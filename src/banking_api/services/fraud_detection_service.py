@@ -29,68 +29,30 @@ class FraudDetectionService:
     @staticmethod
     def get_fraud_summary() -> FraudSummary:
         """
-        Calcule un résumé des statistiques de transactions suspectes.
+        Retourne le résumé des statistiques de transactions suspectes.
+
+        Le résumé est matérialisé avec chaque version du dataset et combiné
+        à celui des modifications de l'API en attente (voir
+        DatasetAggregates et DatasetView.aggregates).
 
         Returns
         -------
         FraudSummary
             Résumé des transactions suspectes
         """
-        df = data_manager.get_data()
-
-        total_transactions = len(df)
-
-        # Suspicious transactions: negative amounts or very high amounts
-        suspicious = df[(df["amount"] < 0) | (df["amount"].abs() > 5000)]
-        suspicious_count = len(suspicious)
-
-        # High-risk transactions: very negative amounts
-        high_risk = df[df["amount"] < -1000]
-        high_risk_count = len(high_risk)
-
-        # Average risk score (based on normalized absolute amount)
-        avg_risk_score = min(100, float(df["amount"].abs().mean() / 10))
-
-        suspicious_rate = float(suspicious_count / total_transactions) if total_transactions > 0 else 0.0
-
-        return FraudSummary(
-            total_transactions=total_transactions,
-            suspicious_count=suspicious_count,
-            high_risk_count=high_risk_count,
-            avg_risk_score=avg_risk_score,
-            suspicious_rate=suspicious_rate,
-        )
+        return data_manager.get_view().aggregates.fraud_summary
 
     @staticmethod
     def get_fraud_by_type() -> List[FraudByType]:
         """
-        Calcule le taux de transactions suspectes par mode de transaction.
+        Retourne le taux de transactions suspectes par mode de transaction.
 
         Returns
         -------
         List[FraudByType]
             Statistiques de suspicion par mode
         """
-        df = data_manager.get_data()
-
-        fraud_stats: List[FraudByType] = []
-
-        for chip_type in df["use_chip"].unique():
-            df_type = df[df["use_chip"] == chip_type]
-            total_count = len(df_type)
-            suspicious_count = len(df_type[df_type["amount"] < 0])
-            suspicious_rate = float(suspicious_count / total_count) if total_count > 0 else 0.0
-
-            fraud_stats.append(
-                FraudByType(
-                    use_chip=str(chip_type),
-                    total_count=total_count,
-                    suspicious_count=suspicious_count,
-                    suspicious_rate=suspicious_rate,
-                )
-            )
-
-        return fraud_stats
+        return list(data_manager.get_view().aggregates.fraud_by_type)
 
     @staticmethod
     def predict_fraud(request: FraudPredictionRequest) -> FraudPredictionResponse:
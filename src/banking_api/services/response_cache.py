@@ -0,0 +1,315 @@
+"""
+Cache des réponses coûteuses de l'API.
+
+Ce module mémorise le résultat des requêtes répétées (recherches
+sauvegardées, histogrammes) par état du dataset (version publiée et
+dernière modification de l'API lue, voir DatasetView.state). Les entrées
+sont évincées par ordre d'utilisation (LRU) au-delà d'une taille maximale
+en octets, et optionnellement après une durée de vie (TTL). L'observation
+d'un nouvel état invalide toutes les entrées.
+
+En cas d'absence, les requêtes identiques simultanées partagent un seul
+calcul (voir SingleFlight).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+from fastapi import Response
+
+from banking_api.config import settings
+from banking_api.models import CacheMetrics
+from banking_api.services.single_flight import SingleFlight
+import logging
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class CachedResponse:
+    """
+    Réponse HTTP encodée, réutilisable par plusieurs requêtes.
+
+    Attributes
+    ----------
+    body : bytes
+        Corps de la réponse
+    media_type : Optional[str]
+        Type de contenu
+    headers : Dict[str, str]
+        En-têtes propres à la réponse (hors content-length et content-type)
+    """
+
+    def __init__(
+        self, body: bytes, media_type: Optional[str], headers: Dict[str, str]
+    ) -> None:
+        """
+        Initialise la réponse mémorisée.
+
+        Parameters
+        ----------
+        body : bytes
+            Corps de la réponse
+        media_type : Optional[str]
+            Type de contenu
+        headers : Dict[str, str]
+            En-têtes de la réponse
+        """
+        self.body = body
+        self.media_type = media_type
+        self.headers = headers
+
+    @classmethod
+    def from_response(cls, response: Response) -> "CachedResponse":
+        """
+        Capture une réponse encodée.
+
+        Parameters
+        ----------
+        response : Response
+            Réponse à mémoriser
+
+        Returns
+        -------
+        CachedResponse
+            Réponse mémorisée
+        """
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name not in ("content-length", "content-type")
+        }
+        return cls(bytes(response.body), response.media_type, headers)
+
+    def to_response(self) -> Response:
+        """
+        Construit une nouvelle réponse HTTP.
+
+        Returns
+        -------
+        Response
+            Réponse indépendante des autres requêtes
+        """
+        return Response(
+            self.body, media_type=self.media_type, headers=dict(self.headers)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Taille approximative de la réponse en mémoire.
+
+        Returns
+        -------
+        int
+            Taille en octets
+        """
+        return len(self.body) + sum(
+            len(name) + len(value) for name, value in self.headers.items()
+        )
+
+
+class ResponseCache:
+    """
+    Cache LRU de réponses, borné en octets et indexé par état du dataset.
+
+    Attributes
+    ----------
+    max_bytes : int
+        Taille maximale cumulée des entrées (0 désactive le cache)
+    ttl : Optional[float]
+        Durée de vie des entrées en secondes (None : illimitée)
+    flights : SingleFlight
+        Regroupement des calculs des clés absentes
+    """
+
+    def __init__(self, max_bytes: int, ttl: Optional[float] = None) -> None:
+        """
+        Initialise le cache.
+
+        Parameters
+        ----------
+        max_bytes : int
+            Taille maximale cumulée des entrées (0 désactive le cache)
+        ttl : Optional[float], optional
+            Durée de vie des entrées en secondes (défaut: illimitée)
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.flights = SingleFlight()
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._version: Tuple[int, int] = (0, 0)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get_or_compute(
+        self,
+        version: Tuple[int, int],
+        key: Hashable,
+        compute: Callable[[], T],
+        sizeof: Callable[[T], int],
+    ) -> T:
+        """
+        Retourne la valeur mémorisée pour une clé, ou la calcule.
+
+        Parameters
+        ----------
+        version : Tuple[int, int]
+            État du dataset lu par la requête (voir DatasetView.state)
+        key : Hashable
+            Clé normalisée de la requête
+        compute : Callable[[], T]
+            Calcul de la valeur en cas d'absence
+        sizeof : Callable[[T], int]
+            Taille en octets d'une valeur
+
+        Returns
+        -------
+        T
+            Valeur mémorisée ou calculée
+
+        Raises
+        ------
+        Exception
+            Toute exception levée par compute (rien n'est alors mémorisé)
+        """
+        with self._lock:
+            self._advance(version)
+            # Les entrées décrivent l'état le plus récent : une requête fixée
+            # sur un état antérieur calcule sa réponse sans la mémoriser
+            entry = self._entries.get(key) if version == self._version else None
+            if entry is not None:
+                value, _, expires_at = entry
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value  # type: ignore[no-any-return]
+                self._discard(key)
+                self._expirations += 1
+            self._misses += 1
+
+        return self.flights.do(
+            (version, key), lambda: self._compute(version, key, compute, sizeof)
+        )
+
+    def _compute(
+        self,
+        version: Tuple[int, int],
+        key: Hashable,
+        compute: Callable[[], T],
+        sizeof: Callable[[T], int],
+    ) -> T:
+        """
+        Calcule une valeur absente et la mémorise.
+
+        Parameters
+        ----------
+        version : Tuple[int, int]
+            État du dataset lu par la requête (voir DatasetView.state)
+        key : Hashable
+            Clé normalisée de la requête
+        compute : Callable[[], T]
+            Calcul de la valeur
+        sizeof : Callable[[T], int]
+            Taille en octets d'une valeur
+
+        Returns
+        -------
+        T
+            Valeur calculée
+        """
+        value = compute()
+        nbytes = sizeof(value)
+        if nbytes > self.max_bytes:
+            return value
+
+        expires_at = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            # Un état observé pendant le calcul rend la valeur périmée
+            if version != self._version:
+                return value
+            if key in self._entries:
+                self._discard(key)
+            self._entries[key] = (value, nbytes, expires_at)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                evicted, _ = next(iter(self._entries.items()))
+                self._discard(evicted)
+                self._evictions += 1
+        return value
+
+    def clear(self) -> None:
+        """Supprime toutes les entrées."""
+        with self._lock:
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def metrics(self) -> CacheMetrics:
+        """
+        Retourne les compteurs du cache.
+
+        Returns
+        -------
+        CacheMetrics
+            Taille et compteurs de succès, d'échecs et d'évictions
+        """
+        with self._lock:
+            return CacheMetrics(
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                expirations=self._expirations,
+                invalidations=self._invalidations,
+            )
+
+    def _advance(self, version: Tuple[int, int]) -> None:
+        """
+        Invalide les entrées lorsqu'un nouvel état est observé.
+
+        Doit être appelée avec le verrou acquis.
+
+        Parameters
+        ----------
+        version : Tuple[int, int]
+            État du dataset lu par la requête (voir DatasetView.state)
+        """
+        if version > self._version:
+            if self._entries:
+                logger.info(
+                    f"Dataset state {version}: "
+                    f"dropping {len(self._entries)} cached responses"
+                )
+            self._invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+            self._version = version
+
+    def _discard(self, key: Hashable) -> None:
+        """
+        Supprime une entrée. Doit être appelée avec le verrou acquis.
+
+        Parameters
+        ----------
+        key : Hashable
+            Clé de l'entrée
+        """
+        _, nbytes, _ = self._entries.pop(key)
+        self._bytes -= nbytes
+
+
+# Instance globale du cache des réponses
+response_cache: ResponseCache = ResponseCache(
+    settings.RESPONSE_CACHE_BYTES, settings.RESPONSE_CACHE_TTL or None
+)
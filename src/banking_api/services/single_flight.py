@@ -0,0 +1,135 @@
+"""
+Regroupement des calculs identiques simultanés (single-flight).
+
+Lorsqu'un tableau de bord se rafraîchit, de nombreux clients envoient la
+même requête au même instant. Ce module garantit qu'un seul calcul est
+exécuté par clé : les requêtes concurrentes attendent ce calcul et en
+partagent le résultat (ou l'exception). Un calcul interrompu par
+l'échéance de la requête qui l'a lancé est repris par une requête en
+attente.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+from banking_api.deadline import QueryAbortedError, check_deadline
+from banking_api.models import SingleFlightMetrics
+
+T = TypeVar("T")
+
+# Intervalle de vérification de l'échéance pendant l'attente (secondes)
+WAIT_POLL_INTERVAL: float = 0.05
+
+
+class _Call:
+    """
+    Calcul en cours pour une clé.
+
+    Attributes
+    ----------
+    done : threading.Event
+        Signalé à la fin du calcul
+    result : Any
+        Résultat du calcul
+    error : Optional[BaseException]
+        Exception levée par le calcul
+    waiters : int
+        Nombre de requêtes en attente de ce calcul
+    """
+
+    def __init__(self) -> None:
+        """Initialise le calcul en cours."""
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Exécute au plus un calcul à la fois par clé.
+
+    Les clés sont celles du cache des réponses (voir ResponseCache) :
+    version du dataset et requête normalisée.
+    """
+
+    def __init__(self) -> None:
+        """Initialise le regroupement."""
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        self._executions = 0
+        self._coalesced = 0
+
+    def do(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """
+        Exécute le calcul, ou attend celui déjà en cours pour la même clé.
+
+        Parameters
+        ----------
+        key : Hashable
+            Clé normalisée de la requête
+        compute : Callable[[], T]
+            Calcul à exécuter
+
+        Returns
+        -------
+        T
+            Résultat du calcul, partagé entre les requêtes regroupées
+
+        Raises
+        ------
+        QueryAbortedError
+            Si l'échéance de la requête est dépassée pendant l'attente
+        Exception
+            L'exception levée par le calcul, pour chaque requête regroupée
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self._coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self._executions += 1
+                leader = True
+
+        if not leader:
+            # L'attente reste soumise à l'échéance de la requête
+            while not call.done.wait(WAIT_POLL_INTERVAL):
+                check_deadline()
+            if isinstance(call.error, QueryAbortedError):
+                # Calcul abandonné par sa requête : la suivante le reprend
+                check_deadline()
+                return self.do(key, compute)
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[no-any-return]
+
+        try:
+            call.result = compute()
+            return call.result  # type: ignore[no-any-return]
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def metrics(self) -> SingleFlightMetrics:
+        """
+        Retourne les compteurs du regroupement.
+
+        Returns
+        -------
+        SingleFlightMetrics
+            Calculs exécutés, requêtes regroupées et calculs en cours
+        """
+        with self._lock:
+            return SingleFlightMetrics(
+                executions=self._executions,
+                coalesced=self._coalesced,
+                in_flight=len(self._calls),
+            )
@@ -5,7 +5,6 @@ Ce module fournit les fonctions de calcul des statistiques
 et agrégations sur les données de transactions.
 """
 
-import pandas as pd
 import numpy as np
 from typing import List
 from banking_api.models import (
@@ -14,7 +13,10 @@ from banking_api.models import (
     StatsByType,
     DailyStats,
 )
-from banking_api.data_manager import data_manager
+from banking_api.data_manager import DatasetView, data_manager
+from banking_api.services.response_cache import response_cache
+from banking_api.deadline import budgeted_chunks
+from banking_api.schema import AMOUNT_COLUMN, AMOUNT_SCALE
 import logging
 
 logger = logging.getLogger(__name__)
@@ -31,34 +33,27 @@ class StatsService:
     @staticmethod
     def get_overview() -> StatsOverview:
         """
-        Calcule les statistiques globales du dataset.
+        Retourne les statistiques globales du dataset.
+
+        Les statistiques sont matérialisées avec chaque version du dataset
+        et combinées à celles des modifications de l'API en attente (voir
+        DatasetAggregates et DatasetView.aggregates).
 
         Returns
         -------
         StatsOverview
             Statistiques globales
         """
-        df = data_manager.get_data()
-
-        total_transactions = len(df)
-        # Number of negative transactions (possible fraud/refund indicator)
-        negative_count = len(df[df["amount"] < 0])
-        negative_rate = float(negative_count / total_transactions) if total_transactions > 0 else 0.0
-        avg_amount = float(df["amount"].mean())
-        most_common_type = str(df["use_chip"].mode()[0]) if len(df) > 0 else "N/A"
-
-        return StatsOverview(
-            total_transactions=total_transactions,
-            fraud_rate=negative_rate,  # Negative transactions rate
-            avg_amount=avg_amount,
-            most_common_type=most_common_type,
-        )
+        return data_manager.get_view().aggregates.overview
 
     @staticmethod
     def get_amount_distribution(bins_count: int = 10) -> AmountDistribution:
         """
         Calcule la distribution des montants de transactions.
 
+        Le résultat est mémorisé par nombre de classes et par état du
+        dataset (voir response_cache).
+
         Parameters
         ----------
         bins_count : int, optional
@@ -69,13 +64,41 @@ class StatsService:
         AmountDistribution
             Distribution des montants
         """
-        df = data_manager.get_data()
+        view = data_manager.get_view()
+        return response_cache.get_or_compute(
+            view.state,
+            ("amount-distribution", bins_count),
+            lambda: StatsService._amount_distribution(view, bins_count),
+            lambda distribution: len(distribution.model_dump_json()),
+        )
+
+    @staticmethod
+    def _amount_distribution(view: DatasetView, bins_count: int) -> AmountDistribution:
+        """
+        Calcule l'histogramme des montants d'une vue du dataset.
+
+        Parameters
+        ----------
+        view : DatasetView
+            Vue lue
+        bins_count : int
+            Nombre de classes
+
+        Returns
+        -------
+        AmountDistribution
+            Distribution des montants
+        """
+        cents = view.column(AMOUNT_COLUMN).to_numpy()
 
         # Create bins
-        max_amount = df["amount"].max()
-        bin_edges = np.linspace(0, max_amount, bins_count + 1)
+        max_amount = cents.max() / AMOUNT_SCALE
+        edges = np.linspace(0, max_amount, bins_count + 1)
 
-        counts, edges = np.histogram(df["amount"], bins=bin_edges)
+        # Histogramme cumulé par blocs, l'échéance étant vérifiée entre deux blocs
+        counts = np.zeros(bins_count, dtype=np.int64)
+        for chunk in budgeted_chunks(len(cents)):
+            counts += np.histogram(cents[chunk] / AMOUNT_SCALE, bins=edges)[0]
 
         # Formater les labels des bins
         bin_labels = []
@@ -91,66 +114,23 @@ class StatsService:
     @staticmethod
     def get_stats_by_type() -> List[StatsByType]:
         """
-        Calcule les statistiques par mode de transaction.
+        Retourne les statistiques par mode de transaction.
 
         Returns
         -------
         List[StatsByType]
             Statistiques pour chaque mode
         """
-        df = data_manager.get_data()
-
-        stats_list: List[StatsByType] = []
-
-        for chip_type in df["use_chip"].unique():
-            df_type = df[df["use_chip"] == chip_type]
-            count = len(df_type)
-            avg_amount = float(df_type["amount"].mean())
-            total_amount = float(df_type["amount"].sum())
-
-            stats_list.append(
-                StatsByType(
-                    use_chip=str(chip_type),
-                    count=count,
-                    avg_amount=avg_amount,
-                    total_amount=total_amount,
-                )
-            )
-
-        return stats_list
+        return list(data_manager.get_view().aggregates.stats_by_type)
 
     @staticmethod
     def get_daily_stats() -> List[DailyStats]:
         """
-        Calcule les statistiques quotidiennes (par date).
+        Retourne les statistiques quotidiennes (par date).
 
         Returns
         -------
         List[DailyStats]
-            Statistiques pour chaque jour
+            Statistiques pour chaque jour, triées par date
         """
-        df = data_manager.get_data()
-
-        # Extraire la date sans l'heure
-        df["date_only"] = pd.to_datetime(df["date"]).dt.date
-
-        # Grouper par date
-        grouped = df.groupby("date_only").agg(
-            count=("amount", "count"),
-            avg_amount=("amount", "mean"),
-            total_amount=("amount", "sum"),
-        )
-
-        daily_stats: List[DailyStats] = []
-
-        for date, row in grouped.iterrows():
-            daily_stats.append(
-                DailyStats(
-                    date=str(date),
-                    count=int(row["count"]),
-                    avg_amount=float(row["avg_amount"]),
-                    total_amount=float(row["total_amount"]),
-                )
-            )
-
-        return sorted(daily_stats, key=lambda x: x.date)
+        return list(data_manager.get_view().aggregates.daily_stats)
@@ -9,9 +9,19 @@ import sys
 import time
 from datetime import datetime, timezone
 from typing import Literal
-from banking_api.models import SystemHealth, SystemMetadata
+from banking_api.models import (
+    ReloadResult,
+    SystemHealth,
+    SystemMetadata,
+    SystemMetrics,
+)
 from banking_api.data_manager import data_manager
+from banking_api.services.response_cache import response_cache
 from banking_api.config import settings
+from banking_api.admission import admission_metrics
+from banking_api.executor import compute_pool
+from banking_api.ingestion import delta_buffer
+from banking_api.reloader import dataset_reloader
 import logging
 
 logger = logging.getLogger(__name__)
@@ -82,3 +92,51 @@ class SystemService:
             api_name=settings.API_TITLE,
             python_version=python_version,
         )
+
+    @staticmethod
+    def get_metrics() -> SystemMetrics:
+        """
+        Récupère les métriques de fonctionnement de l'API.
+
+        Returns
+        -------
+        SystemMetrics
+            Version du dataset, compteurs du cache des réponses, du
+            regroupement des calculs, du pool de traitements, du
+            contrôle d'admission et de l'ingestion
+        """
+        return SystemMetrics(
+            dataset_version=data_manager.get_version(),
+            response_cache=response_cache.metrics(),
+            single_flight=response_cache.flights.metrics(),
+            compute_pool=compute_pool.metrics(),
+            admission=admission_metrics(),
+            ingestion=delta_buffer.metrics(),
+        )
+
+    @staticmethod
+    def reload_dataset() -> ReloadResult:
+        """
+        Recharge le fichier de données et publie la nouvelle version.
+
+        Returns
+        -------
+        ReloadResult
+            Version publiée, nombre d'enregistrements et durée
+
+        Raises
+        ------
+        RuntimeError
+            Si aucun fichier n'a été chargé
+        FileNotFoundError
+            Si le fichier n'existe plus
+        ValueError
+            Si le fichier est invalide
+        """
+        started = time.perf_counter()
+        snapshot = dataset_reloader.reload()
+        return ReloadResult(
+            dataset_version=snapshot.version,
+            total_records=len(snapshot),
+            duration_ms=(time.perf_counter() - started) * 1000,
+        )
@@ -5,13 +5,31 @@ Ce module fournit les fonctions métier pour la consultation,
 le filtrage et la recherche de transactions.
 """
 
-from typing import List, Optional
+from typing import Any, Iterator, List, Optional, Tuple
+import time
+import numpy as np
+import pandas as pd
 from banking_api.models import (
+    IngestResult,
+    QueryPlan,
+    QueryStage,
     Transaction,
     TransactionResponse,
     TransactionSearchRequest,
 )
-from banking_api.data_manager import data_manager
+from banking_api.data_manager import DatasetSnapshot, DatasetView, data_manager
+from banking_api.indexes import MergedSelection, Selection
+from banking_api.ingestion import delta_buffer
+from banking_api.pagination import Cursor, fingerprint
+from banking_api.query_planner import (
+    AmountRangePredicate,
+    EqualsPredicate,
+    Predicate,
+    QueryPlanner,
+)
+from banking_api.schema import cents_lower_bound, cents_upper_bound
+from banking_api.config import settings
+from banking_api.serialization import TransactionPage, csv_chunk, ndjson_chunk
 import logging
 
 logger = logging.getLogger(__name__)
@@ -25,6 +43,202 @@ class TransactionsService:
     les transactions bancaires.
     """
 
+    @staticmethod
+    def _to_transactions(df: pd.DataFrame) -> List[Transaction]:
+        """
+        Convertit des lignes du dataset en modèles Transaction.
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Lignes à convertir
+
+        Returns
+        -------
+        List[Transaction]
+            Transactions correspondantes
+        """
+        return TransactionPage(df).to_transactions()
+
+    @staticmethod
+    def _predicates(
+        equalities: List[Tuple[str, Any]],
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> List[Predicate]:
+        """
+        Construit les prédicats d'une recherche.
+
+        Parameters
+        ----------
+        equalities : List[Tuple[str, Any]]
+            Filtres d'égalité (colonne, valeur)
+        min_amount : Optional[float], optional
+            Montant minimum (inclus)
+        max_amount : Optional[float], optional
+            Montant maximum (inclus)
+
+        Returns
+        -------
+        List[Predicate]
+            Prédicats à planifier
+        """
+        predicates: List[Predicate] = [
+            EqualsPredicate(column, value) for column, value in equalities
+        ]
+        if min_amount is not None or max_amount is not None:
+            low = cents_lower_bound(min_amount) if min_amount is not None else None
+            high = cents_upper_bound(max_amount) if max_amount is not None else None
+            predicates.append(AmountRangePredicate(low, high))
+        return predicates
+
+    @staticmethod
+    def _search_predicates(search_request: TransactionSearchRequest) -> List[Predicate]:
+        """
+        Construit les prédicats d'une recherche multicritère.
+
+        Parameters
+        ----------
+        search_request : TransactionSearchRequest
+            Critères de recherche
+
+        Returns
+        -------
+        List[Predicate]
+            Prédicats à planifier
+        """
+        equalities: List[Tuple[str, Any]] = [
+            (column, getattr(search_request, column))
+            for column in (
+                "use_chip",
+                "client_id",
+                "merchant_id",
+                "merchant_state",
+                "mcc",
+                "errors",
+            )
+            if getattr(search_request, column) is not None
+        ]
+        min_amount, max_amount = search_request.amount_range or (None, None)
+        return TransactionsService._predicates(equalities, min_amount, max_amount)
+
+    @staticmethod
+    def _select(
+        snapshot: DatasetSnapshot,
+        equalities: List[Tuple[str, Any]],
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+    ) -> Selection:
+        """
+        Sélectionne les lignes satisfaisant tous les filtres.
+
+        L'ordre d'évaluation est choisi par le planificateur de requêtes
+        (voir QueryPlanner) selon la sélectivité estimée de chaque filtre.
+
+        Parameters
+        ----------
+        snapshot : DatasetSnapshot
+            Instantané interrogé
+        equalities : List[Tuple[str, Any]]
+            Filtres d'égalité (colonne, valeur)
+        min_amount : Optional[float], optional
+            Montant minimum (inclus)
+        max_amount : Optional[float], optional
+            Montant maximum (inclus)
+
+        Returns
+        -------
+        Selection
+            Lignes sélectionnées, dans l'ordre du dataset
+        """
+        planner = QueryPlanner(snapshot)
+        predicates = TransactionsService._predicates(
+            equalities, min_amount, max_amount
+        )
+        selection, _ = planner.execute(planner.plan(predicates))
+        return selection
+
+    @staticmethod
+    def _resume(
+        cursor: Optional[str], key: str
+    ) -> Tuple[DatasetView, Optional[Cursor]]:
+        """
+        Retourne la vue à parcourir et le curseur décodé.
+
+        Parameters
+        ----------
+        cursor : Optional[str]
+            Jeton de la page précédente
+        key : str
+            Empreinte des filtres de la requête
+
+        Returns
+        -------
+        Tuple[DatasetView, Optional[Cursor]]
+            Vue (voir DataManager.resume le cas échéant) et curseur
+
+        Raises
+        ------
+        InvalidCursorError
+            Si le curseur est invalide
+        SnapshotExpiredError
+            Si la version du curseur n'est plus conservée
+        """
+        if cursor is None:
+            return data_manager.get_view(), None
+        resume = Cursor.decode(cursor, key)
+        return data_manager.resume(resume.version, resume.layout), resume
+
+    @staticmethod
+    def _paginate(
+        view: DatasetView,
+        selection: MergedSelection,
+        key: str,
+        offset: int,
+        limit: int,
+        resume: Optional[Cursor] = None,
+    ) -> Tuple[np.ndarray, int, Optional[str]]:
+        """
+        Extrait une page d'une sélection, par rang ou après un curseur.
+
+        Parameters
+        ----------
+        view : DatasetView
+            Vue parcourue
+        selection : MergedSelection
+            Lignes sélectionnées
+        key : str
+            Empreinte des filtres de la requête
+        offset : int
+            Rang de la première ligne (ignoré si resume est fourni)
+        limit : int
+            Nombre d'éléments par page
+        resume : Optional[Cursor], optional
+            Curseur de la page précédente
+
+        Returns
+        -------
+        Tuple[np.ndarray, int, Optional[str]]
+            Positions de la page, rang de sa première ligne et curseur de
+            la page suivante
+        """
+        if resume is not None:
+            offset = resume.offset
+            positions = selection.after(resume.key, limit)
+        else:
+            positions = selection.page(offset, offset + limit)
+
+        next_cursor: Optional[str] = None
+        if len(positions) > 0 and offset + len(positions) < selection.total:
+            next_cursor = Cursor(
+                view.snapshot.version,
+                key,
+                int(positions[-1]),
+                offset + len(positions),
+                view.snapshot.layout,
+            ).encode()
+        return positions, offset, next_cursor
+
     @staticmethod
     def get_transactions(
         page: int = 1,
@@ -37,6 +251,31 @@ class TransactionsService:
         """
         Récupère une liste paginée de transactions avec filtres optionnels.
 
+        Voir get_transactions_page pour le détail des paramètres.
+
+        Returns
+        -------
+        TransactionResponse
+            Réponse paginée contenant les transactions
+        """
+        return TransactionsService.get_transactions_page(
+            page, limit, use_chip, merchant_state, min_amount, max_amount
+        ).to_response()
+
+    @staticmethod
+    def get_transactions_page(
+        page: int = 1,
+        limit: int = 100,
+        use_chip: Optional[str] = None,
+        merchant_state: Optional[str] = None,
+        min_amount: Optional[float] = None,
+        max_amount: Optional[float] = None,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> TransactionPage:
+        """
+        Récupère une page de transactions avec filtres optionnels.
+
         Parameters
         ----------
         page : int, optional
@@ -51,41 +290,56 @@ class TransactionsService:
             Montant minimum
         max_amount : Optional[float], optional
             Montant maximum
+        offset : Optional[int], optional
+            Rang exact de la première ligne (défaut: (page - 1) * limit)
+        cursor : Optional[str], optional
+            Curseur de la page précédente (prioritaire sur page et offset)
 
         Returns
         -------
-        TransactionResponse
-            Réponse paginée contenant les transactions
+        TransactionPage
+            Page de transactions, avant sérialisation
         """
-        df = data_manager.get_data()
+        key = fingerprint(
+            "transactions",
+            {
+                "use_chip": use_chip,
+                "merchant_state": merchant_state,
+                "min_amount": min_amount,
+                "max_amount": max_amount,
+            },
+        )
+        view, resume = TransactionsService._resume(cursor, key)
 
         # Application des filtres
+        equalities: List[Tuple[str, Any]] = []
         if use_chip is not None:
-            df = df[df["use_chip"] == use_chip]
-
+            equalities.append(("use_chip", use_chip))
         if merchant_state is not None:
-            df = df[df["merchant_state"] == merchant_state]
+            equalities.append(("merchant_state", merchant_state))
 
-        if min_amount is not None:
-            df = df[df["amount"] >= min_amount]
-
-        if max_amount is not None:
-            df = df[df["amount"] <= max_amount]
-
-        total = len(df)
+        selection = view.selection(
+            key,
+            lambda target: TransactionsService._select(
+                target, equalities, min_amount, max_amount
+            ),
+        )
+        total = selection.total
 
         # Pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        df_page = df.iloc[start_idx:end_idx]
-
-        # Convert to models
-        transactions = [
-            Transaction(**row.to_dict()) for _, row in df_page.iterrows()
-        ]
+        start_idx = (page - 1) * limit if offset is None else offset
+        positions, start_idx, next_cursor = TransactionsService._paginate(
+            view, selection, key, start_idx, limit, resume
+        )
 
-        return TransactionResponse(
-            page=page, limit=limit, total=total, transactions=transactions
+        frame, rows = view.source(positions)
+        return TransactionPage(
+            frame,
+            positions=rows,
+            page=start_idx // limit + 1,
+            limit=limit,
+            total=total,
+            next_cursor=next_cursor,
         )
 
     @staticmethod
@@ -103,21 +357,50 @@ class TransactionsService:
         Optional[Transaction]
             Transaction trouvée ou None
         """
-        df = data_manager.get_data()
-        result = df[df["id"] == transaction_id]
+        # Dataset publié et modifications de l'API en attente
+        view = data_manager.get_view()
+        position = view.locate(transaction_id)
 
-        if result.empty:
+        if position is None:
             return None
 
-        return Transaction(**result.iloc[0].to_dict())
+        return TransactionsService._to_transactions(
+            view.take(np.array([position], dtype=np.int64))
+        )[0]
 
     @staticmethod
     def search_transactions(
-        search_request: TransactionSearchRequest, page: int = 1, limit: int = 100
+        search_request: TransactionSearchRequest,
+        page: int = 1,
+        limit: int = 100,
+        explain: bool = False,
     ) -> TransactionResponse:
         """
         Recherche multicritère de transactions.
 
+        Voir search_transactions_page pour le détail des paramètres.
+
+        Returns
+        -------
+        TransactionResponse
+            Réponse paginée des résultats
+        """
+        return TransactionsService.search_transactions_page(
+            search_request, page, limit, explain=explain
+        ).to_response()
+
+    @staticmethod
+    def search_transactions_page(
+        search_request: TransactionSearchRequest,
+        page: int = 1,
+        limit: int = 100,
+        explain: bool = False,
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> TransactionPage:
+        """
+        Recherche multicritère de transactions.
+
         Parameters
         ----------
         search_request : TransactionSearchRequest
@@ -126,50 +409,128 @@ class TransactionsService:
             Numéro de page (défaut: 1)
         limit : int, optional
             Éléments par page (défaut: 100)
+        explain : bool, optional
+            Joindre le plan d'exécution et ses durées (défaut: False)
+        offset : Optional[int], optional
+            Rang exact de la première ligne (défaut: (page - 1) * limit)
+        cursor : Optional[str], optional
+            Curseur de la page précédente (prioritaire sur page et offset)
 
         Returns
         -------
-        TransactionResponse
-            Réponse paginée des résultats
+        TransactionPage
+            Page de résultats, avant sérialisation
         """
-        df = data_manager.get_data()
-
-        # Application des filtres
-        if search_request.use_chip is not None:
-            df = df[df["use_chip"] == search_request.use_chip]
-
-        if search_request.amount_range is not None:
-            df = df[
-                (df["amount"] >= search_request.amount_range[0])
-                & (df["amount"] <= search_request.amount_range[1])
-            ]
-
-        if search_request.client_id is not None:
-            df = df[df["client_id"] == search_request.client_id]
+        started = time.perf_counter()
+        key = fingerprint("search", search_request.model_dump())
+        view, resume = TransactionsService._resume(cursor, key)
+        predicates = TransactionsService._search_predicates(search_request)
+
+        planner = QueryPlanner(view.snapshot)
+        planned = planner.plan(predicates)
+        planning_ms = (time.perf_counter() - started) * 1000
+        stages: List[QueryStage] = []
+
+        def build(target: DatasetSnapshot) -> Selection:
+            if target is view.snapshot:
+                selection, executed = planner.execute(planned)
+                stages.extend(executed)
+                return selection
+            # Transactions ingérées : plan propre à leurs index
+            tail = QueryPlanner(target)
+            return tail.execute(tail.plan(predicates))[0]
+
+        # Avec explain, le plan est exécuté, et non relu depuis les
+        # sélections mémorisées
+        merged = view.selection(None if explain else key, build)
+        total = merged.total
 
-        if search_request.merchant_id is not None:
-            df = df[df["merchant_id"] == search_request.merchant_id]
-
-        if search_request.merchant_state is not None:
-            df = df[df["merchant_state"] == search_request.merchant_state]
+        # Pagination
+        fetch_started = time.perf_counter()
+        start_idx = (page - 1) * limit if offset is None else offset
+        positions, start_idx, next_cursor = TransactionsService._paginate(
+            view, merged, key, start_idx, limit, resume
+        )
+        fetch_ms = (time.perf_counter() - fetch_started) * 1000
+
+        plan: Optional[QueryPlan] = None
+        if explain:
+            plan = QueryPlan(
+                stages=stages,
+                planning_ms=round(planning_ms, 3),
+                fetch_ms=round(fetch_ms, 3),
+                total_ms=round((time.perf_counter() - started) * 1000, 3),
+            )
+        frame, rows = view.source(positions)
+        return TransactionPage(
+            frame,
+            positions=rows,
+            page=start_idx // limit + 1,
+            limit=limit,
+            total=total,
+            explain=plan,
+            next_cursor=next_cursor,
+        )
 
-        if search_request.mcc is not None:
-            df = df[df["mcc"] == search_request.mcc]
+    @staticmethod
+    def export_transactions(
+        search_request: TransactionSearchRequest, export_format: str = "ndjson"
+    ) -> Iterator[bytes]:
+        """
+        Exporte en flux toutes les transactions d'une recherche.
 
-        total = len(df)
+        Les filtres sont évalués une seule fois, sur la vue courante qui
+        reste figée pendant tout l'export. Les lignes sont ensuite
+        extraites et encodées par blocs de EXPORT_CHUNK_SIZE : seul le bloc
+        en cours est matérialisé, et le générateur n'avance qu'à mesure
+        que le client consomme la réponse.
 
-        # Pagination
-        start_idx = (page - 1) * limit
-        end_idx = start_idx + limit
-        df_page = df.iloc[start_idx:end_idx]
+        Parameters
+        ----------
+        search_request : TransactionSearchRequest
+            Critères de recherche
+        export_format : str, optional
+            Format de sortie, "ndjson" ou "csv" (défaut: "ndjson")
 
-        transactions = [
-            Transaction(**row.to_dict()) for _, row in df_page.iterrows()
-        ]
+        Returns
+        -------
+        Iterator[bytes]
+            Blocs encodés
 
-        return TransactionResponse(
-            page=page, limit=limit, total=total, transactions=transactions
-        )
+        Raises
+        ------
+        ValueError
+            Si le format n'est pas supporté
+        """
+        if export_format not in ("ndjson", "csv"):
+            raise ValueError(f"Unsupported export format: {export_format}")
+        view = data_manager.get_view()
+        key = fingerprint("search", search_request.model_dump())
+        predicates = TransactionsService._search_predicates(search_request)
+
+        def build(target: DatasetSnapshot) -> Selection:
+            planner = QueryPlanner(target)
+            return planner.execute(planner.plan(predicates))[0]
+
+        selection = view.selection(key, build)
+        chunk_size = max(settings.EXPORT_CHUNK_SIZE, 1)
+
+        def chunks() -> Iterator[bytes]:
+            if export_format == "csv":
+                yield csv_chunk(view.snapshot.take(slice(0, 0)), header=True)
+            position = -1
+            while True:
+                positions = selection.after(position, chunk_size)
+                if len(positions) == 0:
+                    return
+                rows = view.take(positions)
+                if export_format == "csv":
+                    yield csv_chunk(rows)
+                else:
+                    yield ndjson_chunk(rows)
+                position = int(positions[-1])
+
+        return chunks()
 
     @staticmethod
     def get_transaction_types() -> List[str]:
@@ -181,8 +542,8 @@ class TransactionsService:
         List[str]
             Liste des modes uniques
         """
-        df = data_manager.get_data()
-        return sorted(df["use_chip"].unique().tolist())
+        modes = data_manager.get_view().column("use_chip")
+        return sorted(modes.unique().tolist())
 
     @staticmethod
     def get_recent_transactions(n: int = 10) -> List[Transaction]:
@@ -199,16 +560,63 @@ class TransactionsService:
         List[Transaction]
             Liste des dernières transactions
         """
+        return TransactionsService.get_recent_transactions_page(n).to_transactions()
+
+    @staticmethod
+    def get_recent_transactions_page(n: int = 10) -> TransactionPage:
+        """
+        Récupère les N dernières transactions, avant sérialisation.
+
+        Parameters
+        ----------
+        n : int, optional
+            Nombre de transactions à récupérer (défaut: 10)
+
+        Returns
+        -------
+        TransactionPage
+            Dernières transactions
+        """
         df = data_manager.get_data()
         df_sorted = df.sort_values("date", ascending=False)
         df_recent = df_sorted.head(n)
 
-        return [Transaction(**row.to_dict()) for _, row in df_recent.iterrows()]
+        return TransactionPage(df_recent)
+
+    @staticmethod
+    def ingest_transactions(transactions: List[Transaction]) -> IngestResult:
+        """
+        Ingère de nouvelles transactions.
+
+        Les transactions sont visibles immédiatement par toutes les
+        lectures, et intégrées au dataset à la compaction suivante (voir
+        banking_api.ingestion).
+
+        Parameters
+        ----------
+        transactions : List[Transaction]
+            Transactions à ingérer
+
+        Returns
+        -------
+        IngestResult
+            Nombre de transactions acceptées et en attente
+
+        Raises
+        ------
+        DuplicateTransactionError
+            Si un identifiant existe déjà
+        """
+        return delta_buffer.append(transactions)
 
     @staticmethod
     def delete_transaction(transaction_id: str) -> bool:
         """
-        Supprime une transaction (mode test uniquement).
+        Supprime une transaction.
+
+        La suppression est journalisée, visible immédiatement par toutes
+        les lectures, et intégrée au dataset à la compaction suivante (voir
+        banking_api.ingestion).
 
         Parameters
         ----------
@@ -220,15 +628,10 @@ class TransactionsService:
         bool
             True si supprimé, False sinon
         """
-        # Note: This function is for testing purposes only
-        # In a real environment, it would modify the database
-        df = data_manager.get_data()
-        exists = not df[df["id"] == transaction_id].empty
-
-        if exists:
-            logger.info(f"Transaction {transaction_id} marked for deletion (test mode)")
-
-        return exists
+        deleted = delta_buffer.delete(transaction_id)
+        if deleted:
+            logger.info(f"Transaction {transaction_id} deleted")
+        return deleted
 
     @staticmethod
     def get_transactions_by_customer(customer_id: str, limit: int = 100) -> List[Transaction]:
@@ -247,10 +650,34 @@ class TransactionsService:
         List[Transaction]
             Liste des transactions
         """
-        df = data_manager.get_data()
-        df_filtered = df[df["client_id"] == int(customer_id)].head(limit)
+        return TransactionsService.get_transactions_by_customer_page(
+            customer_id, limit
+        ).to_transactions()
+
+    @staticmethod
+    def get_transactions_by_customer_page(
+        customer_id: str, limit: int = 100
+    ) -> TransactionPage:
+        """
+        Récupère les transactions émises par un client, avant sérialisation.
+
+        Parameters
+        ----------
+        customer_id : str
+            Identifiant du client
+        limit : int
+            Nombre maximum de transactions
 
-        return [Transaction(**row.to_dict()) for _, row in df_filtered.iterrows()]
+        Returns
+        -------
+        TransactionPage
+            Transactions du client
+        """
+        view = data_manager.get_view()
+        positions = view.lookup("client_id", int(customer_id))[:limit]
+
+        frame, rows = view.source(positions)
+        return TransactionPage(frame, positions=rows)
 
     @staticmethod
     def get_transactions_to_merchant(merchant_id: str, limit: int = 100) -> List[Transaction]:
@@ -269,7 +696,31 @@ class TransactionsService:
         List[Transaction]
             Liste des transactions
         """
-        df = data_manager.get_data()
-        df_filtered = df[df["merchant_id"] == int(merchant_id)].head(limit)
+        return TransactionsService.get_transactions_to_merchant_page(
+            merchant_id, limit
+        ).to_transactions()
+
+    @staticmethod
+    def get_transactions_to_merchant_page(
+        merchant_id: str, limit: int = 100
+    ) -> TransactionPage:
+        """
+        Récupère les transactions vers un commerçant, avant sérialisation.
+
+        Parameters
+        ----------
+        merchant_id : str
+            Identifiant du commerçant
+        limit : int
+            Nombre maximum de transactions
+
+        Returns
+        -------
+        TransactionPage
+            Transactions du commerçant
+        """
+        view = data_manager.get_view()
+        positions = view.lookup("merchant_id", int(merchant_id))[:limit]
 
-        return [Transaction(**row.to_dict()) for _, row in df_filtered.iterrows()]
+        frame, rows = view.source(positions)
+        return TransactionPage(frame, positions=rows)
@@ -0,0 +1,352 @@
+"""
+Journal d'écriture anticipée (write-ahead log) des modifications de l'API.
+
+Chaque modification acceptée par l'API (ingestion, suppression) est
+ajoutée au journal et synchronisée sur disque avant d'être acquittée :
+elle survit à un redémarrage sans réécrire le fichier CSV.
+
+Le journal est un répertoire de segments binaires en ajout seul. Un
+enregistrement se compose d'un en-tête fixe (CRC32, numéro, type,
+longueur) suivi de sa charge utile JSON ; un enregistrement tronqué ou
+corrompu (écriture interrompue par un arrêt brutal) termine la lecture
+de son segment. Chaque ouverture du journal commence un nouveau segment,
+et les segments entièrement intégrés à un point de reprise sont supprimés
+(voir DeltaBuffer.checkpoint).
+
+Les écritures sont regroupées (group commit) : pendant qu'un écrivain
+synchronise le fichier, les enregistrements suivants s'accumulent et sont
+écrits puis synchronisés ensemble par l'écrivain suivant. Le débit
+d'ingestion n'est donc pas limité par le nombre de fsync par seconde.
+"""
+
+import logging
+import os
+import re
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Types d'enregistrement
+RECORD_INSERT: int = 1
+RECORD_DELETE: int = 2
+
+# En-tête de fichier d'un segment
+_MAGIC: bytes = b"BKWAL001"
+
+# CRC32 puis (numéro, type, longueur de la charge utile)
+_CRC = struct.Struct("<I")
+_FIELDS = struct.Struct("<QBI")
+_HEADER_SIZE: int = _CRC.size + _FIELDS.size
+
+_SEGMENT_PATTERN = re.compile(r"^segment-(\d+)\.log$")
+
+
+class LogRecord(NamedTuple):
+    """Enregistrement du journal."""
+
+    lsn: int
+    kind: int
+    payload: bytes
+
+
+def _encode(lsn: int, kind: int, payload: bytes) -> bytes:
+    """
+    Encode un enregistrement.
+
+    Parameters
+    ----------
+    lsn : int
+        Numéro de l'enregistrement
+    kind : int
+        Type de l'enregistrement (RECORD_INSERT ou RECORD_DELETE)
+    payload : bytes
+        Charge utile
+
+    Returns
+    -------
+    bytes
+        Enregistrement prêt à être écrit
+    """
+    fields = _FIELDS.pack(lsn, kind, len(payload))
+    return _CRC.pack(zlib.crc32(fields + payload)) + fields + payload
+
+
+def read_segment(path: Path) -> Iterator[LogRecord]:
+    """
+    Lit les enregistrements valides d'un segment.
+
+    Parameters
+    ----------
+    path : Path
+        Fichier du segment
+
+    Yields
+    ------
+    LogRecord
+        Enregistrements, dans l'ordre d'écriture, jusqu'au premier
+        enregistrement tronqué ou corrompu
+    """
+    data = path.read_bytes()
+    if not data.startswith(_MAGIC):
+        if data:
+            logger.warning(f"Ignoring invalid log segment {path}")
+        return
+    offset = len(_MAGIC)
+    while offset < len(data):
+        end = offset + _HEADER_SIZE
+        if end <= len(data):
+            (crc,) = _CRC.unpack_from(data, offset)
+            lsn, kind, length = _FIELDS.unpack_from(data, offset + _CRC.size)
+            end += length
+        if end > len(data) or zlib.crc32(data[offset + _CRC.size:end]) != crc:
+            logger.warning(
+                f"Truncated log record in {path} at offset {offset}, "
+                "ignoring the end of the segment"
+            )
+            return
+        yield LogRecord(lsn, kind, data[end - length:end])
+        offset = end
+
+
+class WriteAheadLog:
+    """
+    Journal en ajout seul, synchronisé par lots.
+
+    Attributes
+    ----------
+    directory : Path
+        Répertoire des segments
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initialise le journal.
+
+        Parameters
+        ----------
+        directory : str
+            Répertoire des segments
+        """
+        self.directory = Path(directory)
+        self._file: Optional[BinaryIO] = None
+        self._path: Optional[Path] = None
+        self._number = 0
+        # Plus grand numéro écrit dans chaque segment
+        self._segments: Dict[Path, int] = {}
+        self._queue: List[Tuple[int, bytes]] = []
+        self._enqueued = 0
+        self._synced = 0
+        self._flushing = False
+        self._error: Optional[OSError] = None
+        self._cond = threading.Condition()
+        self._records = 0
+        self._syncs = 0
+
+    def open(self) -> List[LogRecord]:
+        """
+        Lit les segments existants puis commence un nouveau segment.
+
+        Returns
+        -------
+        List[LogRecord]
+            Enregistrements valides des segments existants
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        numbered = sorted(
+            (int(match.group(1)), path)
+            for path in self.directory.iterdir()
+            if (match := _SEGMENT_PATTERN.match(path.name))
+        )
+        records: List[LogRecord] = []
+        for _, path in numbered:
+            segment = list(read_segment(path))
+            self._segments[path] = max((r.lsn for r in segment), default=0)
+            records.extend(segment)
+        with self._cond:
+            self._start_segment(numbered[-1][0] + 1 if numbered else 1)
+        logger.info(f"Opened write-ahead log {self.directory}: {len(records)} records")
+        return records
+
+    def append(self, lsn: int, kind: int, payload: bytes) -> None:
+        """
+        Ajoute un enregistrement et attend sa synchronisation sur disque.
+
+        Le premier écrivain qui trouve le fichier libre écrit et synchronise
+        tous les enregistrements en attente ; les autres attendent la fin
+        de cette synchronisation ou prennent le relais pour les suivants.
+
+        Parameters
+        ----------
+        lsn : int
+            Numéro de l'enregistrement
+        kind : int
+            Type de l'enregistrement
+        payload : bytes
+            Charge utile
+
+        Raises
+        ------
+        OSError
+            Si le journal est fermé ou si une écriture a échoué
+        """
+        record = _encode(lsn, kind, payload)
+        with self._cond:
+            self._check()
+            self._queue.append((lsn, record))
+            self._enqueued += 1
+            ticket = self._enqueued
+            while self._synced < ticket:
+                self._check()
+                if self._flushing:
+                    self._cond.wait()
+                else:
+                    self._flush()
+
+    def rotate(self) -> None:
+        """Commence un nouveau segment : les précédents deviennent supprimables."""
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self._check()
+            self._close_file()
+            self._start_segment(self._number + 1)
+
+    def remove(self, lsn: int) -> int:
+        """
+        Supprime les segments fermés dont tous les enregistrements ont un
+        numéro inférieur ou égal à lsn.
+
+        Parameters
+        ----------
+        lsn : int
+            Numéro du dernier enregistrement intégré au point de reprise
+
+        Returns
+        -------
+        int
+            Nombre de segments supprimés
+        """
+        with self._cond:
+            removable = [
+                path
+                for path, last in self._segments.items()
+                if path != self._path and last <= lsn
+            ]
+            for path in removable:
+                del self._segments[path]
+        for path in removable:
+            path.unlink(missing_ok=True)
+        return len(removable)
+
+    def size(self) -> int:
+        """
+        Retourne la taille totale des segments.
+
+        Returns
+        -------
+        int
+            Taille en octets
+        """
+        with self._cond:
+            paths = list(self._segments)
+        return sum(path.stat().st_size for path in paths if path.exists())
+
+    def close(self) -> None:
+        """Ferme le journal après la synchronisation en cours."""
+        with self._cond:
+            while self._flushing:
+                self._cond.wait()
+            self._close_file()
+            self._cond.notify_all()
+
+    def metrics(self) -> Tuple[int, int]:
+        """
+        Retourne les compteurs du journal.
+
+        Returns
+        -------
+        Tuple[int, int]
+            Enregistrements écrits et synchronisations effectuées
+        """
+        with self._cond:
+            return self._records, self._syncs
+
+    def _check(self) -> None:
+        """
+        Vérifie que le journal accepte des écritures (appelé sous _cond).
+
+        Raises
+        ------
+        OSError
+            Si le journal est fermé ou si une écriture a échoué
+        """
+        if self._error is not None:
+            raise OSError(f"Write-ahead log unavailable: {self._error}")
+        if self._file is None:
+            raise OSError("Write-ahead log is closed")
+
+    def _flush(self) -> None:
+        """
+        Écrit et synchronise les enregistrements en attente (appelé sous
+        _cond, relâché pendant l'écriture).
+        """
+        batch, self._queue = self._queue, []
+        target = self._enqueued
+        file, path = self._file, self._path
+        assert file is not None and path is not None
+        self._flushing = True
+        self._cond.release()
+        error: Optional[OSError] = None
+        try:
+            file.write(b"".join(record for _, record in batch))
+            file.flush()
+            os.fsync(file.fileno())
+        except OSError as e:
+            error = e
+        finally:
+            self._cond.acquire()
+        self._flushing = False
+        if error is not None:
+            # Contenu du fichier incertain : plus aucune écriture acceptée
+            logger.error(f"Error writing to the write-ahead log: {str(error)}")
+            self._error = error
+        else:
+            self._synced = target
+            self._records += len(batch)
+            self._syncs += 1
+            last = max(lsn for lsn, _ in batch)
+            self._segments[path] = max(self._segments.get(path, 0), last)
+        self._cond.notify_all()
+
+    def _start_segment(self, number: int) -> None:
+        """
+        Crée un segment et y dirige les écritures (appelé sous _cond).
+
+        Parameters
+        ----------
+        number : int
+            Numéro du segment
+        """
+        path = self.directory / f"segment-{number:08d}.log"
+        file = open(path, "xb")
+        file.write(_MAGIC)
+        file.flush()
+        os.fsync(file.fileno())
+        # Entrée de répertoire durable avant le premier acquittement
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        self._file, self._path, self._number = file, path, number
+        self._segments[path] = 0
+
+    def _close_file(self) -> None:
+        """Ferme le segment courant (appelé sous _cond)."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
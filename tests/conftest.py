@@ -4,7 +4,10 @@ Configuration des fixtures pytest.
 Ce module définit les fixtures communes utilisées dans les tests.
 """
 
+from typing import Iterator
+
 import pytest
+import numpy as np
 import pandas as pd
 from fastapi.testclient import TestClient
 from banking_api.main import create_app
@@ -38,6 +41,42 @@ def sample_data() -> pd.DataFrame:
     return pd.DataFrame(data)
 
 
+@pytest.fixture(scope="session")
+def random_data() -> pd.DataFrame:
+    """
+    Crée un jeu de données aléatoire plus volumineux.
+
+    Utilisé pour comparer les chemins indexés aux filtres par masque.
+
+    Returns
+    -------
+    pd.DataFrame
+        DataFrame de 5000 transactions fictives
+    """
+    rng = np.random.default_rng(42)
+    size = 5000
+    return pd.DataFrame(
+        {
+            "id": [f"tx_{i:05d}" for i in range(size)],
+            "date": [f"2019-01-{1 + i % 28:02d} 10:00:00" for i in range(size)],
+            "client_id": rng.integers(1, 300, size),
+            "card_id": rng.integers(1, 50, size),
+            "amount": np.round(rng.normal(50, 200, size), 2),
+            "use_chip": rng.choice(
+                ["Swipe Transaction", "Chip Transaction", "Online Transaction"],
+                size,
+                p=[0.6, 0.3, 0.1],
+            ),
+            "merchant_id": rng.integers(1, 100, size),
+            "merchant_city": rng.choice(["Dallas", "Austin", "Miami"], size),
+            "merchant_state": rng.choice(["TX", "FL", "CA", "NY", "WA"], size),
+            "zip": rng.integers(10000, 99999, size),
+            "mcc": rng.choice([5411, 5812, 5999, 6011], size),
+            "errors": rng.choice(["", "", "", "Bad PIN", "Bad PIN,Bad CVV"], size),
+        }
+    )
+
+
 @pytest.fixture(scope="session")
 def setup_test_data(sample_data: pd.DataFrame) -> None:
     """
@@ -69,3 +108,29 @@ def client(setup_test_data: None) -> TestClient:
     """
     app = create_app()
     return TestClient(app)
+
+
+@pytest.fixture
+def random_client(
+    client: TestClient, random_data: pd.DataFrame, sample_data: pd.DataFrame
+) -> Iterator[TestClient]:
+    """
+    Client de test servant le dataset aléatoire.
+
+    Parameters
+    ----------
+    client : TestClient
+        Client de test FastAPI
+    random_data : pd.DataFrame
+        DataFrame aléatoire
+    sample_data : pd.DataFrame
+        DataFrame de test, republié en fin de test
+
+    Yields
+    ------
+    TestClient
+        Client de test FastAPI
+    """
+    data_manager._publish(random_data)
+    yield client
+    data_manager._publish(sample_data)
@@ -0,0 +1,86 @@
+"""
+Tests unitaires pour le contrôle d'admission.
+
+Ce module teste les limites de concurrence, les files d'attente bornées
+et le rejet des requêtes en 503.
+"""
+
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.admission import AdmissionGate, OverloadedError, gates
+
+
+class TestAdmissionGate:
+    """Tests de la porte d'admission d'une classe d'endpoints."""
+
+    def test_queue_and_handoff(self) -> None:
+        """Teste l'attente, la transmission de place et le rejet file pleine."""
+        gate = AdmissionGate("test", limit=1, queue_size=1, timeout=1)
+
+        async def scenario() -> None:
+            await gate.acquire()
+            waiting = asyncio.ensure_future(gate.acquire())
+            await asyncio.sleep(0)
+            assert gate.metrics().queued == 1
+
+            with pytest.raises(OverloadedError):
+                await gate.acquire()
+
+            gate.release()
+            await waiting
+            assert gate.metrics().active == 1
+            gate.release()
+
+        asyncio.run(scenario())
+        metrics = gate.metrics()
+        assert metrics.active == 0
+        assert metrics.queued == 0
+        assert metrics.admitted == 2
+        assert metrics.rejected == 1
+
+    def test_deadline(self) -> None:
+        """Teste le rejet d'une requête qui ne démarre pas avant son délai."""
+        gate = AdmissionGate("test", limit=1, queue_size=4, timeout=0.01)
+
+        async def scenario() -> None:
+            await gate.acquire()
+            with pytest.raises(OverloadedError) as error:
+                await gate.acquire()
+            assert error.value.retry_after == 1
+            gate.release()
+
+        asyncio.run(scenario())
+        assert gate.metrics().queued == 0
+        assert gate.metrics().active == 0
+
+
+class TestAdmissionRoutes:
+    """Tests du rejet des requêtes par les routes."""
+
+    def test_saturated_class_returns_503(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Teste qu'une classe saturée répond 503 sans affecter les autres.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de saturation de la porte
+        """
+        gate = gates["search"]
+        monkeypatch.setattr(gate, "_active", gate.limit)
+        monkeypatch.setattr(gate, "queue_size", 0)
+
+        response = client.post("/api/transactions/search", json={})
+        assert response.status_code == 503
+        assert response.headers["retry-after"] == str(gate.retry_after)
+
+        assert client.get("/api/transactions/tx_0001").status_code == 200
+        metrics = client.get("/api/system/metrics").json()["admission"]
+        search = next(item for item in metrics if item["name"] == "search")
+        assert search["rejected"] >= 1
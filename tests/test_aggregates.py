@@ -0,0 +1,113 @@
+"""
+Tests unitaires pour les agrégats matérialisés.
+
+Ce module compare les agrégats calculés au chargement à un calcul direct
+sur le DataFrame.
+"""
+
+import pandas as pd
+import pytest
+from banking_api.aggregates import DatasetAggregates
+from banking_api.data_manager import data_manager
+from banking_api.schema import apply_schema
+
+
+class TestDatasetAggregates:
+    """Tests des agrégats d'un instantané."""
+
+    def test_matches_direct_computation(self, random_data: pd.DataFrame) -> None:
+        """
+        Teste que les agrégats correspondent à un calcul direct.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        aggregates = DatasetAggregates(apply_schema(random_data))
+        amount = random_data["amount"]
+
+        overview = aggregates.overview
+        assert overview.total_transactions == len(random_data)
+        assert overview.fraud_rate == pytest.approx((amount < 0).mean())
+        assert overview.avg_amount == pytest.approx(amount.mean())
+        assert overview.most_common_type == random_data["use_chip"].mode()[0]
+
+        by_type = {stats.use_chip: stats for stats in aggregates.stats_by_type}
+        assert list(by_type) == list(random_data["use_chip"].unique())
+        for chip_type, group in amount.groupby(random_data["use_chip"]):
+            assert by_type[chip_type].count == len(group)
+            assert by_type[chip_type].total_amount == pytest.approx(group.sum())
+            assert by_type[chip_type].avg_amount == pytest.approx(group.mean())
+
+        fraud = {stats.use_chip: stats for stats in aggregates.fraud_by_type}
+        for chip_type, group in amount.groupby(random_data["use_chip"]):
+            assert fraud[chip_type].suspicious_count == int((group < 0).sum())
+
+        days = pd.to_datetime(random_data["date"]).dt.date.astype(str)
+        daily = amount.groupby(days).agg(["count", "sum"])
+        assert [stats.date for stats in aggregates.daily_stats] == list(daily.index)
+        assert [stats.count for stats in aggregates.daily_stats] == list(
+            daily["count"]
+        )
+
+        summary = aggregates.fraud_summary
+        assert summary.suspicious_count == int(
+            ((amount < 0) | (amount.abs() > 5000)).sum()
+        )
+        assert summary.high_risk_count == int((amount < -1000).sum())
+
+    def test_extend_matches_rebuild(self, random_data: pd.DataFrame) -> None:
+        """
+        Teste que les agrégats prolongés sont identiques à un recalcul.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        head = DatasetAggregates(apply_schema(random_data.iloc[:3000]))
+        extended = head.extend(apply_schema(random_data.iloc[3000:]))
+        expected = DatasetAggregates(apply_schema(random_data))
+
+        assert extended.overview == expected.overview
+        assert extended.stats_by_type == expected.stats_by_type
+        assert extended.fraud_by_type == expected.fraud_by_type
+        assert extended.daily_stats == expected.daily_stats
+        assert extended.fraud_summary == expected.fraud_summary
+        assert head.overview.total_transactions == 3000
+
+    def test_empty_dataset(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste les agrégats d'un dataset vide.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        aggregates = DatasetAggregates(apply_schema(sample_data.iloc[:0]))
+        assert aggregates.overview.total_transactions == 0
+        assert aggregates.overview.most_common_type == "N/A"
+        assert aggregates.stats_by_type == []
+        assert aggregates.daily_stats == []
+        assert aggregates.fraud_summary.suspicious_rate == 0.0
+
+    def test_follow_snapshot(
+        self, random_data: pd.DataFrame, sample_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste que les agrégats sont recalculés à chaque publication.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        data_manager._loaded = True
+        snapshot = data_manager._publish(random_data)
+        assert snapshot.aggregates.overview.total_transactions == len(random_data)
+        snapshot = data_manager._publish(sample_data)
+        assert snapshot.aggregates.overview.total_transactions == len(sample_data)
@@ -0,0 +1,97 @@
+"""
+Tests unitaires pour le cache colonnaire.
+
+Ce module teste l'écriture et la relecture du dataset depuis le cache.
+"""
+
+from pathlib import Path
+
+import pandas as pd
+from banking_api.columnar_cache import ColumnarCache
+from banking_api.data_manager import DataManager
+
+CSV_CONTENT = (
+    "id,date,client_id,card_id,amount,use_chip,merchant_id,merchant_city,"
+    "merchant_state,zip,mcc,errors\n"
+    "7475327,2010-01-01 00:01:00,1556,2972,$-77.00,Swipe Transaction,59935,"
+    "Beula,TX,78344.0,5499,\n"
+    "7475328,2010-01-01 00:02:00,561,4575,$14.57,Online Transaction,67570,"
+    "ONLINE,,,5311,Bad PIN\n"
+    "7475329,2010-01-01 00:02:00,1129,102,$80.00,Chip Transaction,27092,"
+    "Vista,CA,92084.0,4829,nan\n"
+)
+
+
+def _write_csv(tmp_path: Path) -> str:
+    """
+    Écrit le fichier CSV de test.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Répertoire temporaire
+
+    Returns
+    -------
+    str
+        Chemin du fichier CSV
+    """
+    csv_file = tmp_path / "transactions.csv"
+    csv_file.write_text(CSV_CONTENT, encoding="utf-8")
+    return str(csv_file)
+
+
+class TestColumnarCache:
+    """Tests du cache colonnaire."""
+
+    def test_load_without_snapshot(self, tmp_path: Path) -> None:
+        """
+        Teste qu'un cache vide ne retourne rien.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        """
+        csv_path = _write_csv(tmp_path)
+        cache = ColumnarCache(str(tmp_path / "snapshot"))
+        assert cache.load(csv_path) is None
+
+    def test_round_trip(self, tmp_path: Path) -> None:
+        """
+        Teste que le cache restitue le DataFrame nettoyé.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        """
+        csv_path = _write_csv(tmp_path)
+        expected = DataManager._read_csv(csv_path)
+        cache = ColumnarCache(str(tmp_path / "snapshot"))
+        cache.save(csv_path, expected)
+
+        loaded = cache.load(csv_path)
+        assert loaded is not None
+        pd.testing.assert_frame_equal(loaded, expected, check_dtype=False)
+
+    def test_stale_snapshot_is_ignored(self, tmp_path: Path) -> None:
+        """
+        Teste qu'un CSV modifié invalide le cache.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        """
+        csv_path = _write_csv(tmp_path)
+        cache = ColumnarCache(str(tmp_path / "snapshot"))
+        cache.save(csv_path, DataManager._read_csv(csv_path))
+
+        with open(csv_path, "a", encoding="utf-8") as f:
+            f.write(
+                "7475330,2010-01-01 00:05:00,1,1,$1.00,Chip Transaction,1,X,NY,"
+                "1.0,1,\n"
+            )
+
+        assert cache.load(csv_path) is None
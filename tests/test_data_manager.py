@@ -0,0 +1,378 @@
+"""
+Tests unitaires pour le gestionnaire de données.
+
+Ce module teste les instantanés en lecture seule du DataManager.
+"""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+from typing import Iterator
+
+import numpy as np
+import pandas as pd
+import pytest
+from banking_api.columnar_cache import ColumnarCache
+from banking_api.data_manager import DataManager, DatasetSnapshot, data_manager
+from banking_api.executor import compute_pool
+from banking_api.schema import AMOUNT_COLUMN, apply_schema
+
+
+class TestDatasetSnapshot:
+    """Tests des instantanés du dataset."""
+
+    def test_get_data_is_zero_copy(self, setup_test_data: None) -> None:
+        """
+        Teste que get_data partage la mémoire de l'instantané.
+
+        Parameters
+        ----------
+        setup_test_data : None
+            Fixture de données de test
+        """
+        first = data_manager.get_data()
+        second = data_manager.get_data()
+        assert np.shares_memory(
+            first["client_id"].to_numpy(), second["client_id"].to_numpy()
+        )
+
+    def test_snapshot_is_read_only(self, setup_test_data: None) -> None:
+        """
+        Teste qu'une modification en place échoue explicitement.
+
+        Parameters
+        ----------
+        setup_test_data : None
+            Fixture de données de test
+        """
+        df = data_manager.get_data()
+        with pytest.raises(ValueError):
+            df.loc[df.index[0], "client_id"] = 0
+
+    def test_added_columns_stay_local(self, setup_test_data: None) -> None:
+        """
+        Teste que l'ajout d'une colonne ne modifie pas l'instantané partagé.
+
+        Parameters
+        ----------
+        setup_test_data : None
+            Fixture de données de test
+        """
+        df = data_manager.get_data()
+        df["extra"] = 1
+        assert "extra" not in data_manager.get_data().columns
+
+    def test_publish_increments_version(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste que chaque publication incrémente la version.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        data_manager._loaded = True
+        before = data_manager.get_version()
+        snapshot = data_manager._publish(sample_data)
+        assert snapshot.version == before + 1
+        assert data_manager.get_version() == snapshot.version
+        assert len(snapshot) == len(sample_data)
+
+    def test_id_index_follows_snapshot(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste que l'index des identifiants est reconstruit à chaque version.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        reordered = sample_data.iloc[::-1].reset_index(drop=True)
+        snapshot = data_manager._publish(reordered)
+        assert snapshot.id_index is not None
+        assert snapshot.id_index.lookup("tx_0001") == len(sample_data) - 1
+
+        snapshot = data_manager._publish(sample_data)
+        assert snapshot.id_index is not None
+        assert snapshot.id_index.lookup("tx_0001") == 0
+
+
+class TestAtomicSwap:
+    """Tests de la publication atomique des versions."""
+
+    def test_reader_keeps_its_version(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste qu'un lecteur conserve sa version pendant une publication.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        data_manager._loaded = True
+        held = data_manager._publish(sample_data)
+        data_manager._publish(sample_data.iloc[:1])
+
+        assert len(held) == len(sample_data)
+        assert len(data_manager.get_snapshot()) == 1
+        assert data_manager.get_snapshot(held.version) is held
+
+    def test_concurrent_readers(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste que les lecteurs ne voient jamais un instantané incomplet.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        data_manager._loaded = True
+        data_manager._publish(sample_data)
+        sizes = {len(sample_data), 1}
+        stop = threading.Event()
+        errors = []
+        versions = []
+
+        def reader() -> None:
+            last = 0
+            while not stop.is_set() and len(versions) < 2000:
+                snapshot = data_manager.get_snapshot()
+                if snapshot.version < last or len(snapshot) not in sizes:
+                    errors.append(snapshot.version)
+                if data_manager.get_snapshot(snapshot.version) is not snapshot:
+                    errors.append(snapshot.version)
+                last = snapshot.version
+                versions.append(last)
+                time.sleep(0)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for i in range(20):
+            data_manager._publish(sample_data if i % 2 else sample_data.iloc[:1])
+        stop.set()
+        for thread in threads:
+            thread.join(5)
+
+        assert errors == []
+        assert versions
+
+    def test_pinned_snapshot(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste qu'une requête lit l'instantané fixé, y compris dans le pool.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        data_manager._loaded = True
+        data_manager._publish(sample_data)
+        with data_manager.pinned() as held:
+            data_manager._publish(sample_data.iloc[:1])
+            assert data_manager.get_snapshot() is held.snapshot
+            assert data_manager.get_version() == held.snapshot.version
+            assert asyncio.run(compute_pool.run(data_manager.get_view)) is held
+        assert len(data_manager.get_snapshot()) == 1
+        data_manager._publish(sample_data)
+
+    def test_assigning_data_publishes(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste que l'affectation de _data publie une nouvelle version.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        before = data_manager.get_version()
+        data_manager._data = sample_data
+        assert data_manager.get_version() == before + 1
+        assert data_manager._data is data_manager.get_snapshot()._frame
+
+
+class TestDeadRows:
+    """Tests des ajouts en place et des lignes mortes."""
+
+    def test_appends_share_storage(
+        self, random_data: pd.DataFrame, sample_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste que les ajouts successifs ne recopient pas les lignes publiées.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        data_manager._loaded = True
+        data_manager._publish(random_data.iloc[:1000])
+        first = data_manager._append(apply_schema(random_data.iloc[1000:1010]))
+        second = data_manager._append(apply_schema(random_data.iloc[1010:1020]))
+        assert len(second) == 1020
+        assert second.layout == first.layout
+        for name in (AMOUNT_COLUMN, "id", "use_chip"):
+            before, after = first.column(name), second.column(name)
+            if isinstance(before.dtype, pd.CategoricalDtype):
+                before, after = before.cat.codes, after.cat.codes
+            assert np.shares_memory(before.to_numpy(), after.to_numpy())
+        assert second.column("id").tolist() == random_data["id"].iloc[:1020].tolist()
+        data_manager._data = sample_data
+
+    def test_removed_rows_stay_until_purge(
+        self, random_data: pd.DataFrame, sample_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste que les lignes retirées restent en place, puis sont purgées.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        data_manager._loaded = True
+        published = data_manager._publish(random_data)
+        removed = ["tx_00001", "tx_04000"]
+        snapshot = data_manager._append(pd.DataFrame(), removed=removed)
+        live = random_data[~random_data["id"].isin(removed)]
+        expected = DatasetSnapshot(apply_schema(live.reset_index(drop=True)), 0)
+        assert len(snapshot) == len(random_data)
+        assert snapshot.layout == published.layout
+        assert snapshot.dead.tolist() == [1, 4000]
+        assert snapshot.locate("tx_04000") is None
+        assert snapshot.locate("tx_04001") == 4001
+        assert snapshot.aggregates.overview == expected.aggregates.overview
+        assert len(data_manager.get_view()) == len(live)
+
+        # Au-delà de DEAD_ROWS_RATIO, les lignes mortes sont purgées
+        many = random_data["id"].iloc[:600].tolist()
+        purged = data_manager._append(pd.DataFrame(), removed=many)
+        assert len(purged) == len(random_data) - 601
+        assert len(purged.dead) == 0
+        assert purged.layout != published.layout
+        assert purged.locate("tx_04001") == 4001 - 601
+        data_manager._data = sample_data
+
+
+@pytest.fixture
+def appended_file(
+    tmp_path: Path, random_data: pd.DataFrame, sample_data: pd.DataFrame
+) -> Iterator[Path]:
+    """
+    Charge les premières lignes du dataset aléatoire depuis un fichier CSV.
+
+    Les données de test de la session sont republiées ensuite.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Répertoire temporaire
+    random_data : pd.DataFrame
+        DataFrame aléatoire
+    sample_data : pd.DataFrame
+        DataFrame de test
+
+    Yields
+    ------
+    Path
+        Chemin du fichier CSV chargé
+    """
+    path = tmp_path / "transactions_data.csv"
+    random_data.iloc[:4000].to_csv(path, index=False)
+    data_manager.load_data(str(path), snapshot_dir=str(tmp_path / "snapshot"))
+    yield path
+    data_manager._data = sample_data
+
+
+class TestTailIngestion:
+    """Tests de l'intégration incrémentale des lignes ajoutées au fichier."""
+
+    def test_appended_rows_match_full_load(
+        self, appended_file: Path, random_data: pd.DataFrame, tmp_path: Path
+    ) -> None:
+        """
+        Teste que l'ajout incrémental équivaut à un chargement complet.
+
+        Parameters
+        ----------
+        appended_file : Path
+            Fichier CSV chargé
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        tmp_path : Path
+            Répertoire temporaire
+        """
+        version = data_manager.get_version()
+        random_data.iloc[4000:].to_csv(
+            appended_file, mode="a", header=False, index=False
+        )
+        snapshot = data_manager.reload()
+
+        expected = DatasetSnapshot(DataManager._read_csv(str(appended_file)), 0)
+        assert snapshot.version == version + 1
+        assert len(snapshot) == len(random_data)
+        assert snapshot.aggregates.overview == expected.aggregates.overview
+        assert snapshot.aggregates.daily_stats == expected.aggregates.daily_stats
+        assert snapshot.id_index is not None
+        assert snapshot.id_index.lookup("tx_04999") == 4999
+        assert snapshot.client_index is not None and expected.client_index is not None
+        assert (
+            snapshot.client_index.lookup(7).tolist()
+            == expected.client_index.lookup(7).tolist()
+        )
+        for name in expected.data.columns:
+            assert snapshot.column(name).tolist() == expected.column(name).tolist()
+
+        # Le cache colonnaire a été prolongé
+        cached = ColumnarCache(str(tmp_path / "snapshot")).load(str(appended_file))
+        assert cached is not None
+        assert cached["id"].tolist() == expected.column("id").tolist()
+        assert cached["use_chip"].tolist() == expected.column("use_chip").tolist()
+
+    def test_incomplete_line_waits(
+        self, appended_file: Path, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste qu'une ligne en cours d'écriture est intégrée une fois complète.
+
+        Parameters
+        ----------
+        appended_file : Path
+            Fichier CSV chargé
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        version = data_manager.get_version()
+        line = random_data.iloc[4000:4001].to_csv(header=False, index=False)
+        with open(appended_file, "a") as f:
+            f.write(line[:10])
+        assert data_manager.reload().version == version
+
+        with open(appended_file, "a") as f:
+            f.write(line[10:])
+        snapshot = data_manager.reload()
+        assert snapshot.version == version + 1
+        assert len(snapshot) == 4001
+
+    def test_rewritten_file_is_fully_reloaded(
+        self, appended_file: Path, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste qu'un fichier réécrit est relu entièrement.
+
+        Parameters
+        ----------
+        appended_file : Path
+            Fichier CSV chargé
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        random_data.iloc[1000:5000].to_csv(appended_file, index=False)
+        snapshot = data_manager.reload()
+        assert len(snapshot) == 4000
+        assert snapshot.column("id").iloc[0] == "tx_01000"
@@ -0,0 +1,121 @@
+"""
+Tests unitaires pour le budget de temps des requêtes.
+
+Ce module teste les échéances, le découpage des traitements en blocs et
+les réponses 504 des routes.
+"""
+
+import threading
+import time
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.deadline import (
+    Deadline,
+    QueryCancelledError,
+    QueryTimeoutError,
+    _current,
+    budgeted_chunks,
+    check_deadline,
+)
+from banking_api.services.single_flight import SingleFlight
+from banking_api.services.transactions_service import TransactionsService
+
+
+class TestDeadline:
+    """Tests des échéances et de l'annulation coopérative."""
+
+    def test_timeout_and_cancel(self) -> None:
+        """Teste l'expiration et l'annulation d'une échéance."""
+        Deadline(60).check()
+        with pytest.raises(QueryTimeoutError):
+            Deadline(-1).check()
+
+        deadline = Deadline(60)
+        deadline.cancel()
+        with pytest.raises(QueryCancelledError):
+            deadline.check()
+
+    def test_chunks_stop_when_expired(self) -> None:
+        """Teste que le découpage s'interrompt à l'échéance."""
+        assert list(budgeted_chunks(5, chunk_rows=2)) == [
+            slice(0, 2),
+            slice(2, 4),
+            slice(4, 5),
+        ]
+
+        token = _current.set(Deadline(-1))
+        try:
+            with pytest.raises(QueryTimeoutError):
+                next(budgeted_chunks(5, chunk_rows=2))
+        finally:
+            _current.reset(token)
+        check_deadline()
+
+    def test_aborted_flight_is_taken_over(self) -> None:
+        """Teste qu'un calcul abandonné est repris par la requête en attente."""
+        flights = SingleFlight()
+        started = threading.Event()
+        results = []
+
+        def abandoned() -> str:
+            started.set()
+            time.sleep(0.1)
+            raise QueryCancelledError("gone")
+
+        def leader() -> None:
+            with pytest.raises(QueryCancelledError):
+                flights.do("key", abandoned)
+
+        thread = threading.Thread(target=leader)
+        thread.start()
+        started.wait(5)
+        results.append(flights.do("key", lambda: "recomputed"))
+        thread.join(5)
+
+        assert results == ["recomputed"]
+        assert flights.metrics().executions == 2
+
+
+class TestBudgetRoutes:
+    """Tests des réponses des routes soumises à un budget."""
+
+    def test_search_timeout_returns_504(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Teste qu'une recherche qui dépasse son budget répond 504.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de ralentissement de la recherche
+        """
+        search_page = TransactionsService.search_transactions_page
+
+        def slow_search(*args: Any, **kwargs: Any) -> Any:
+            time.sleep(0.02)
+            check_deadline()
+            return search_page(*args, **kwargs)
+
+        monkeypatch.setattr(
+            TransactionsService, "search_transactions_page", slow_search
+        )
+        response = client.post(
+            "/api/transactions/search",
+            json={"use_chip": "Chip Transaction"},
+            headers={"X-Query-Timeout-Ms": "1"},
+            params={"explain": True},
+        )
+        assert response.status_code == 504
+        assert "time budget" in response.json()["detail"]
+
+        response = client.post(
+            "/api/transactions/search",
+            json={"use_chip": "Chip Transaction"},
+            params={"explain": True},
+        )
+        assert response.status_code == 200
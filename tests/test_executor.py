@@ -0,0 +1,71 @@
+"""
+Tests unitaires pour le pool des traitements bloquants.
+
+Ce module vérifie que les traitements bloquants ne figent pas la boucle
+d'événements.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.executor import ComputePool
+
+
+class TestComputePool:
+    """Tests du pool de threads."""
+
+    def test_loop_stays_responsive(self) -> None:
+        """Teste que la boucle progresse pendant un traitement bloquant."""
+        pool = ComputePool(2)
+        ticks = []
+
+        async def ticker() -> None:
+            for _ in range(5):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        async def scenario() -> str:
+            result, _ = await asyncio.gather(
+                pool.run(lambda: time.sleep(0.2) or threading.current_thread().name),
+                ticker(),
+            )
+            return result
+
+        started = time.monotonic()
+        thread_name = asyncio.run(scenario())
+        assert thread_name.startswith("compute")
+        assert len(ticks) == 5
+        assert ticks[-1] - started < 0.15
+
+        metrics = pool.metrics()
+        assert metrics.completed == 1
+        assert metrics.active == 0
+        assert metrics.queued == 0
+
+    def test_exceptions_propagate(self) -> None:
+        """Teste que l'exception d'un traitement est propagée à l'appelant."""
+        pool = ComputePool(1)
+
+        def fail() -> None:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            asyncio.run(pool.run(fail))
+        assert pool.metrics().completed == 1
+
+    def test_metrics_endpoint(self, client: TestClient) -> None:
+        """
+        Teste l'exposition des compteurs du pool.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        client.get("/api/transactions")
+        metrics = client.get("/api/system/metrics").json()["compute_pool"]
+        assert metrics["workers"] >= 1
+        assert metrics["completed"] >= 1
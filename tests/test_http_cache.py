@@ -0,0 +1,129 @@
+"""
+Tests unitaires pour les requêtes HTTP conditionnelles.
+
+Ce module teste les ETags, les réponses 304 et l'en-tête Cache-Control.
+"""
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.config import settings
+from banking_api.data_manager import data_manager
+from banking_api.http_cache import etag_matches
+from banking_api.models import StatsOverview
+from banking_api.services.stats_service import StatsService
+
+
+class TestConditionalRequests:
+    """Tests des ETags liés à la version du dataset."""
+
+    def test_etag_matches(self) -> None:
+        """Teste la comparaison faible des ETags."""
+        assert etag_matches('"1-ab"', '"1-ab"')
+        assert etag_matches('"1-ab"', 'W/"1-ab", "2-cd"')
+        assert etag_matches('"1-ab"', "*")
+        assert not etag_matches('"1-ab"', '"2-ab"')
+        assert not etag_matches('"1-ab"', None)
+
+    def test_not_modified(self, client: TestClient) -> None:
+        """
+        Teste la réponse 304 lorsque l'ETag est inchangé.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        response = client.get("/api/stats/overview")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+        assert response.headers["cache-control"] == settings.CACHE_CONTROL
+
+        response = client.get("/api/stats/overview", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_etag_depends_on_parameters(self, client: TestClient) -> None:
+        """
+        Teste que l'ETag dépend des paramètres de la requête.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        first = client.get("/api/stats/amount-distribution", params={"bins": 5})
+        second = client.get("/api/stats/amount-distribution", params={"bins": 6})
+        assert first.headers["etag"] != second.headers["etag"]
+
+        response = client.get(
+            "/api/stats/amount-distribution",
+            params={"bins": 6},
+            headers={"If-None-Match": first.headers["etag"]},
+        )
+        assert response.status_code == 200
+
+    def test_reload_changes_etag(
+        self, client: TestClient, sample_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste qu'une nouvelle version du dataset change l'ETag.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        etag = client.get("/api/fraud/summary").headers["etag"]
+        data_manager._publish(sample_data)
+        response = client.get("/api/fraud/summary", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
+
+    def test_etag_names_the_served_version(
+        self,
+        client: TestClient,
+        sample_data: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        Teste que l'ETag désigne la version servie malgré une publication
+        pendant la requête.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        sample_data : pd.DataFrame
+            DataFrame de test
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de remplacement du service
+        """
+        data_manager._publish(sample_data)
+        served = data_manager.get_version()
+        get_overview = StatsService.get_overview
+
+        def publish_then_read() -> StatsOverview:
+            data_manager._publish(sample_data.iloc[:1])
+            return get_overview()
+
+        monkeypatch.setattr(StatsService, "get_overview", publish_then_read)
+        response = client.get("/api/stats/overview")
+        assert response.headers["etag"].startswith(f'"{served}.')
+        assert response.json()["total_transactions"] == len(sample_data)
+        data_manager._publish(sample_data)
+
+    def test_transaction_lists_are_not_conditional(self, client: TestClient) -> None:
+        """
+        Teste que les listes de transactions ne portent pas d'ETag.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        response = client.get("/api/transactions")
+        assert "etag" not in response.headers
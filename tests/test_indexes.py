@@ -0,0 +1,192 @@
+"""
+Tests unitaires pour les index en mémoire.
+
+Ce module teste les structures d'accès construites sur le dataset.
+"""
+
+import numpy as np
+import pandas as pd
+from banking_api.indexes import (
+    BitmapIndex,
+    ColumnStatistics,
+    GroupIndex,
+    MergedSelection,
+    PrimaryKeyIndex,
+    Selection,
+    SortedIndex,
+    bitmap_page,
+    contains,
+    intersect,
+    popcount,
+    to_positions,
+)
+
+
+class TestPrimaryKeyIndex:
+    """Tests de l'index sur l'identifiant des transactions."""
+
+    def test_lookup(self) -> None:
+        """Teste la recherche d'identifiants présents et absents."""
+        index = PrimaryKeyIndex(pd.Series(["tx_0001", "tx_0002", "tx_0003"]))
+        assert index.lookup("tx_0002") == 1
+        assert index.lookup("tx_9999") is None
+        assert len(index) == 3
+
+    def test_lookup_duplicates(self) -> None:
+        """Teste qu'un identifiant dupliqué renvoie la première ligne."""
+        index = PrimaryKeyIndex(pd.Series(["b", "a", "b"]))
+        assert index.lookup("b") == 0
+        assert index.lookup("a") == 1
+
+
+class TestGroupIndex:
+    """Tests de l'index groupé par clé."""
+
+    def test_lookup(self) -> None:
+        """Teste que chaque clé renvoie ses lignes dans l'ordre d'origine."""
+        index = GroupIndex(pd.Series([7, 3, 7, 5, 3, 7]))
+        assert index.keys.tolist() == [3, 5, 7]
+        assert index.offsets.tolist() == [0, 2, 3, 6]
+        assert index.lookup(7).tolist() == [0, 2, 5]
+        assert index.lookup(3).tolist() == [1, 4]
+        assert index.count(5) == 1
+
+    def test_lookup_missing_key(self) -> None:
+        """Teste la recherche d'une clé absente."""
+        index = GroupIndex(pd.Series([1, 2, 2], dtype="int8"))
+        assert len(index.lookup(4)) == 0
+        assert len(index.lookup(10**6)) == 0
+        assert index.count(0) == 0
+
+    def test_empty(self) -> None:
+        """Teste la construction sur une colonne vide."""
+        index = GroupIndex(pd.Series([], dtype="int64"))
+        assert len(index.keys) == 0
+        assert len(index.lookup(1)) == 0
+
+
+class TestSortedIndex:
+    """Tests de l'index trié pour les intervalles."""
+
+    def test_range_positions(self) -> None:
+        """Teste la résolution d'intervalles inclus et ouverts."""
+        index = SortedIndex(pd.Series([500, -100, 250, 250, 9000, 0]))
+        assert index.positions(0, 500).tolist() == [0, 2, 3, 5]
+        assert index.positions(None, 0).tolist() == [1, 5]
+        assert index.positions(1000, None).tolist() == [4]
+        assert index.bounds(300, 200) == (4, 4)
+        assert len(index.positions(10_000, 20_000)) == 0
+
+
+class TestBitmapIndex:
+    """Tests des index bitmap et de leur combinaison."""
+
+    def test_dense_and_sparse_sets(self) -> None:
+        """Teste le choix de représentation selon la densité."""
+        values = pd.Series(["a"] * 900 + ["b"] * 100 + ["c"] * 24, dtype="category")
+        index = BitmapIndex.from_column(values)
+        assert index.is_dense("a")
+        assert not index.is_dense("c")
+        assert index.count("b") == 100
+        assert index.positions("c").tolist() == list(range(1000, 1024))
+        assert popcount(index.bitmap("c")) == 24
+        assert index.count("z") == 0
+
+    def test_error_tokens(self) -> None:
+        """Teste l'indexation des drapeaux de la colonne errors."""
+        errors = pd.Series(
+            ["", "Bad PIN", "Bad PIN,Bad CVV", "Bad CVV"], dtype="category"
+        )
+        index = BitmapIndex.from_tokens(errors)
+        assert index.positions("Bad PIN").tolist() == [1, 2]
+        assert index.positions("Bad CVV").tolist() == [2, 3]
+
+    def test_intersection_matches_masks(self) -> None:
+        """Teste intersection, popcount et pagination contre des masques."""
+        rng = np.random.default_rng(0)
+        left = rng.random(1000) < 0.5
+        right = rng.random(1000) < 0.3
+        combined = intersect([np.packbits(left), np.packbits(right)])
+        expected = np.flatnonzero(left & right)
+
+        assert popcount(combined) == len(expected)
+        assert to_positions(combined, 1000).tolist() == expected.tolist()
+        assert bitmap_page(combined, 10, 25).tolist() == expected[10:25].tolist()
+        assert contains(combined, expected).all()
+
+        selection = Selection(1000, bitmap=combined)
+        assert selection.total == len(expected)
+        assert selection.page(0, 5).tolist() == expected[:5].tolist()
+
+
+class TestIncrementalIndexes:
+    """Tests du prolongement des index avec de nouvelles lignes."""
+
+    def test_extend_matches_rebuild(self) -> None:
+        """Teste que les index prolongés sont identiques aux index reconstruits."""
+        rng = np.random.default_rng(1)
+        head = pd.Series(rng.integers(0, 20, 1003))
+        tail = pd.Series(rng.integers(0, 25, 37))
+        full = pd.concat([head, tail], ignore_index=True)
+
+        grouped, expected = GroupIndex(head).extend(tail), GroupIndex(full)
+        assert grouped.keys.tolist() == expected.keys.tolist()
+        assert grouped.offsets.tolist() == expected.offsets.tolist()
+        assert grouped.positions.tolist() == expected.positions.tolist()
+
+        ordered, rebuilt = SortedIndex(head).extend(tail), SortedIndex(full)
+        assert ordered.order.tolist() == rebuilt.order.tolist()
+
+        bitmaps = BitmapIndex.from_column(head).extend(BitmapIndex.from_column(tail))
+        reference = BitmapIndex.from_column(full)
+        for key in range(25):
+            assert bitmaps.count(key) == reference.count(key)
+            assert bitmaps.bitmap(key).tolist() == reference.bitmap(key).tolist()
+
+        statistics = ColumnStatistics(head).extend(tail)
+        assert statistics.frequencies == ColumnStatistics(full).frequencies
+
+    def test_primary_key_segments(self) -> None:
+        """Teste la recherche dans les segments ajoutés à l'index."""
+        index = PrimaryKeyIndex(pd.Series(["a", "b"]))
+        added = [f"x{i}" for i in range(PrimaryKeyIndex.MAX_SEGMENTS)]
+        for key in ["c", "d", "b"] + added:
+            index = index.extend(pd.Series([key]))
+        assert len(index) == 13
+        assert index.lookup("a") == 0
+        assert index.lookup("b") == 1
+        assert index.lookup("d") == 3
+        assert index.lookup("x7") == 12
+        assert index.lookup("z") is None
+
+
+class TestMergedSelection:
+    """Tests des sélections privées de lignes et des sélections fusionnées."""
+
+    def test_without(self) -> None:
+        """Teste le retrait de lignes sous chaque forme de sélection."""
+        removed = np.array([3, 8, 9, 500])
+        expected = [p for p in range(0, 1000, 3) if p not in (3, 9)]
+        positions = Selection(1000, positions=np.arange(0, 1000, 3))
+        mask = np.zeros(1000, dtype=bool)
+        mask[::3] = True
+        bitmap = Selection(1000, bitmap=np.packbits(mask))
+        for selection in (positions, bitmap):
+            kept = selection.without(removed)
+            assert kept.total == len(expected)
+            assert kept.to_positions().tolist() == expected
+        everything = Selection(10).without(np.array([0, 9]))
+        assert everything.to_positions().tolist() == list(range(1, 9))
+        assert Selection(10).without(np.array([], dtype=np.int64)).total == 10
+
+    def test_pages_span_both_parts(self) -> None:
+        """Teste la pagination et la reprise à la jonction des deux parties."""
+        head = Selection(10, positions=np.array([1, 4, 7]))
+        tail = Selection(4, positions=np.array([0, 2]))
+        merged = MergedSelection(head, tail, 10)
+        assert merged.total == 5
+        assert merged.page(2, 4).tolist() == [7, 10]
+        assert merged.page(0, 10).tolist() == [1, 4, 7, 10, 12]
+        assert merged.after(4, 2).tolist() == [7, 10]
+        assert merged.after(10, 5).tolist() == [12]
+        assert merged.to_positions().tolist() == [1, 4, 7, 10, 12]
@@ -0,0 +1,249 @@
+"""
+Tests unitaires pour l'ingestion des transactions.
+
+Ce module teste le tampon des transactions ingérées, sa compaction dans
+le dataset et les endpoints d'ingestion.
+"""
+
+from typing import Any, Dict, Iterator
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.config import settings
+from banking_api.data_manager import data_manager
+from banking_api.ingestion import DeltaBuffer, DuplicateTransactionError, delta_buffer
+from banking_api.models import Transaction
+
+
+def make_transaction(transaction_id: str, amount: float = 42.0) -> Dict[str, Any]:
+    """
+    Crée une transaction de test.
+
+    Parameters
+    ----------
+    transaction_id : str
+        Identifiant de la transaction
+    amount : float
+        Montant de la transaction
+
+    Returns
+    -------
+    Dict[str, Any]
+        Transaction au format JSON
+    """
+    return {
+        "id": transaction_id,
+        "date": "2019-01-04",
+        "client_id": 1231006815,
+        "card_id": 1,
+        "amount": amount,
+        "use_chip": "Online Transaction",
+        "merchant_id": 6,
+        "merchant_city": "Dallas",
+        "merchant_state": "TX",
+        "zip": 75001,
+        "mcc": 5411,
+        "errors": "",
+    }
+
+
+@pytest.fixture
+def restore_data(
+    setup_test_data: None, sample_data: pd.DataFrame
+) -> Iterator[None]:
+    """
+    Republie les données de test de la session après le test.
+
+    Les transactions restées dans le tampon global sont compactées avant
+    la republication, pour ne pas fuir d'un test à l'autre.
+
+    Parameters
+    ----------
+    setup_test_data : None
+        Fixture de chargement des données de test
+    sample_data : pd.DataFrame
+        DataFrame de test
+    """
+    yield
+    delta_buffer.compact()
+    data_manager._data = sample_data
+
+
+class TestDeltaBuffer:
+    """Tests du tampon et de sa compaction."""
+
+    def test_lookup_before_and_after_compaction(self, restore_data: None) -> None:
+        """Teste qu'une transaction est visible avant et après la compaction."""
+        buffer = DeltaBuffer(threshold=100, interval=0)
+        version = data_manager.get_version()
+        version_sequence = data_manager.get_snapshot().sequence
+        result = buffer.append([Transaction(**make_transaction("tx_9001"))])
+        assert result.accepted == 1
+        assert result.pending == 1
+
+        assert buffer.view().locate("tx_9001") == len(data_manager.get_snapshot())
+        assert data_manager.get_version() == version
+
+        snapshot = buffer.compact()
+        assert snapshot is not None
+        assert snapshot.version == version + 1
+        assert snapshot.sequence == result.pending + version_sequence
+        assert snapshot.id_index.lookup("tx_9001") is not None
+        assert len(snapshot) == len(data_manager._data)
+        assert buffer.view().tail is None
+        assert buffer.compact() is None
+
+        metrics = buffer.metrics()
+        assert metrics.pending == 0
+        assert metrics.ingested == 1
+        assert metrics.compactions == 1
+
+    def test_duplicates_are_rejected(self, restore_data: None) -> None:
+        """Teste le refus des identifiants existants."""
+        buffer = DeltaBuffer(threshold=100, interval=0)
+        with pytest.raises(DuplicateTransactionError):
+            buffer.append([Transaction(**make_transaction("tx_0001"))])
+        with pytest.raises(DuplicateTransactionError):
+            buffer.append(
+                [
+                    Transaction(**make_transaction("tx_9002")),
+                    Transaction(**make_transaction("tx_9002")),
+                ]
+            )
+        buffer.append([Transaction(**make_transaction("tx_9002"))])
+        with pytest.raises(DuplicateTransactionError):
+            buffer.append([Transaction(**make_transaction("tx_9002"))])
+        buffer.compact()
+        with pytest.raises(DuplicateTransactionError):
+            buffer.append([Transaction(**make_transaction("tx_9002"))])
+        assert buffer.metrics().ingested == 1
+
+
+class TestIngestionRoutes:
+    """Tests des endpoints d'ingestion."""
+
+    def test_ingest_transaction(self, client: TestClient, restore_data: None) -> None:
+        """
+        Teste l'ingestion d'une transaction puis sa consultation.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        response = client.post("/api/transactions", json=make_transaction("tx_9101"))
+        assert response.status_code == 202
+        assert response.json()["accepted"] == 1
+
+        response = client.get("/api/transactions/tx_9101")
+        assert response.status_code == 200
+        assert response.json()["amount"] == 42.0
+
+        response = client.post("/api/transactions", json=make_transaction("tx_9101"))
+        assert response.status_code == 409
+
+        delta_buffer.compact()
+        response = client.get("/api/transactions/tx_9101")
+        assert response.status_code == 200
+        response = client.get("/api/system/metrics")
+        assert response.json()["ingestion"]["pending"] == 0
+
+    def test_ingest_batch(
+        self,
+        client: TestClient,
+        restore_data: None,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        Teste l'ingestion d'un lot et la limite de taille.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de configuration de la taille des lots
+        """
+        batch = [make_transaction(f"tx_92{i:02d}") for i in range(3)]
+        response = client.post("/api/transactions/batch", json=batch)
+        assert response.status_code == 202
+        assert response.json()["accepted"] == 3
+
+        response = client.post("/api/transactions/batch", json=[])
+        assert response.status_code == 422
+
+        monkeypatch.setattr(settings, "INGEST_MAX_BATCH", 2)
+        batch = [make_transaction(f"tx_93{i:02d}") for i in range(3)]
+        response = client.post("/api/transactions/batch", json=batch)
+        assert response.status_code == 413
+        assert client.get("/api/transactions/tx_9300").status_code == 404
+
+    def test_reads_include_pending_changes(
+        self, client: TestClient, restore_data: None
+    ) -> None:
+        """
+        Teste que listes, recherches et agrégats lisent le tampon.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        compactions = delta_buffer.metrics().compactions
+        total = client.get("/api/stats/overview").json()["total_transactions"]
+        transaction = make_transaction("tx_9401", amount=77.0)
+        transaction["errors"] = None
+        client.post("/api/transactions", json=transaction)
+        client.delete("/api/transactions/tx_0001")
+
+        listed = client.get("/api/transactions", params={"merchant_state": "TX"})
+        assert [t["id"] for t in listed.json()["transactions"]] == [
+            "tx_0004",
+            "tx_9401",
+        ]
+        searched = client.post(
+            "/api/transactions/search", json={"client_id": 1231006815}
+        )
+        assert [t["id"] for t in searched.json()["transactions"]] == ["tx_9401"]
+        customer = client.get(
+            "/api/transactions/by-customer", params={"client_id": 1231006815}
+        )
+        assert [t["id"] for t in customer.json()] == ["tx_9401"]
+        overview = client.get("/api/stats/overview").json()
+        assert overview["total_transactions"] == total
+        assert delta_buffer.metrics().compactions == compactions
+
+        # Lignes normalisées dès l'ingestion : identiques après compaction
+        before = client.get("/api/transactions/tx_9401").json()
+        delta_buffer.compact()
+        assert client.get("/api/transactions/tx_9401").json() == before
+        assert client.get("/api/transactions/tx_0001").status_code == 404
+        overview = client.get("/api/stats/overview").json()
+        assert overview["total_transactions"] == total
+
+    def test_cursor_survives_compaction(
+        self, client: TestClient, restore_data: None
+    ) -> None:
+        """
+        Teste qu'un parcours continue après la compaction de ses lignes.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        batch = [make_transaction(f"tx_95{i:02d}") for i in range(4)]
+        client.post("/api/transactions/batch", json=batch)
+        first = client.get("/api/transactions", params={"limit": 6}).json()
+        assert first["transactions"][-1]["id"] == "tx_9500"
+
+        delta_buffer.compact()
+        second = client.get(
+            "/api/transactions", params={"cursor": first["next_cursor"]}
+        ).json()
+        assert [t["id"] for t in second["transactions"]] == [
+            "tx_9501",
+            "tx_9502",
+            "tx_9503",
+        ]
@@ -0,0 +1,213 @@
+"""
+Tests unitaires pour la pagination par curseur.
+
+Ce module teste les curseurs opaques et le parcours des listes paginées,
+y compris lors d'un rechargement du dataset en cours de parcours.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.data_manager import data_manager
+from banking_api.indexes import Selection
+from banking_api.pagination import Cursor, InvalidCursorError, fingerprint
+
+
+def _scroll(client: TestClient, url: str, limit: int, **params: object) -> list:
+    """
+    Parcourt toutes les pages d'une liste de transactions via les curseurs.
+
+    Parameters
+    ----------
+    client : TestClient
+        Client de test FastAPI
+    url : str
+        Route parcourue
+    limit : int
+        Éléments par page
+    **params : object
+        Filtres de la requête
+
+    Returns
+    -------
+    list
+        Identifiants des transactions, dans l'ordre des pages
+    """
+    ids: list = []
+    cursor = None
+    while True:
+        query = dict(params, limit=limit)
+        if cursor is not None:
+            query["cursor"] = cursor
+        data = client.get(url, params=query).json()
+        ids.extend(transaction["id"] for transaction in data["transactions"])
+        cursor = data["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+class TestCursor:
+    """Tests des curseurs opaques."""
+
+    def test_round_trip(self) -> None:
+        """Teste l'encodage puis le décodage d'un curseur."""
+        key = fingerprint("transactions", {"use_chip": "Chip Transaction"})
+        decoded = Cursor.decode(Cursor(3, key, 1234, 100).encode(), key)
+        assert (decoded.version, decoded.key, decoded.offset) == (3, 1234, 100)
+
+    def test_rejects_other_filters(self) -> None:
+        """Teste le rejet d'un curseur émis pour d'autres filtres."""
+        token = Cursor(1, fingerprint("transactions", {}), 0, 1).encode()
+        other = fingerprint("transactions", {"use_chip": "Chip Transaction"})
+        with pytest.raises(InvalidCursorError):
+            Cursor.decode(token, other)
+        with pytest.raises(InvalidCursorError):
+            Cursor.decode("not-a-cursor", other)
+
+    def test_selection_after(self) -> None:
+        """Teste la reprise d'une sélection après une position."""
+        rng = np.random.default_rng(1)
+        mask = rng.random(5000) < 0.4
+        expected = np.flatnonzero(mask)
+        for selection in (
+            Selection(5000, positions=expected),
+            Selection(5000, bitmap=np.packbits(mask)),
+        ):
+            assert selection.after(-1, 10).tolist() == expected[:10].tolist()
+            after = selection.after(int(expected[99]), 700)
+            assert after.tolist() == expected[100:800].tolist()
+            assert len(selection.after(4999, 10)) == 0
+        assert Selection(10).after(7, 5).tolist() == [8, 9]
+
+
+class TestCursorPagination:
+    """Tests du parcours des listes par curseur."""
+
+    def test_scroll_matches_filter(
+        self, random_client: TestClient, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste qu'un parcours complet retourne chaque ligne une seule fois.
+
+        Parameters
+        ----------
+        random_client : TestClient
+            Client de test FastAPI
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        ids = _scroll(
+            random_client, "/api/transactions", 250, use_chip="Swipe Transaction"
+        )
+        expected = random_data.loc[
+            random_data["use_chip"] == "Swipe Transaction", "id"
+        ].tolist()
+        assert ids == expected
+
+    def test_skip_is_exact_offset(
+        self, random_client: TestClient, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste qu'un skip non multiple de limit est respecté.
+
+        Parameters
+        ----------
+        random_client : TestClient
+            Client de test FastAPI
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        data = random_client.get(
+            "/api/transactions", params={"skip": 15, "limit": 10}
+        ).json()
+        assert [t["id"] for t in data["transactions"]] == random_data["id"][
+            15:25
+        ].tolist()
+        assert data["page"] == 2
+
+    def test_reload_mid_scroll(
+        self,
+        random_client: TestClient,
+        random_data: pd.DataFrame,
+        sample_data: pd.DataFrame,
+    ) -> None:
+        """
+        Teste qu'un rechargement n'affecte pas un parcours en cours.
+
+        Parameters
+        ----------
+        random_client : TestClient
+            Client de test FastAPI
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        first = random_client.get("/api/transactions", params={"limit": 100}).json()
+        data_manager._publish(sample_data)
+
+        second = random_client.get(
+            "/api/transactions",
+            params={"limit": 100, "cursor": first["next_cursor"]},
+        ).json()
+        assert [t["id"] for t in second["transactions"]] == random_data["id"][
+            100:200
+        ].tolist()
+        assert second["total"] == len(random_data)
+
+        for _ in range(3):
+            data_manager._publish(sample_data)
+        response = random_client.get(
+            "/api/transactions",
+            params={"limit": 100, "cursor": second["next_cursor"]},
+        )
+        assert response.status_code == 410
+
+    def test_invalid_cursor(self, client: TestClient) -> None:
+        """
+        Teste le rejet d'un curseur invalide.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        response = client.get("/api/transactions", params={"cursor": "garbage"})
+        assert response.status_code == 400
+
+    def test_search_and_customers_scroll(
+        self, random_client: TestClient, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste le parcours par curseur de la recherche et des clients.
+
+        Parameters
+        ----------
+        random_client : TestClient
+            Client de test FastAPI
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        ids: list = []
+        params: dict = {"limit": 50}
+        while True:
+            data = random_client.post(
+                "/api/transactions/search", params=params, json={"mcc": 5411}
+            ).json()
+            ids.extend(t["id"] for t in data["transactions"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+        assert ids == random_data.loc[random_data["mcc"] == 5411, "id"].tolist()
+
+        customers: list = []
+        params = {"limit": 7}
+        while True:
+            data = random_client.get("/api/customers", params=params).json()
+            customers.extend(data["customers"])
+            if data["next_cursor"] is None:
+                break
+            params["cursor"] = data["next_cursor"]
+        expected = sorted(random_data["client_id"].unique().tolist())
+        assert customers == [str(c) for c in expected]
@@ -0,0 +1,110 @@
+"""
+Tests unitaires pour le planificateur de requêtes.
+
+Ce module teste les statistiques de colonnes et l'ordre d'évaluation
+des prédicats de recherche.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from banking_api.data_manager import DatasetSnapshot, _freeze
+from banking_api.indexes import ColumnStatistics
+from banking_api.query_planner import (
+    AmountRangePredicate,
+    EqualsPredicate,
+    Predicate,
+    QueryPlanner,
+)
+from banking_api.schema import apply_schema
+
+
+class TestColumnStatistics:
+    """Tests des statistiques de colonnes."""
+
+    def test_frequencies(self) -> None:
+        """Teste l'histogramme exact d'une colonne à faible cardinalité."""
+        statistics = ColumnStatistics(pd.Series(["a", "b", "a", "a"], dtype="category"))
+        assert statistics.cardinality == 2
+        assert statistics.estimate_equal("a") == 3
+        assert statistics.estimate_equal("z") == 0
+
+    def test_range_estimate(self) -> None:
+        """Teste l'estimation d'un intervalle par histogramme équi-profondeur."""
+        statistics = ColumnStatistics(pd.Series(np.arange(10_000)))
+        assert statistics.estimate_range(None, None) == 10_000
+        assert abs(statistics.estimate_range(1000, 2999) - 2000) < 50
+        assert statistics.estimate_range(20_000, None) == 0
+
+
+class TestQueryPlanner:
+    """Tests du planificateur de requêtes."""
+
+    def test_most_selective_first(self, random_data: pd.DataFrame) -> None:
+        """
+        Teste que le prédicat le plus sélectif est évalué en premier.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        snapshot = DatasetSnapshot(_freeze(apply_schema(random_data)), 1)
+        planner = QueryPlanner(snapshot)
+        planned = planner.plan(
+            [
+                EqualsPredicate("use_chip", "Swipe Transaction"),
+                AmountRangePredicate(None, None),
+                EqualsPredicate("client_id", 17),
+            ]
+        )
+        assert [predicate.column for predicate, _ in planned] == [
+            "client_id",
+            "use_chip",
+            "amount_cents",
+        ]
+
+        selection, stages = planner.execute(planned)
+        assert stages[0].access_path == "group-index"
+        assert all(stage.access_path == "filter" for stage in stages[1:])
+        expected = (
+            (random_data["client_id"] == 17)
+            & (random_data["use_chip"] == "Swipe Transaction")
+        ).sum()
+        assert selection.total == stages[-1].output_rows == expected
+
+    def test_dense_bitmaps_are_combined(self, random_data: pd.DataFrame) -> None:
+        """
+        Teste la combinaison des bitmaps denses par ET logique.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        snapshot = DatasetSnapshot(_freeze(apply_schema(random_data)), 1)
+        planner = QueryPlanner(snapshot)
+        bitmap_before = snapshot.bitmaps["use_chip"].bitmap("Swipe Transaction").copy()
+        selection, stages = planner.execute(
+            planner.plan(
+                [
+                    EqualsPredicate("use_chip", "Swipe Transaction"),
+                    EqualsPredicate("use_chip", "Swipe Transaction"),
+                ]
+            )
+        )
+        assert [stage.access_path for stage in stages] == ["bitmap", "bitmap-and"]
+        assert selection.total == (random_data["use_chip"] == "Swipe Transaction").sum()
+        assert np.array_equal(
+            snapshot.bitmaps["use_chip"].bitmap("Swipe Transaction"), bitmap_before
+        )
+
+    def test_incomplete_predicate_is_rejected(self) -> None:
+        """Teste qu'un prédicat incomplet ne peut pas être instancié."""
+
+        class Incomplete(Predicate):
+            def describe(self) -> str:
+                return "incomplete"
+
+        with pytest.raises(TypeError):
+            Incomplete()  # type: ignore[abstract]
@@ -0,0 +1,162 @@
+"""
+Tests unitaires pour le rechargement à chaud du dataset.
+
+Ce module teste la surveillance du fichier de données et l'endpoint
+d'administration de rechargement.
+"""
+
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.config import settings
+from banking_api.data_manager import data_manager
+from banking_api.reloader import DatasetReloader, dataset_reloader
+
+
+@pytest.fixture
+def data_file(tmp_path: Path, sample_data: pd.DataFrame) -> Iterator[Path]:
+    """
+    Écrit les données de test dans un fichier CSV et le charge.
+
+    Les données de test de la session sont republiées ensuite.
+
+    Parameters
+    ----------
+    tmp_path : Path
+        Répertoire temporaire
+    sample_data : pd.DataFrame
+        DataFrame de test
+
+    Yields
+    ------
+    Path
+        Chemin du fichier CSV chargé
+    """
+    path = tmp_path / "transactions_data.csv"
+    sample_data.to_csv(path, index=False)
+    data_manager.load_data(str(path))
+    yield path
+    data_manager._data = sample_data
+
+
+class TestDatasetReloader:
+    """Tests de la surveillance du fichier de données."""
+
+    def test_poll_reloads_stable_changes(
+        self, data_file: Path, sample_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste qu'un fichier modifié est rechargé une fois stable.
+
+        Parameters
+        ----------
+        data_file : Path
+            Fichier CSV chargé
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        reloader = DatasetReloader(0)
+        reloader.start(str(data_file))
+        held = data_manager.get_snapshot()
+        assert reloader.poll() is False
+
+        sample_data.iloc[:2].to_csv(data_file, index=False)
+        # Première observation : le fichier est peut-être en cours d'écriture
+        assert reloader.poll() is False
+        assert reloader.poll() is True
+        assert data_manager.get_version() == held.version + 1
+        assert data_manager.get_record_count() == 2
+        assert len(held) == len(sample_data)
+        assert reloader.poll() is False
+
+    def test_invalid_file_keeps_current_version(self, data_file: Path) -> None:
+        """
+        Teste qu'un fichier invalide ne remplace pas la version courante.
+
+        Parameters
+        ----------
+        data_file : Path
+            Fichier CSV chargé
+        """
+        reloader = DatasetReloader(0)
+        reloader.start(str(data_file))
+        version = data_manager.get_version()
+
+        data_file.write_text("foo,bar\n1,2\n")
+        reloader.poll()
+        assert reloader.poll() is False
+        assert data_manager.get_version() == version
+        # Le fichier invalide n'est pas relu à chaque vérification
+        assert reloader.poll() is False
+
+
+class TestReloadRoute:
+    """Tests de l'endpoint d'administration de rechargement."""
+
+    def test_reload_requires_token(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Teste que le rechargement est réservé aux administrateurs.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de configuration du jeton
+        """
+        response = client.post("/api/system/reload")
+        assert response.status_code == 403
+
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        response = client.post(
+            "/api/system/reload", headers={"X-Admin-Token": "wrong"}
+        )
+        assert response.status_code == 403
+
+    def test_reload_publishes_new_version(
+        self,
+        client: TestClient,
+        data_file: Path,
+        sample_data: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        Teste que le rechargement publie le contenu du fichier.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        data_file : Path
+            Fichier CSV chargé
+        sample_data : pd.DataFrame
+            DataFrame de test
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de configuration du jeton
+        """
+        monkeypatch.setattr(settings, "ADMIN_TOKEN", "secret")
+        dataset_reloader.start(str(data_file))
+        version = data_manager.get_version()
+        sample_data.iloc[:3].to_csv(data_file, index=False)
+
+        response = client.post(
+            "/api/system/reload", headers={"X-Admin-Token": "secret"}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["dataset_version"] == version + 1
+        assert body["total_records"] == 3
+        # Le rechargement explicite n'est pas refait par la surveillance
+        assert dataset_reloader.poll() is False
+
+        data_file.unlink()
+        response = client.post(
+            "/api/system/reload", headers={"X-Admin-Token": "secret"}
+        )
+        assert response.status_code == 422
+        assert data_manager.get_version() == version + 1
@@ -0,0 +1,173 @@
+"""
+Tests unitaires pour le cache des réponses.
+
+Ce module teste l'éviction LRU, la durée de vie des entrées, leur
+invalidation à chaque nouvelle version du dataset et le regroupement des
+calculs identiques simultanés.
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from banking_api.services.response_cache import ResponseCache
+from banking_api.services.single_flight import SingleFlight
+
+
+class TestResponseCache:
+    """Tests du cache LRU/TTL indexé par version."""
+
+    def test_hit_and_lru_eviction(self) -> None:
+        """Teste les succès et l'éviction de l'entrée la moins récente."""
+        cache = ResponseCache(max_bytes=10)
+        calls = []
+
+        def compute(value: str) -> str:
+            calls.append(value)
+            return value
+
+        assert cache.get_or_compute((1, 0), "a", lambda: compute("aaaa"), len) == "aaaa"
+        assert cache.get_or_compute((1, 0), "a", lambda: compute("xxxx"), len) == "aaaa"
+        cache.get_or_compute((1, 0), "b", lambda: compute("bbbb"), len)
+        cache.get_or_compute((1, 0), "a", lambda: compute("xxxx"), len)
+        cache.get_or_compute((1, 0), "c", lambda: compute("cccc"), len)
+
+        # "b" est la moins récemment utilisée : elle est évincée
+        assert cache.get_or_compute((1, 0), "a", lambda: compute("xxxx"), len) == "aaaa"
+        assert cache.get_or_compute((1, 0), "b", lambda: compute("BBBB"), len) == "BBBB"
+        metrics = cache.metrics()
+        assert metrics.hits == 3
+        assert metrics.misses == 4
+        assert metrics.evictions == 2
+        assert metrics.bytes <= 10
+        assert calls == ["aaaa", "bbbb", "cccc", "BBBB"]
+
+    def test_new_version_invalidates(self) -> None:
+        """Teste qu'une nouvelle version du dataset vide le cache."""
+        cache = ResponseCache(max_bytes=100)
+        cache.get_or_compute((1, 0), "a", lambda: "old", len)
+        assert cache.get_or_compute((2, 0), "a", lambda: "new", len) == "new"
+        assert cache.metrics().invalidations == 1
+
+        # Une valeur calculée sur une version dépassée n'est pas mémorisée
+        cache.get_or_compute((1, 0), "b", lambda: "stale", len)
+        assert cache.get_or_compute((2, 0), "b", lambda: "fresh", len) == "fresh"
+
+        # Une requête fixée sur une version dépassée ne lit pas les entrées
+        # de la version courante
+        assert cache.get_or_compute((1, 0), "a", lambda: "pinned", len) == "pinned"
+        assert cache.get_or_compute((2, 0), "a", lambda: "other", len) == "new"
+
+    def test_ttl_expiration(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """
+        Teste l'expiration des entrées après leur durée de vie.
+
+        Parameters
+        ----------
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de remplacement de l'horloge
+        """
+        now = [100.0]
+        monkeypatch.setattr(
+            "banking_api.services.response_cache.time.monotonic", lambda: now[0]
+        )
+        cache = ResponseCache(max_bytes=100, ttl=5)
+        cache.get_or_compute((1, 0), "a", lambda: "first", len)
+        now[0] += 4
+        assert cache.get_or_compute((1, 0), "a", lambda: "second", len) == "first"
+        now[0] += 2
+        assert cache.get_or_compute((1, 0), "a", lambda: "third", len) == "third"
+        assert cache.metrics().expirations == 1
+
+    def test_oversized_and_failed_values(self) -> None:
+        """Teste que les valeurs trop grandes et les erreurs ne sont pas gardées."""
+        cache = ResponseCache(max_bytes=3)
+        cache.get_or_compute((1, 0), "a", lambda: "large", len)
+        assert cache.metrics().entries == 0
+
+        def fail() -> str:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            cache.get_or_compute((1, 0), "b", fail, len)
+        assert cache.get_or_compute((1, 0), "b", lambda: "ok", len) == "ok"
+
+
+class TestSingleFlight:
+    """Tests du regroupement des calculs identiques."""
+
+    def test_concurrent_calls_share_one_computation(self) -> None:
+        """Teste que les appels simultanés partagent un seul calcul."""
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def compute() -> int:
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 42
+
+        results = []
+
+        def run() -> None:
+            results.append(flights.do("key", compute))
+
+        leader = threading.Thread(target=run)
+        leader.start()
+        started.wait(5)
+        followers = [threading.Thread(target=run) for _ in range(4)]
+        for thread in followers:
+            thread.start()
+        while flights.metrics().coalesced < 4:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(5)
+
+        assert results == [42] * 5
+        assert calls == [1]
+        metrics = flights.metrics()
+        assert metrics.executions == 1
+        assert metrics.in_flight == 0
+
+    def test_errors_are_shared_and_not_retained(self) -> None:
+        """Teste que l'exception est propagée et que la clé est libérée."""
+        flights = SingleFlight()
+
+        def fail() -> int:
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flights.do("key", fail)
+        assert flights.do("key", lambda: 1) == 1
+        assert flights.metrics().executions == 2
+
+
+class TestCachedRoutes:
+    """Tests des endpoints servis depuis le cache."""
+
+    def test_repeated_search_is_cached(self, client: TestClient) -> None:
+        """
+        Teste qu'une recherche répétée est servie depuis le cache.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        body = {"use_chip": "Swipe Transaction"}
+        first = client.post("/api/transactions/search", json=body)
+        before = client.get("/api/system/metrics").json()["response_cache"]
+        second = client.post("/api/transactions/search", json=body)
+        after = client.get("/api/system/metrics").json()["response_cache"]
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["content-type"] == first.headers["content-type"]
+        assert after["hits"] == before["hits"] + 1
+
+        response = client.get("/api/stats/amount-distribution", params={"bins": 7})
+        assert len(response.json()["bins"]) == 7
@@ -0,0 +1,74 @@
+"""
+Tests unitaires pour le schéma typé du dataset.
+
+Ce module teste la conversion des montants et le typage compact.
+"""
+
+import numpy as np
+import pandas as pd
+from banking_api.schema import (
+    AMOUNT_COLUMN,
+    apply_schema,
+    cents_lower_bound,
+    cents_upper_bound,
+    equals,
+    parse_amount_cents,
+)
+
+
+class TestSchema:
+    """Tests du schéma compact."""
+
+    def test_parse_amount_cents(self) -> None:
+        """Teste l'analyse vectorisée des montants textuels."""
+        values = np.array(
+            ["$-77.00", "$14.57", "$1200.5", "$0.125", "$3", None], dtype=object
+        )
+        cents = parse_amount_cents(values)
+        assert cents.dtype == np.int64
+        assert cents.tolist() == [-7700, 1457, 120050, 13, 300, 0]
+
+    def test_parse_numeric_amounts(self) -> None:
+        """Teste la conversion de montants déjà numériques."""
+        cents = parse_amount_cents(np.array([9839.64, -181.0, 0.29]))
+        assert cents.tolist() == [983964, -18100, 29]
+
+    def test_amount_bounds(self) -> None:
+        """Teste l'arrondi des bornes de filtre en centimes."""
+        assert cents_lower_bound(10.005) == 1001
+        assert cents_upper_bound(10.005) == 1000
+        assert cents_lower_bound(0.29) == 29
+
+    def test_apply_schema_types(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste le typage compact des colonnes.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        typed = apply_schema(sample_data)
+        assert "amount" not in typed.columns
+        assert typed[AMOUNT_COLUMN].dtype == np.int64
+        assert isinstance(typed["use_chip"].dtype, pd.CategoricalDtype)
+        assert typed["card_id"].dtype.itemsize == 1
+        assert typed["mcc"].dtype.itemsize == 2
+
+        again = apply_schema(typed)
+        pd.testing.assert_frame_equal(again, typed)
+
+    def test_equals(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste le prédicat d'égalité sur codes et entiers étroits.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        typed = apply_schema(sample_data)
+        assert equals(typed["use_chip"], "Chip Transaction").sum() == 2
+        assert equals(typed["use_chip"], "Unknown").sum() == 0
+        assert equals(typed["mcc"], 5411).sum() == 1
+        assert equals(typed["mcc"], 10**9).sum() == 0
@@ -0,0 +1,158 @@
+"""
+Tests unitaires pour la sérialisation des pages de transactions.
+
+Ce module vérifie que l'encodage JSON direct produit le même document
+que la sérialisation Pydantic des modèles de réponse.
+"""
+
+import io
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from banking_api.data_manager import _freeze
+from banking_api.models import Transaction, TransactionResponse
+from banking_api.schema import apply_schema
+from banking_api.serialization import (
+    TransactionPage,
+    UnknownFieldError,
+    arrow_stream,
+    negotiate,
+    parquet_file,
+    parse_fields,
+    transaction_rows,
+)
+
+
+class TestSerialization:
+    """Tests de la sérialisation vectorisée."""
+
+    def test_rows_match_models(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste que les enregistrements sont des transactions valides.
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        rows = transaction_rows(_freeze(apply_schema(sample_data)))
+        assert len(rows) == len(sample_data)
+        for row in rows:
+            assert Transaction(**row).model_dump() == row
+        assert rows[0]["amount"] == sample_data["amount"].iloc[0]
+
+    def test_page_json_matches_response_model(
+        self, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste que le JSON d'une page équivaut au modèle TransactionResponse.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        frame = _freeze(apply_schema(random_data)).iloc[:1000]
+        page = TransactionPage(frame, page=1, limit=1000, total=len(random_data))
+
+        document = json.loads(page.to_json())
+        expected = TransactionResponse.model_validate(document)
+        assert expected.model_dump(mode="json") == document
+        assert page.to_response().model_dump(mode="json") == document
+
+    def test_list_page(self, sample_data: pd.DataFrame) -> None:
+        """
+        Teste l'encodage d'une page sans pagination (liste).
+
+        Parameters
+        ----------
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        page = TransactionPage(_freeze(apply_schema(sample_data)).iloc[:0])
+        assert page.to_json() == b"[]"
+        assert page.to_transactions() == []
+
+
+class TestArrowSerialization:
+    """Tests des formats binaires Arrow IPC et Parquet."""
+
+    def test_arrow_stream_round_trip(self, random_data: pd.DataFrame) -> None:
+        """
+        Teste que le flux Arrow restitue les colonnes de la page.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        pa = pytest.importorskip("pyarrow")
+        frame = _freeze(apply_schema(random_data)).iloc[:500]
+        table = pa.ipc.open_stream(arrow_stream(frame)).read_all()
+
+        assert table.column_names == list(Transaction.model_fields)
+        assert table.column("id").to_pylist() == random_data["id"][:500].tolist()
+        assert table.column("amount").to_pylist() == random_data["amount"][
+            :500
+        ].tolist()
+        assert table.column("use_chip").type.value_type == pa.string()
+
+    def test_parquet_round_trip(self, random_data: pd.DataFrame) -> None:
+        """
+        Teste que le fichier Parquet se relit avec les mêmes lignes.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        pytest.importorskip("pyarrow")
+        frame = _freeze(apply_schema(random_data)).iloc[:500]
+        loaded = pd.read_parquet(io.BytesIO(parquet_file(frame)))
+        assert loaded["mcc"].tolist() == random_data["mcc"][:500].tolist()
+
+    def test_negotiate(self) -> None:
+        """Teste le choix du format de réponse."""
+        assert negotiate(None, None) == "json"
+        assert negotiate(None, "application/vnd.apache.arrow.stream") == "arrow"
+        assert negotiate("parquet", "application/json") == "parquet"
+
+
+class TestProjection:
+    """Tests de la projection des champs et de la disposition en colonnes."""
+
+    def test_parse_fields(self) -> None:
+        """Teste l'analyse du paramètre de projection."""
+        assert parse_fields(None) is None
+        assert parse_fields("id, amount,id") == ["id", "amount"]
+        with pytest.raises(UnknownFieldError):
+            parse_fields("id,balance")
+
+    def test_projected_rows_touch_only_requested_columns(
+        self, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste que seules les colonnes projetées sont extraites.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        frame = _freeze(apply_schema(random_data))
+        page = TransactionPage(frame, positions=np.arange(10, 20))
+        assert list(page.rows(["id", "amount"]).columns) == ["id", "amount_cents"]
+
+        rows = json.loads(page.to_json(["id", "amount"]))
+        assert rows[0] == {
+            "id": random_data["id"].iloc[10],
+            "amount": random_data["amount"].iloc[10],
+        }
+
+        columns = json.loads(page.to_json(["date", "mcc"], layout="columnar"))
+        assert columns == {
+            "date": random_data["date"][10:20].tolist(),
+            "mcc": random_data["mcc"][10:20].tolist(),
+        }
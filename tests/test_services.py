@@ -10,7 +10,8 @@ from banking_api.services.transactions_service import TransactionsService
 from banking_api.services.stats_service import StatsService
 from banking_api.services.fraud_detection_service import FraudDetectionService
 from banking_api.services.customer_service import CustomerService
-from banking_api.data_manager import data_manager
+from banking_api.data_manager import DatasetSnapshot, _freeze
+from banking_api.schema import apply_schema
 from banking_api.models import TransactionSearchRequest, FraudPredictionRequest
 
 
@@ -189,3 +190,64 @@ class TestCustomerService:
         assert profile is not None
         assert profile.id == 1231006815
         assert profile.transactions_count == 1
+
+
+class TestTransactionSelection:
+    """Tests du filtrage indexé des transactions."""
+
+    @pytest.mark.parametrize(
+        "equalities, amount_range",
+        [
+            ([("use_chip", "Chip Transaction")], (None, None)),
+            (
+                [("use_chip", "Online Transaction"), ("merchant_state", "TX")],
+                (None, None),
+            ),
+            ([("mcc", 6011), ("errors", "Bad CVV")], (None, None)),
+            ([("client_id", 17), ("use_chip", "Swipe Transaction")], (0.0, None)),
+            ([("merchant_state", "NY")], (-50.0, 120.5)),
+            ([], (100.0, 100.0)),
+            ([("use_chip", "Swipe Transaction")], (500.0, 650.0)),
+            ([("use_chip", "Swipe Transaction")], (-1000.0, 1000.0)),
+            ([("use_chip", "Unknown")], (None, None)),
+        ],
+    )
+    def test_select_matches_masks(
+        self,
+        random_data: pd.DataFrame,
+        equalities: list,
+        amount_range: tuple,
+    ) -> None:
+        """
+        Teste que le filtrage indexé équivaut au filtrage par masque.
+
+        Parameters
+        ----------
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        equalities : list
+            Filtres d'égalité
+        amount_range : tuple
+            Bornes de montant
+        """
+        snapshot = DatasetSnapshot(_freeze(apply_schema(random_data)), 1)
+        min_amount, max_amount = amount_range
+        selection = TransactionsService._select(
+            snapshot, equalities, min_amount, max_amount
+        )
+
+        mask = pd.Series(True, index=random_data.index)
+        for column, value in equalities:
+            if column == "errors":
+                mask &= random_data[column].str.contains(value)
+            else:
+                mask &= random_data[column] == value
+        if min_amount is not None:
+            mask &= random_data["amount"] >= min_amount
+        if max_amount is not None:
+            mask &= random_data["amount"] <= max_amount
+        expected = mask.to_numpy().nonzero()[0]
+
+        assert selection.total == len(expected)
+        assert selection.to_positions().tolist() == expected.tolist()
+        assert list(selection.page(3, 9)) == expected[3:9].tolist()
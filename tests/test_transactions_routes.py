@@ -4,8 +4,15 @@ Tests unitaires pour les routes de transactions.
 Ce module teste toutes les routes de l'endpoint /api/transactions.
 """
 
+import io
+import json
+
+import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
+from banking_api import serialization
+from banking_api.config import settings
+from banking_api.models import ColumnarTransactionResponse, Transaction
 
 
 class TestTransactionsRoutes:
@@ -104,6 +111,30 @@ class TestTransactionsRoutes:
         assert data["total"] == 1
         assert data["transactions"][0]["use_chip"] == "Chip Transaction"
 
+    def test_search_transactions_explain(self, client: TestClient) -> None:
+        """
+        Teste le retour du plan d'exécution d'une recherche.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        search_payload = {"use_chip": "Chip Transaction", "client_id": 1231006815}
+        response = client.post(
+            "/api/transactions/search", params={"explain": True}, json=search_payload
+        )
+        assert response.status_code == 200
+        plan = response.json()["explain"]
+        assert [stage["predicate"] for stage in plan["stages"]] == [
+            "client_id = 1231006815",
+            "use_chip = 'Chip Transaction'",
+        ]
+        assert plan["total_ms"] >= plan["fetch_ms"]
+
+        response = client.post("/api/transactions/search", json=search_payload)
+        assert response.json()["explain"] is None
+
     def test_get_transaction_types(self, client: TestClient) -> None:
         """
         Teste la récupération des types de transactions.
@@ -137,13 +168,24 @@ class TestTransactionsRoutes:
         """
         Teste la suppression d'une transaction.
 
+        Une transaction ingérée est supprimée, pour ne pas modifier les
+        données de test partagées.
+
         Parameters
         ----------
         client : TestClient
             Client de test FastAPI
         """
-        response = client.delete("/api/transactions/tx_0001")
+        transaction = client.get("/api/transactions/tx_0001").json()
+        transaction["id"] = "tx_deleted"
+        response = client.post("/api/transactions", json=transaction)
+        assert response.status_code == 202
+
+        response = client.delete("/api/transactions/tx_deleted")
         assert response.status_code == 200
+        assert client.get("/api/transactions/tx_deleted").status_code == 404
+        response = client.delete("/api/transactions/tx_deleted")
+        assert response.status_code == 404
 
     def test_get_transactions_by_customer(self, client: TestClient) -> None:
         """
@@ -172,3 +214,150 @@ class TestTransactionsRoutes:
         assert response.status_code == 200
         data = response.json()
         assert isinstance(data, list)
+
+
+class TestTransactionsExport:
+    """Tests de l'export en flux des résultats de recherche."""
+
+    def test_export_ndjson(
+        self,
+        random_client: TestClient,
+        random_data: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """
+        Teste l'export NDJSON, encodé par blocs.
+
+        Parameters
+        ----------
+        random_client : TestClient
+            Client de test FastAPI
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de modification temporaire
+        """
+        monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 100)
+        search_payload = {"use_chip": "Online Transaction"}
+        with random_client.stream(
+            "POST", "/api/transactions/export", json=search_payload
+        ) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/x-ndjson"
+            lines = [json.loads(line) for line in response.iter_lines() if line]
+
+        expected = random_data[random_data["use_chip"] == "Online Transaction"]
+        assert len(expected) > 100
+        assert [line["id"] for line in lines] == expected["id"].tolist()
+        assert lines[0]["amount"] == expected["amount"].iloc[0]
+
+    def test_export_csv(
+        self, random_client: TestClient, random_data: pd.DataFrame
+    ) -> None:
+        """
+        Teste l'export CSV avec ligne d'en-tête.
+
+        Parameters
+        ----------
+        random_client : TestClient
+            Client de test FastAPI
+        random_data : pd.DataFrame
+            DataFrame aléatoire
+        """
+        response = random_client.post(
+            "/api/transactions/export",
+            params={"format": "csv"},
+            json={"merchant_state": "TX"},
+        )
+        assert response.status_code == 200
+        exported = pd.read_csv(io.StringIO(response.text), dtype={"id": str})
+        expected = random_data[random_data["merchant_state"] == "TX"]
+        assert list(exported.columns) == list(Transaction.model_fields)
+        assert exported["id"].tolist() == expected["id"].tolist()
+
+
+class TestTransactionsFormats:
+    """Tests de la négociation du format des listes de transactions."""
+
+    def test_arrow_format(self, client: TestClient) -> None:
+        """
+        Teste la réponse Arrow IPC et ses en-têtes de pagination.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        pa = pytest.importorskip("pyarrow")
+        response = client.get(
+            "/api/transactions", params={"format": "arrow", "limit": 2}
+        )
+        assert response.status_code == 200
+        content_type = response.headers["content-type"]
+        assert content_type == "application/vnd.apache.arrow.stream"
+        assert response.headers["x-total-count"] == "5"
+        assert "x-next-cursor" in response.headers
+        table = pa.ipc.open_stream(response.content).read_all()
+        assert table.num_rows == 2
+
+    def test_accept_header(self, client: TestClient) -> None:
+        """
+        Teste la négociation par l'en-tête Accept.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        pytest.importorskip("pyarrow")
+        response = client.get(
+            "/api/transactions/by-customer",
+            params={"client_id": 1231006815},
+            headers={"Accept": "application/vnd.apache.parquet"},
+        )
+        assert response.status_code == 200
+        assert len(pd.read_parquet(io.BytesIO(response.content))) == 1
+
+    def test_format_unavailable(
+        self, client: TestClient, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """
+        Teste le refus d'un format binaire sans pyarrow.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        monkeypatch : pytest.MonkeyPatch
+            Fixture de modification temporaire
+        """
+        monkeypatch.setattr(serialization, "pa", None)
+        response = client.post(
+            "/api/transactions/search", params={"format": "arrow"}, json={}
+        )
+        assert response.status_code == 406
+
+    def test_columnar_projection(self, client: TestClient) -> None:
+        """
+        Teste la projection des champs en disposition par colonnes.
+
+        Parameters
+        ----------
+        client : TestClient
+            Client de test FastAPI
+        """
+        response = client.get(
+            "/api/transactions",
+            params={"fields": "id,amount", "layout": "columnar", "limit": 3},
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 5
+        assert data["transactions"] == {
+            "id": ["tx_0001", "tx_0002", "tx_0003"],
+            "amount": [9839.64, 181.0, 181.0],
+        }
+        assert ColumnarTransactionResponse.model_validate(data).total == 5
+
+        response = client.get("/api/transactions", params={"fields": "id,balance"})
+        assert response.status_code == 400
@@ -0,0 +1,254 @@
+"""
+Tests unitaires pour le journal des modifications de l'API.
+
+Ce module teste l'écriture groupée du journal, la lecture d'un segment
+tronqué, la reprise au démarrage et les points de reprise.
+"""
+
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+import pandas as pd
+import pytest
+from banking_api.data_manager import data_manager
+from banking_api.ingestion import CHECKPOINT_DIR_NAME, DeltaBuffer
+from banking_api.models import Transaction
+from banking_api.wal import RECORD_INSERT, WriteAheadLog
+
+
+def make_transaction(transaction_id: str) -> Transaction:
+    """
+    Crée une transaction de test.
+
+    Parameters
+    ----------
+    transaction_id : str
+        Identifiant de la transaction
+
+    Returns
+    -------
+    Transaction
+        Transaction de test
+    """
+    fields: Dict[str, Any] = {
+        "id": transaction_id,
+        "date": "2019-01-04",
+        "client_id": 1231006815,
+        "card_id": 1,
+        "amount": 12.5,
+        "use_chip": "Online Transaction",
+        "merchant_id": 6,
+        "merchant_city": "Dallas",
+        "merchant_state": "TX",
+        "zip": 75001,
+        "mcc": 5411,
+        "errors": "",
+    }
+    return Transaction(**fields)
+
+
+@pytest.fixture
+def restore_data(setup_test_data: None, sample_data: pd.DataFrame) -> Iterator[None]:
+    """
+    Republie les données de test de la session après le test.
+
+    Parameters
+    ----------
+    setup_test_data : None
+        Fixture de chargement des données de test
+    sample_data : pd.DataFrame
+        DataFrame de test
+    """
+    yield
+    data_manager._restore = None
+    data_manager._data = sample_data
+
+
+def restart(log_dir: Path, sample_data: pd.DataFrame) -> DeltaBuffer:
+    """
+    Simule un redémarrage : fichier de données relu, journal rejoué.
+
+    Parameters
+    ----------
+    log_dir : Path
+        Répertoire du journal
+    sample_data : pd.DataFrame
+        Contenu du fichier de données
+
+    Returns
+    -------
+    DeltaBuffer
+        Tampon ayant rejoué le journal
+    """
+    data_manager._restore = None
+    data_manager._data = sample_data
+    buffer = DeltaBuffer(threshold=100, interval=0, checkpoint_bytes=1)
+    buffer.recover(str(log_dir))
+    return buffer
+
+
+def ids() -> set:
+    """
+    Retourne les identifiants du dataset publié.
+
+    Returns
+    -------
+    set
+        Identifiants des transactions
+    """
+    return set(data_manager.get_snapshot().data["id"])
+
+
+class TestWriteAheadLog:
+    """Tests de l'écriture et de la lecture du journal."""
+
+    def test_group_commit(self, tmp_path: Path) -> None:
+        """
+        Teste que des écritures concurrentes sont toutes relues.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        """
+        log = WriteAheadLog(str(tmp_path))
+        assert log.open() == []
+
+        def write(start: int) -> None:
+            for lsn in range(start, start + 50):
+                log.append(lsn, RECORD_INSERT, b"[]")
+
+        threads = [
+            threading.Thread(target=write, args=(1 + 50 * i,)) for i in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        records, syncs = log.metrics()
+        assert records == 400
+        assert syncs <= records
+        log.close()
+        with pytest.raises(OSError):
+            log.append(401, RECORD_INSERT, b"[]")
+
+        reopened = WriteAheadLog(str(tmp_path))
+        lsns = sorted(record.lsn for record in reopened.open())
+        assert lsns == list(range(1, 401))
+        reopened.close()
+
+    def test_truncated_record_is_ignored(self, tmp_path: Path) -> None:
+        """
+        Teste qu'un enregistrement tronqué termine la lecture du segment.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        """
+        log = WriteAheadLog(str(tmp_path))
+        log.open()
+        log.append(1, RECORD_INSERT, b'["a"]')
+        log.append(2, RECORD_INSERT, b'["b"]')
+        log.close()
+        segment = next(tmp_path.glob("segment-*.log"))
+        segment.write_bytes(segment.read_bytes()[:-3])
+
+        reopened = WriteAheadLog(str(tmp_path))
+        assert [record.payload for record in reopened.open()] == [b'["a"]']
+        reopened.close()
+
+
+class TestRecovery:
+    """Tests de la reprise des modifications au démarrage."""
+
+    def test_changes_survive_restart(
+        self, tmp_path: Path, sample_data: pd.DataFrame, restore_data: None
+    ) -> None:
+        """
+        Teste que les modifications, compactées ou non, sont rejouées.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        buffer = restart(tmp_path, sample_data)
+        buffer.append([make_transaction("tx_9001"), make_transaction("tx_9002")])
+        assert buffer.delete("tx_0002")
+        buffer.compact()
+        assert buffer.delete("tx_9001")
+        buffer.append([make_transaction("tx_0002")])
+        buffer.close()
+
+        buffer = restart(tmp_path, sample_data)
+        expected = {"tx_0001", "tx_0002", "tx_0003", "tx_0004", "tx_0005", "tx_9002"}
+        assert ids() == expected
+        assert not buffer.delete("tx_9001")
+        assert buffer.delete("tx_0003")
+        buffer.close()
+
+        buffer = restart(tmp_path, sample_data)
+        assert "tx_0003" not in ids()
+        buffer.close()
+
+    def test_checkpoint_replaces_log(
+        self, tmp_path: Path, sample_data: pd.DataFrame, restore_data: None
+    ) -> None:
+        """
+        Teste la reprise depuis un point de reprise et la fin du journal.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        buffer = restart(tmp_path, sample_data)
+        buffer.append([make_transaction("tx_9101")])
+        buffer.delete("tx_0001")
+        buffer.compact()
+        assert buffer.metrics().checkpoints == 1
+        assert (tmp_path / CHECKPOINT_DIR_NAME / "manifest.json").exists()
+        # Seul le segment courant subsiste
+        assert len(list(tmp_path.glob("segment-*.log"))) == 1
+        buffer.append([make_transaction("tx_9102")])
+        buffer.close()
+
+        buffer = restart(tmp_path, sample_data)
+        expected = {"tx_0002", "tx_0003", "tx_0004", "tx_0005", "tx_9101", "tx_9102"}
+        assert ids() == expected
+        transaction = data_manager.get_snapshot().data.iloc[-1]
+        assert transaction["amount_cents"] == 1250
+        buffer.close()
+
+    def test_full_reload_keeps_changes(
+        self, tmp_path: Path, sample_data: pd.DataFrame, restore_data: None
+    ) -> None:
+        """
+        Teste que les modifications sont réappliquées au fichier relu.
+
+        Parameters
+        ----------
+        tmp_path : Path
+            Répertoire temporaire
+        sample_data : pd.DataFrame
+            DataFrame de test
+        """
+        path = tmp_path / "transactions_data.csv"
+        sample_data.to_csv(path, index=False)
+        buffer = restart(tmp_path / "wal", sample_data)
+        data_manager.load_data(str(path))
+        buffer.append([make_transaction("tx_9201")])
+        buffer.delete("tx_0005")
+        buffer.compact()
+
+        # Fichier réécrit (et non prolongé) : relu entièrement
+        sample_data.iloc[::-1].to_csv(path, index=False)
+        data_manager.reload()
+        assert ids() == {"tx_0001", "tx_0002", "tx_0003", "tx_0004", "tx_9201"}
+        buffer.close()